@@ -1,15 +1,172 @@
 import pygame as pg
 import serial
+import ctypes
 import json
+import struct
 import threading
 import time
 from controls import GameControls
+from fixed_timestep import TICK_RATE, ticks_for
+from game_state import StateStruct
 
-class ArduinoControls:
-    def __init__(self, port='COM3', baudrate=115200):
+# Binary sensor packets (see game_controller_combined.ino):
+#   sync 0xA5 | sequence u8 | device time ms u32 | joystick x i8 | joystick y i8 | buttons u8 |
+#   distance u16 (0.01 cm) | CRC-8 of everything between sync and CRC
+# 12 bytes per sample instead of ~50 for the four text lines, and every field from the same reading.
+PACKET_SYNC = 0xA5  # Never appears in the ASCII text format, so both formats can share a stream
+PACKET = struct.Struct('<BIbbBH')
+PACKET_SIZE = 1 + PACKET.size + 1
+BINARY_MODE_COMMAND = b'MODE BIN\n'  # Firmware that doesn't know it ignores it and keeps sending text
+TEXT_MODE_COMMAND = b'MODE TEXT\n'
+MODE_RETRY_SECONDS = 1.0  # Resend MODE BIN if neither its acknowledgement nor a packet arrived by then
+MODE_RETRIES = 3          # Requests before settling for text lines
+
+
+def _crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data):
+    """CRC-8 (polynomial 0x07, initial value 0) as computed by the firmware"""
+    crc = 0
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_packet(sequence, device_time, joystick_x, joystick_y, button, distance):
+    """Build one binary packet the way the firmware does (for tests and simulated controllers)"""
+    body = PACKET.pack(sequence & 0xFF, device_time & 0xFFFFFFFF, joystick_x, joystick_y, 1 if button else 0,
+                       max(0, min(65535, round(distance * 100))))
+    return bytes([PACKET_SYNC]) + body + bytes([crc8(body)])
+
+
+class SensorStreamParser:
+    """
+    Turns the controller's serial byte stream into sensor updates
+
+    Reads both formats, even mixed in one stream (as around the switch to
+    binary): a text line ("X:-2", "Distance:23.45", ...) gives one field,
+    a binary packet every field plus its sequence number and device time,
+    and the firmware's own lines {'mode': 'binary' / 'text'} (the MODE
+    command acknowledgements) or {'ready': True} (the board restarted).
+    feed() takes whatever bytes arrived and returns a dict per complete
+    line or packet; partial ones wait for the next call. Packets with a
+    bad CRC are skipped by resynchronizing on the next sync byte.
+    """
+
+    TEXT_FIELDS = {'X': ('joystick_x', int), 'Y': ('joystick_y', int), 'Distance': ('ultrasonic_distance', float)}
+    MODE_ACKS = {'MODE BIN OK': 'binary', 'MODE TEXT OK': 'text'}
+    MAX_LINE = 256
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.packets = 0
+        self.lines = 0
+        self.crc_errors = 0
+        self.dropped = 0  # Packets missing from the sequence numbers
+        self.last_sequence = None
+
+    def feed(self, data):
+        buffer = self.buffer
+        buffer += data
+        updates = []
+        start = 0
+        while start < len(buffer):
+            if buffer[start] == PACKET_SYNC:
+                if len(buffer) - start < PACKET_SIZE:
+                    break  # Rest of the packet hasn't arrived
+                body = bytes(buffer[start + 1:start + PACKET_SIZE - 1])
+                if crc8(body) != buffer[start + PACKET_SIZE - 1]:
+                    self.crc_errors += 1
+                    start += 1
+                    continue
+                updates.append(self._packet(body))
+                start += PACKET_SIZE
+                continue
+            end = buffer.find(b'\n', start)
+            sync = buffer.find(PACKET_SYNC, start)
+            if sync != -1 and (end == -1 or sync < end):
+                start = sync  # Text cut off by a packet (mode switch) - drop the fragment
+                continue
+            if end == -1:
+                if len(buffer) - start > self.MAX_LINE:
+                    start = len(buffer)  # Noise without line breaks
+                break  # Rest of the line hasn't arrived
+            raw = bytes(buffer[start:end])
+            start = end + 1
+            try:
+                line = raw.decode('ascii').strip()
+            except UnicodeDecodeError:
+                continue  # Remains of a corrupted packet
+            if line:
+                updates.append(self._line(line))
+        del buffer[:start]
+        return updates
+
+    def _packet(self, body):
+        sequence, device_time, joystick_x, joystick_y, buttons, distance = PACKET.unpack(body)
+        if self.last_sequence is not None:
+            self.dropped += (sequence - self.last_sequence - 1) & 0xFF
+        self.last_sequence = sequence
+        self.packets += 1
+        return {'joystick_x': joystick_x, 'joystick_y': joystick_y, 'joystick_button': bool(buttons & 1),
+                'ultrasonic_distance': distance / 100, 'sequence': sequence, 'device_time': device_time}
+
+    def _line(self, line):
+        self.lines += 1
+        if line in self.MODE_ACKS:
+            return {'mode': self.MODE_ACKS[line]}
+        if line.startswith("Game Controller Ready"):
+            return {'ready': True}
+        if line.startswith("Button pressed"):
+            return {'joystick_button': True}
+        if line.startswith("Button not pressed"):
+            return {'joystick_button': False}
+        name, _, value = line.partition(':')
+        if name in self.TEXT_FIELDS:
+            field, convert = self.TEXT_FIELDS[name]
+            try:
+                return {field: convert(value.strip())}
+            except ValueError:
+                pass
+        return {'unknown': line}
+
+    def get_stats(self):
+        return {
+            'packets': self.packets,
+            'lines': self.lines,
+            'crc_errors': self.crc_errors,
+            'dropped_packets': self.dropped
+        }
+
+class ArduinoControls(StateStruct):
+    # Cube state (in one struct for snapshots); sensor readings and settings are ordinary attributes
+    _fields_ = [('current_lane', ctypes.c_int32), ('target_x', ctypes.c_double), ('cube_x', ctypes.c_double),
+                ('cube_y', ctypes.c_double), ('cube_distance', ctypes.c_double),
+                ('is_jumping', ctypes.c_bool), ('is_crouching', ctypes.c_bool),
+                ('jump_timer', ctypes.c_int32), ('crouch_timer', ctypes.c_int32),
+                ('lane_switch_cooldown', ctypes.c_int32)]
+
+    def __init__(self, port='COM3', baudrate=115200, tick_rate=TICK_RATE, protocol='auto'):
         """
         Arduino-based controls for the game
         
+        handle_events()/update_movement() run once per simulation tick
+        (tick_rate per second).
+        
+        protocol: 'auto' asks the firmware for binary packets and falls back
+        to its text lines if it doesn't switch; 'text' never asks.
+        
         Controls mapping:
         - Close distance on ultrasonic sensor = DOWN movement (crouch)
         - Far distance on ultrasonic sensor = UP movement (jump)
@@ -34,7 +191,7 @@ class ArduinoControls:
         self.cube_distance = -15.0
         # Smooth lane switching variables
         self.target_x = self.lanes[self.current_lane]
-        self.move_speed = 0.3  # Adjust for smoother/faster movement
+        self.move_speed = 18.0 / tick_rate  # 18 units/s (0.3 per tick at 60 ticks/s)
         
         # Arduino communication
         self.serial_port = None
@@ -57,6 +214,9 @@ class ArduinoControls:
         # Lane switching state tracking
         self.last_joystick_x = 0
         self.lane_switch_cooldown = 0  # Prevent rapid switching
+        self.lane_switch_ticks = ticks_for(1 / 3, tick_rate)
+        # Fraction of the way to the sensor height covered per tick (0.1 at 60 ticks/s)
+        self.smoothing_factor = 1.0 - 0.9 ** (TICK_RATE / tick_rate)
         
         self.distance_close_threshold = 10.0  # Close distance for crouch (cm)
         self.distance_far_threshold = 30.0    # Far distance for jump (cm)
@@ -64,10 +224,23 @@ class ArduinoControls:
         
         # Smooth lane switching variables
         self.target_x = self.lanes[self.current_lane]
-        self.move_speed = 0.3  # Adjust for smoother/faster movement
+        self.move_speed = 18.0 / tick_rate  # 18 units/s (0.3 per tick at 60 ticks/s)
+        
+        # Joystick x and distance from the same reading, swapped in whole by the reader thread
+        self.sensor_values = (self.joystick_x, self.ultrasonic_distance)
+        # Sensor values used by the last tick (what a replay records)
+        self.last_input = self.sensor_values
         
-        # Initialize Arduino connection
-        self.connect_arduino(port, baudrate)
+        # Serial stream decoding (text lines or binary packets)
+        self.protocol = protocol
+        self.parser = SensorStreamParser()
+        self.binary_active = False
+        self.mode_requested_at = None  # When MODE BIN was last sent, until it is answered
+        self.mode_requests = 0
+        
+        # Initialize Arduino connection (port=None: driven by apply_sensors only, e.g. replays)
+        if port is not None:
+            self.connect_arduino(port, baudrate)
         
     def connect_arduino(self, port, baudrate):
         """Connect to Arduino and start reading data"""
@@ -81,6 +254,10 @@ class ArduinoControls:
             # Clear any initial garbage data
             self.serial_port.flushInput()
             
+            if self.protocol != 'text':
+                # Newer firmware switches to binary packets; older firmware ignores this
+                self.request_binary_mode()
+            
             self.running = True
             self.arduino_thread = threading.Thread(target=self._read_arduino_data)
             self.arduino_thread.daemon = True
@@ -93,52 +270,79 @@ class ArduinoControls:
     
     def _read_arduino_data(self):
         """Background thread to read data from Arduino"""
-        joystick_data = {}
         print("Arduino data reader thread started...")
         
         while self.running and self.serial_port:
             try:
-                if self.serial_port.in_waiting > 0:
-                    line = self.serial_port.readline().decode('utf-8').strip()
-                    #print(f"DEBUG: Received from Arduino: '{line}'")  # Debug output
-                    
-                    # Parse joystick data
-                    if line.startswith("X:"):
-                        try:
-                            self.joystick_x = int(line.split(":")[1])
-                            #print(f"DEBUG: Set joystick_x = {self.joystick_x}")
-                        except Exception as e:
-                            print(f"DEBUG: Failed to parse X: {e}")
-                    elif line.startswith("Y:"):
-                        try:
-                            self.joystick_y = int(line.split(":")[1])
-                            #print(f"DEBUG: Set joystick_y = {self.joystick_y}")
-                        except Exception as e:
-                            print(f"DEBUG: Failed to parse Y: {e}")
-                    elif line.startswith("Button pressed"):
-                        self.joystick_button = True
-                        #print("DEBUG: Button pressed")
-                    elif line.startswith("Button not pressed"):
-                        self.joystick_button = False
-                        #print("DEBUG: Button not pressed")
-                    elif line.startswith("Distance:"):
-                        try:
-                            self.ultrasonic_distance = float(line.split(":")[1].strip())
-                            #print(f"DEBUG: Set distance = {self.ultrasonic_distance}")
-                        except Exception as e:
-                            print(f"DEBUG: Failed to parse Distance: {e}")
-                    else:
-                        print(f"DEBUG: Unknown line format: '{line}'")
+                waiting = self.serial_port.in_waiting
+                if waiting > 0:
+                    self.apply_updates(self.parser.feed(self.serial_port.read(waiting)))
                 else:
                     # No data waiting, small delay
                     time.sleep(0.01)
+                self.check_mode_request()
                             
             except Exception as e:
                 print(f"Error reading Arduino data: {e}")
                 time.sleep(0.1)
     
+    def request_binary_mode(self, now=None):
+        """Ask the firmware for binary packets (answered by "MODE BIN OK", or ignored by older firmware)"""
+        self.serial_port.write(BINARY_MODE_COMMAND)
+        self.mode_requested_at = time.monotonic() if now is None else now
+        self.mode_requests += 1
+    
+    def check_mode_request(self, now=None):
+        """Resend an unanswered MODE BIN request, or give up on it after MODE_RETRIES tries"""
+        if self.mode_requested_at is None or self.binary_active:
+            return
+        now = time.monotonic() if now is None else now
+        if now - self.mode_requested_at < MODE_RETRY_SECONDS:
+            return
+        if self.mode_requests < MODE_RETRIES:
+            self.request_binary_mode(now)
+        else:
+            self.mode_requested_at = None
+            print("Arduino didn't switch to binary packets - using its text lines")
+    
+    def apply_updates(self, updates):
+        """Store sensor updates from SensorStreamParser.feed()"""
+        for update in updates:
+            if 'unknown' in update:
+                print(f"DEBUG: Unknown line format: '{update['unknown']}'")
+                continue
+            if 'mode' in update:
+                self._set_binary_active(update['mode'] == 'binary')
+                continue
+            if 'ready' in update:
+                # The board restarted and is back to text lines
+                self._set_binary_active(False)
+                if self.protocol != 'text' and self.serial_port:
+                    self.mode_requests = 0
+                    self.request_binary_mode()
+                continue
+            if 'sequence' in update and not self.binary_active:
+                self._set_binary_active(True)  # Packets without the acknowledgement (it was lost)
+            for name in ('joystick_x', 'joystick_y', 'joystick_button', 'ultrasonic_distance'):
+                if name in update:
+                    setattr(self, name, update[name])
+            self.sensor_values = (self.joystick_x, self.ultrasonic_distance)
+    
+    def _set_binary_active(self, active):
+        if active:
+            self.mode_requested_at = None
+        if active != self.binary_active:
+            self.binary_active = active
+            print("Arduino is sending binary sensor packets" if active else "Arduino is sending text sensor lines")
+    
     def handle_events(self, events):
         """Handle discrete events - for Arduino, this processes sensor state changes"""
+        # One consistent pair - the reader thread may update the sensors mid-tick
+        self.apply_sensors(*self.sensor_values)
+    
+    def apply_sensors(self, joystick_x, distance):
+        """One tick of sensor input: joystick lane switching and distance-to-height mapping"""
+        self.last_input = (joystick_x, distance)
         # Reduce cooldown timer
         if self.lane_switch_cooldown > 0:
             self.lane_switch_cooldown -= 1
@@ -149,25 +353,25 @@ class ArduinoControls:
         
         # Specialized joystick handling for limited range (-1 to -3)
         if self.lane_switch_cooldown == 0:  # Only if not in cooldown
-            if self.joystick_x <= self.joystick_min:  # At -3 (full left)
+            if joystick_x <= self.joystick_min:  # At -3 (full left)
                 if self.current_lane > 0:
                     self.current_lane -= 1
                     self.target_x = self.lanes[self.current_lane]
-                    self.lane_switch_cooldown = 20
-            elif self.joystick_x >= self.joystick_max:  # At -1 (full right)
+                    self.lane_switch_cooldown = self.lane_switch_ticks
+            elif joystick_x >= self.joystick_max:  # At -1 (full right)
                 if self.current_lane < 2:
                     self.current_lane += 1
                     self.target_x = self.lanes[self.current_lane]
-                    self.lane_switch_cooldown = 20
-            elif self.joystick_x == self.joystick_center_x:
+                    self.lane_switch_cooldown = self.lane_switch_ticks
+            elif joystick_x == self.joystick_center_x:
                 pass
             else:
                 pass
         
         # Ultrasonic sensor for CONTINUOUS vertical position mapping
-        self._map_distance_to_position()
+        self._map_distance_to_position(distance)
         
-    def _map_distance_to_position(self):
+    def _map_distance_to_position(self, distance):
         """Map ultrasonic distance to cube Y position continuously"""
         # Define distance mapping ranges
         min_distance = 5.0   # Closest distance (cube at lowest position)
@@ -178,7 +382,7 @@ class ArduinoControls:
         max_y = 1.0   # Highest cube position (jumped)
         
         # Clamp distance to our working range
-        clamped_distance = max(min_distance, min(max_distance, self.ultrasonic_distance))
+        clamped_distance = max(min_distance, min(max_distance, distance))
         
         # Map distance to Y position linearly
         # Close distance (5cm) -> Low Y (-3.0)
@@ -187,8 +391,7 @@ class ArduinoControls:
         target_y = min_y + (distance_ratio * (max_y - min_y))
         
         # Smooth movement towards target position
-        smoothing_factor = 0.1  # Adjust for smoother/faster response
-        self.cube_y += (target_y - self.cube_y) * smoothing_factor
+        self.cube_y += (target_y - self.cube_y) * self.smoothing_factor
         
         #print(f"DEBUG: Distance={self.ultrasonic_distance:.1f}cm -> Target_Y={target_y:.2f} -> Cube_Y={self.cube_y:.2f}")
         
@@ -240,7 +443,9 @@ class ArduinoControls:
             'lane_name': lane_name,
             'movement_state': movement_state,
             'is_jumping': self.is_jumping,
-            'is_crouching': self.is_crouching
+            'is_crouching': self.is_crouching,
+            'protocol': 'binary' if self.binary_active else 'text',
+            **self.parser.get_stats()
         }
     
     def _get_distance_zone(self):
@@ -274,15 +479,21 @@ class ArduinoControls:
         if self.arduino_thread:
             self.arduino_thread.join(timeout=1)
         if self.serial_port:
+            if self.binary_active:
+                try:
+                    self.serial_port.write(TEXT_MODE_COMMAND)  # Leave the firmware as other hosts expect it
+                except Exception:
+                    pass
             self.serial_port.close()
             print("Arduino connection closed")
 
 # Keyboard fallback controls (when Arduino is not connected)
 class KeyboardFallbackControls:
-    def __init__(self):
+    def __init__(self, tick_rate=TICK_RATE):
         """Fallback to keyboard controls if Arduino is not available"""
         # Use the GameControls class from controls.py for sophisticated control handling
-        self.game_controls = GameControls()
+        self.tick_rate = tick_rate
+        self.game_controls = GameControls(tick_rate)
         print("Keyboard controls initialized")
         
     def handle_events(self, events):
@@ -304,7 +515,7 @@ class KeyboardFallbackControls:
     def reset_position(self):
         """Reset cube position for game restart"""
         # Reset the GameControls to initial state
-        self.game_controls = GameControls()
+        self.game_controls = GameControls(self.tick_rate)
         print("Keyboard controls reset to starting position")
     
     def cleanup(self):
@@ -1,7 +1,13 @@
 import pygame as pg
 from button import Button
+from font_cache import get_font, render_text
 import time
 
+# Connection log area (redrawn on its own while messages fade)
+LOG_TOP = 445
+LOG_FADE_START = 10     # Seconds before a message starts fading
+LOG_FADE_RATE = 25      # Alpha lost per second while fading
+
 class ArduinoStartScreen:
     def __init__(self, screen_size):
         self.width, self.height = screen_size
@@ -25,22 +31,32 @@ class ArduinoStartScreen:
         self.warning_color = (255, 200, 0)     # Yellow for warnings
         self.disabled_color = (80, 80, 80)     # Gray for disabled elements
         
-        # Fonts
-        pg.font.init()
-        self.title_font = pg.font.Font(None, 48)
-        self.subtitle_font = pg.font.Font(None, 32)
-        self.text_font = pg.font.Font(None, 24)
-        self.small_font = pg.font.Font(None, 20)
+        # Fonts (shared with the rest of the UI)
+        self.title_font = get_font(None, 48)
+        self.subtitle_font = get_font(None, 32)
+        self.text_font = get_font(None, 24)
+        self.small_font = get_font(None, 20)
+        self.countdown_font = get_font(None, 64)
+        
+        # Full redraw needed (state changed or new display surface); otherwise only the log is refreshed
+        self.dirty = True
+        self.drawn_log = None
+
+    def invalidate(self):
+        """Redraw everything on the next draw (e.g. after pg.display.set_mode)"""
+        self.dirty = True
 
     def set_arduino_button_enabled(self, enabled):
         """Enable or disable the Arduino button based on connection status"""
         self.arduino_button_enabled = enabled
+        self.dirty = True
 
     def set_arduino_status(self, status, using_arduino=False):
         """Update Arduino connection status"""
         self.arduino_status = status
         if using_arduino:
             self.selected_control = "arduino"
+        self.dirty = True
         
     def add_connection_message(self, message, msg_type="info"):
         """Add a connection status message"""
@@ -57,9 +73,20 @@ class ArduinoStartScreen:
     def set_final_time(self, time_str):
         """Set final game time for game over screen"""
         self.final_time = time_str
+        self.dirty = True
 
     def draw(self, surface):
-        """Draw the start screen"""
+        """
+        Draw the start screen, updating only the parts that changed since the last draw
+
+        Returns the list of rectangles that were redrawn (empty if nothing changed);
+        the caller presents them.
+        """
+        if not self.dirty:
+            if self._log_lines() != self.drawn_log:
+                return [self.draw_connection_log(surface)]
+            return []
+        self.dirty = False
         surface.fill(self.bg_color)
         
         # Draw title
@@ -70,18 +97,18 @@ class ArduinoStartScreen:
             title_text = "Force Cube Runner"
             title_color = self.text_color
             
-        title_surface = self.title_font.render(title_text, True, title_color)
+        title_surface = render_text(self.title_font, title_text, title_color)
         title_x = self.width // 2 - title_surface.get_width() // 2
         surface.blit(title_surface, (title_x, 30))
         
         # Draw final time if game over
         if self.final_time:
-            time_surface = self.subtitle_font.render(f"Final Time: {self.final_time}", True, self.success_color)
+            time_surface = render_text(self.subtitle_font, f"Final Time: {self.final_time}", self.success_color)
             time_x = self.width // 2 - time_surface.get_width() // 2
             surface.blit(time_surface, (time_x, 80))
         
         # Draw control selection section
-        control_title = self.subtitle_font.render("Choose Control Method:", True, self.text_color)
+        control_title = render_text(self.subtitle_font, "Choose Control Method:", self.text_color)
         control_x = self.width // 2 - control_title.get_width() // 2
         surface.blit(control_title, (control_x, 140))
         
@@ -109,14 +136,14 @@ class ArduinoStartScreen:
         # Draw selection prompt
         if not self.selected_control:
             prompt_text = "Select your preferred control method above"
-            prompt_surface = self.text_font.render(prompt_text, True, self.text_color)
+            prompt_surface = render_text(self.text_font, prompt_text, self.text_color)
             prompt_x = self.width // 2 - prompt_surface.get_width() // 2
             surface.blit(prompt_surface, (prompt_x, 420))
         
         # Draw connection messages log
         self.draw_connection_log(surface)
         
-        pg.display.flip()
+        return [surface.get_rect()]
 
     def draw_control_instructions(self, surface):
         """Draw control method instructions"""
@@ -147,23 +174,19 @@ class ArduinoStartScreen:
             color = self.text_color
         
         for i, instruction in enumerate(instructions):
-            text_surface = self.small_font.render(instruction, True, color)
+            text_surface = render_text(self.small_font, instruction, color)
             text_x = self.width // 2 - text_surface.get_width() // 2
             surface.blit(text_surface, (text_x, instructions_y + i * 25))
 
-    def draw_connection_log(self, surface):
-        """Draw Arduino connection messages log"""
-        log_title = self.text_font.render("Connection Log:", True, self.text_color)
-        surface.blit(log_title, (20, 450))
-        
+    def _log_lines(self):
+        """(text, color) of the visible log messages, with the current fade applied"""
         current_time = time.time()
-        y_offset = 475
-        
+        lines = []
         for message in self.connection_messages[-6:]:  # Show last 6 messages
             # Fade old messages
             age = current_time - message['time']
-            if age > 10:  # Fade messages older than 10 seconds
-                alpha = max(0, 255 - int((age - 10) * 25))
+            if age > LOG_FADE_START:  # Fade messages older than 10 seconds
+                alpha = max(0, 255 - int((age - LOG_FADE_START) * LOG_FADE_RATE))
             else:
                 alpha = 255
             
@@ -179,10 +202,39 @@ class ArduinoStartScreen:
             
             # Apply alpha for fading
             color = (*color[:3], alpha) if alpha < 255 else color
-            
-            text_surface = self.small_font.render(message['text'], True, color)
+            lines.append((message['text'], color))
+        return lines
+
+    def next_update_delay(self):
+        """Milliseconds until the log needs redrawing by itself (None = only on events)"""
+        current_time = time.time()
+        delay = None
+        for message in self.connection_messages[-6:]:
+            age = current_time - message['time']
+            if age < LOG_FADE_START:
+                wait = LOG_FADE_START - age
+            elif (age - LOG_FADE_START) * LOG_FADE_RATE < 255:
+                wait = 0.1  # Fading - refresh at 10 fps
+            else:
+                continue
+            delay = wait if delay is None else min(delay, wait)
+        return None if delay is None else delay * 1000
+
+    def draw_connection_log(self, surface):
+        """Draw Arduino connection messages log, returning the area that was redrawn"""
+        log_rect = pg.Rect(0, LOG_TOP, self.width, self.height - LOG_TOP)
+        surface.fill(self.bg_color, log_rect)
+        log_title = render_text(self.text_font, "Connection Log:", self.text_color)
+        surface.blit(log_title, (20, 450))
+        
+        lines = self._log_lines()
+        y_offset = 475
+        for text, color in lines:
+            text_surface = render_text(self.small_font, text, color)
             surface.blit(text_surface, (20, y_offset))
             y_offset += 20
+        self.drawn_log = lines
+        return log_rect
 
     def handle_events(self, events):
         """Handle user input events"""
@@ -194,6 +246,7 @@ class ArduinoStartScreen:
             if self.arduino_button.is_clicked(event):
                 if self.arduino_button_enabled:
                     self.selected_control = "arduino"
+                    self.dirty = True
                     self.add_connection_message("Arduino controls selected", "info")
                     return "SELECT_ARDUINO"
                 else:
@@ -201,119 +254,100 @@ class ArduinoStartScreen:
             
             if self.keyboard_button.is_clicked(event):
                 self.selected_control = "keyboard"
+                self.dirty = True
                 self.add_connection_message("Keyboard controls selected", "info")
                 return "SELECT_KEYBOARD"
                 
         return None
 
-    def show_control_instructions(self, surface, control_type):
-        """Show control instructions for 3 seconds before starting game"""
-        import time
+    def draw_instructions_page(self, surface, control_type):
+        """Draw the static part of the instructions screen (everything but the countdown)"""
+        self.dirty = True  # The selection screen is drawn over
+        # Clear screen with dark background
+        surface.fill((25, 25, 35))
         
-        start_time = time.time()
-        countdown_duration = 3.0
+        # Draw title
+        if control_type == "arduino":
+            title_text = "Arduino Controls Ready!"
+            title_color = (0, 255, 100)
+        else:
+            title_text = "Keyboard Controls Ready!"
+            title_color = (0, 180, 255)
         
-        # Create fonts for the countdown screen
-        title_font = pg.font.Font(None, 48)
-        subtitle_font = pg.font.Font(None, 32)
-        text_font = pg.font.Font(None, 24)
-        countdown_font = pg.font.Font(None, 64)
+        title_surface = render_text(self.title_font, title_text, title_color)
+        title_x = surface.get_width() // 2 - title_surface.get_width() // 2
+        surface.blit(title_surface, (title_x, 50))
         
-        while time.time() - start_time < countdown_duration:
-            events = pg.event.get()
-            for event in events:
-                if event.type == pg.QUIT:
-                    pg.quit()
-                    exit()
-            
-            # Calculate remaining time
-            remaining_time = countdown_duration - (time.time() - start_time)
-            countdown = int(remaining_time) + 1
-            
-            # Clear screen with dark background
-            surface.fill((25, 25, 35))
-            
-            # Draw title
-            if control_type == "arduino":
-                title_text = "Arduino Controls Ready!"
-                title_color = (0, 255, 100)
-            else:
-                title_text = "Keyboard Controls Ready!"
-                title_color = (0, 180, 255)
-            
-            title_surface = title_font.render(title_text, True, title_color)
-            title_x = surface.get_width() // 2 - title_surface.get_width() // 2
-            surface.blit(title_surface, (title_x, 50))
-            
-            # Draw control instructions
-            y_offset = 120
-            if control_type == "arduino":
-                instructions = [
-                    "ARDUINO CONTROLS:",
-                    "",
-                    "Ultrasonic Sensor:",
-                    "   • Move closer = Crouch/Duck",
-                    "   • Move farther = Jump/Rise",
-                    "   • Middle distance = Normal height",
-                    "",
-                    "Joystick:",
-                    "   • Push LEFT = Move to left lane",
-                    "   • Push RIGHT = Move to right lane",
-                    "   • CENTER = Stay in current lane",
-                    "",
-                    "Position yourself and control the cube in real-time!"
-                ]
-                text_color = (255, 255, 255)
-            else:
-                instructions = [
-                    "KEYBOARD CONTROLS:",
-                    "",
-                    "Movement:",
-                    "   • LEFT Arrow  = Move to left lane",
-                    "   • RIGHT Arrow = Move to right lane",
-                    "   • UP Arrow = Jump over obstacles",
-                    "   • DOWN Arrow = Crouch under obstacles",
-                    "",
-                    "Game Controls:",
-                    "   • R = Reset timer",
-                    "   • P = Pause/Resume timer",
-                    "",
-                    "Use precise timing to avoid obstacles!"
-                ]
-                text_color = (255, 255, 255)
-            
-            for instruction in instructions:
-                if instruction == "":
-                    y_offset += 15
-                    continue
-                    
-                if instruction.endswith("CONTROLS:"):
-                    # Main section headers (ARDUINO CONTROLS: or KEYBOARD CONTROLS:)
-                    text_surface = subtitle_font.render(instruction, True, title_color)
-                elif instruction.endswith(":") and not instruction.endswith("CONTROLS:"):
-                    # Sub-section headers (Ultrasonic Sensor:, Movement:, etc.)
-                    text_surface = text_font.render(instruction, True, (255, 200, 0))
-                elif instruction.startswith("Position yourself") or instruction.startswith("Use precise timing"):
-                    # Tips
-                    text_surface = text_font.render(instruction, True, (100, 255, 100))
-                else:
-                    # Regular instructions
-                    text_surface = text_font.render(instruction, True, text_color)
+        # Draw control instructions
+        y_offset = 120
+        if control_type == "arduino":
+            instructions = [
+                "ARDUINO CONTROLS:",
+                "",
+                "Ultrasonic Sensor:",
+                "   • Move closer = Crouch/Duck",
+                "   • Move farther = Jump/Rise",
+                "   • Middle distance = Normal height",
+                "",
+                "Joystick:",
+                "   • Push LEFT = Move to left lane",
+                "   • Push RIGHT = Move to right lane",
+                "   • CENTER = Stay in current lane",
+                "",
+                "Position yourself and control the cube in real-time!"
+            ]
+            text_color = (255, 255, 255)
+        else:
+            instructions = [
+                "KEYBOARD CONTROLS:",
+                "",
+                "Movement:",
+                "   • LEFT Arrow  = Move to left lane",
+                "   • RIGHT Arrow = Move to right lane",
+                "   • UP Arrow = Jump over obstacles",
+                "   • DOWN Arrow = Crouch under obstacles",
+                "",
+                "Game Controls:",
+                "   • R = Reset timer",
+                "   • P = Pause/Resume timer",
+                "",
+                "Use precise timing to avoid obstacles!"
+            ]
+            text_color = (255, 255, 255)
+        
+        for instruction in instructions:
+            if instruction == "":
+                y_offset += 15
+                continue
                 
-                text_x = surface.get_width() // 2 - text_surface.get_width() // 2
-                surface.blit(text_surface, (text_x, y_offset))
-                y_offset += 25
-            
-            # Draw countdown
-            countdown_text = f"Starting in {countdown}..."
-            countdown_surface = countdown_font.render(countdown_text, True, (255, 255, 0))
-            countdown_x = surface.get_width() // 2 - countdown_surface.get_width() // 2
-            surface.blit(countdown_surface, (countdown_x, 500))
+            if instruction.endswith("CONTROLS:"):
+                # Main section headers (ARDUINO CONTROLS: or KEYBOARD CONTROLS:)
+                text_surface = render_text(self.subtitle_font, instruction, title_color)
+            elif instruction.endswith(":") and not instruction.endswith("CONTROLS:"):
+                # Sub-section headers (Ultrasonic Sensor:, Movement:, etc.)
+                text_surface = render_text(self.text_font, instruction, (255, 200, 0))
+            elif instruction.startswith("Position yourself") or instruction.startswith("Use precise timing"):
+                # Tips
+                text_surface = render_text(self.text_font, instruction, (100, 255, 100))
+            else:
+                # Regular instructions
+                text_surface = render_text(self.text_font, instruction, text_color)
             
-            pg.display.flip()
-            time.sleep(0.1)  # Small delay for smooth countdown
+            text_x = surface.get_width() // 2 - text_surface.get_width() // 2
+            surface.blit(text_surface, (text_x, y_offset))
+            y_offset += 25
+
+    def draw_countdown(self, surface, countdown):
+        """Redraw only the countdown line, returning the area that changed"""
+        countdown_rect = pg.Rect(0, 500, surface.get_width(), self.countdown_font.get_linesize())
+        surface.fill((25, 25, 35), countdown_rect)
+        countdown_surface = render_text(self.countdown_font, f"Starting in {countdown}...", (255, 255, 0))
+        countdown_x = surface.get_width() // 2 - countdown_surface.get_width() // 2
+        surface.blit(countdown_surface, (countdown_x, 500))
+        return countdown_rect
 
     def reset_for_new_game(self):
         """Reset the screen for a new game"""
         self.final_time = None
+        self.dirty = True
         # Keep control selection and connection status
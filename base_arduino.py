@@ -2,11 +2,25 @@ import pygame as pg
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import math 
+import time
 from sphere_manager import SphereManager
 
 # Import our custom modules
 from shapes import Shapes
+from mesh import Mesh
+from renderer import create_renderer, set_renderer
+from render_queue import RenderQueue
+from obstacle_batch import ObstacleBatchRenderer
+from sphere_lod import SphereLOD
+from frustum import Frustum
+from collision import CollisionDetector
+from static_scene import StaticScene
+from menu_overlay import MenuOverlay
+from texture_manager import TextureManager
+from frame_profiler import FrameProfiler
+from fixed_timestep import FixedTimestep, TICK_RATE, lerp
 from arduino_controls import ArduinoControls, KeyboardFallbackControls
+from controls import GameControls, actions_for, split_tick_events
 # from character import Character  # Comment out if this file doesn't exist
 from lane_markers import LaneMarkers
 from game_timer import GameTimer
@@ -15,6 +29,10 @@ from game_timer import GameTimer
 from arduino_start_screen import ArduinoStartScreen
 from start_screen import StartScreen
 from button import Button  # Make sure both files are in the same directory
+from ui_events import wait_for_events
+from scene_manager import Scene, SceneManager, QUIT
+from font_cache import font_cache
+from replay import ReplayRecorder, save_replay
 
 def test_arduino_connection(port='COM3', baudrate=115200):
     """Standalone function to test Arduino connection"""
@@ -40,8 +58,12 @@ def test_arduino_connection(port='COM3', baudrate=115200):
         print(f"Arduino connection test error: {e}")
         return False, f"Arduino Error - {str(e)[:30]}..."
 
+INSTRUCTIONS_DURATION = 3.0  # Seconds the control instructions are shown before a round
+GAME_OVER_PAUSE = 1.0        # Seconds the final frame stays up before the start screen
+
 class ArduinoApp:
-    def __init__(self, arduino_port='COM3', arduino_baudrate=115200):
+    def __init__(self, arduino_port='COM3', arduino_baudrate=115200, renderer_backend='auto', headless=False,
+                 tick_rate=TICK_RATE):
         # Initialize pygame
         pg.init()
         self.clock = pg.time.Clock()
@@ -50,19 +72,48 @@ class ArduinoApp:
         self.arduino_port = arduino_port
         self.arduino_baudrate = arduino_baudrate
         
+        # "auto" (shaders with fixed-function fallback), "shader" or "fixed"
+        self.renderer_backend = renderer_backend
+        
         # Initialize Arduino start screen
         self.start_screen = ArduinoStartScreen((800, 600))
         
+        # Textures are shared and reference-counted across rounds
+        self.texture_manager = TextureManager()
+        self.mr_electric_texture = None
+        
         # Control variables
         self.controls = None
         self.using_arduino = False
         self.arduino_available = False
+        self.selected_control = None
+        
+        # Game state reused across rounds, simulated at a fixed tick rate whatever the frame rate
+        self.sphere_manager = None
+        self.timestep = FixedTimestep(tick_rate)
+        self.pending_events = []
+        self.collision = CollisionDetector()
+        self.hits = []
+        # Every round is recorded and saved for replay.py (not in the benchmark)
+        self.recorder = None if headless else ReplayRecorder(tick_rate)
+        
+        # Per-subsystem frame timings (enabled by the headless benchmark)
+        self.profiler = FrameProfiler(enabled=False)
+        
+        if headless:
+            # Offscreen benchmark: no menus, the caller owns the context and drives frames (see headless.py)
+            self.initialize_selected_controls("keyboard")
+            return
         
         # Test Arduino connection and update start screen
         self.check_and_display_arduino_status()
         
-        # Show start screen with control selection
-        self.show_start_screen()
+        # One OpenGL window for the whole session
+        self.init_display()
+        
+        # Start screen, instructions, rounds and game over run as flat scenes
+        self.build_scenes()
+        self.run()
 
     def check_and_display_arduino_status(self):
         """Check Arduino connection and update the start screen display"""
@@ -91,23 +142,23 @@ class ArduinoApp:
             if self.arduino_available:
                 try:
                     self.start_screen.add_connection_message("Initializing Arduino controls...", "info")
-                    self.controls = ArduinoControls(port=self.arduino_port, baudrate=self.arduino_baudrate)
+                    self.controls = ArduinoControls(port=self.arduino_port, baudrate=self.arduino_baudrate,
+                                                    tick_rate=self.timestep.tick_rate)
                     self.using_arduino = True
                     self.start_screen.add_connection_message("Arduino controls ready!", "success")
                     print("Arduino controls initialized!")
                 except Exception as e:
                     self.start_screen.add_connection_message(f"Arduino failed, using keyboard: {e}", "error")
-                    self.controls = KeyboardFallbackControls()
+                    self.controls = KeyboardFallbackControls(self.timestep.tick_rate)
                     self.using_arduino = False
             else:
                 self.start_screen.add_connection_message("Arduino not available, using keyboard", "warning")
-                self.controls = KeyboardFallbackControls()
+                self.controls = KeyboardFallbackControls(self.timestep.tick_rate)
                 self.using_arduino = False
         else:  # keyboard
-            self.controls = KeyboardFallbackControls()
+            self.controls = KeyboardFallbackControls(self.timestep.tick_rate)
             self.using_arduino = False
             self.start_screen.add_connection_message("Keyboard controls initialized", "success")
-            print("Keyboard controls initialized")
 
     def display_control_info(self):
         """Display information about current control method"""
@@ -139,287 +190,495 @@ class ArduinoApp:
         print("Timer: Shows your survival time in MM:SS:mmm format")
         print("="*60 + "\n")
 
-    def game_setup(self):
-        """Set up the game state - called at start and restart"""
-        # Recreate OpenGL context
+    def init_display(self):
+        """Open the OpenGL window once; menus and rounds all render into it"""
         self.screen = pg.display.set_mode((800, 600), pg.OPENGL | pg.DOUBLEBUF)
         pg.display.set_caption("Force Cube Runner")
+        Mesh.invalidate_all()  # New context - GPU meshes must be re-uploaded
+        self.setup_graphics()
+
+    def setup_graphics(self):
+        """Create the renderer and the GPU-backed objects for the current OpenGL context"""
+        self.renderer = create_renderer(self.renderer_backend)
+        # Draw calls are queued and submitted sorted by state once per frame
+        self.render_queue = RenderQueue(self.renderer)
+        set_renderer(self.render_queue)
         
         # OpenGL setup
         glClearColor(1, 0.929, 0.961, 0.5)
         glEnable(GL_DEPTH_TEST)
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(45, 800/600, 0.1, 50.0)
-        glMatrixMode(GL_MODELVIEW)
-        
-        self.rotation_angle = 0
+        self.renderer.set_projection(45, 800/600, 0.1, 50.0)
         
         # Camera position variables
         self.camera_x = 0.0
         self.camera_y = 50.0
         self.camera_z = 0.0
         
-        # Reset game objects
         self.shapes = Shapes()
         self.lane_markers = LaneMarkers()
-        self.sphere_manager = SphereManager()  # Reset sphere manager
-        self.game_timer = GameTimer()  # Reset timer
-        # Load MrElectric.png as OpenGL texture
+        self.sphere_lod = SphereLOD()
+        self.frustum = Frustum(45, 800/600, 0.1, 50.0)  # Must match set_projection above
+        self.obstacle_renderer = ObstacleBatchRenderer(lod=self.sphere_lod, frustum=self.frustum)
+        self.game_timer = GameTimer()
+        # Load MrElectric.png as OpenGL texture (drop the old context's reference first)
+        if self.mr_electric_texture is not None:
+            self.texture_manager.release(self.mr_electric_texture)
         self.mr_electric_texture = self.load_texture('MrElectric.png')
+        # Background, ground strips and boundary walls are baked once per context
+        self.static_scene = StaticScene(self.mr_electric_texture)
+        # Start, instructions and game-over screens are shown through this overlay
+        self.menu_overlay = MenuOverlay((800, 600))
+
+    def game_setup(self):
+        """Reset the simulation for a new round - the OpenGL context and its resources are kept"""
+        self.rotation_angle = 0
+        if self.sphere_manager is None:
+            self.sphere_manager = SphereManager(tick_rate=self.timestep.tick_rate)
+        else:
+            self.sphere_manager.reset()  # Same object, fresh obstacles
+        self.previous_cube = self.controls.get_cube_position()
+        self.timestep.reset()  # Time spent in menus isn't simulated
+        self.pending_events = []
+        if self.recorder is not None:
+            self.recorder.start(self.sphere_manager, self.controls, self.using_arduino)
+        self.game_timer.reset_timer()  # Reset timer
+
+    def setup_scene(self):
+        """Graphics plus a fresh round for the current OpenGL context (used by the headless benchmark)"""
+        self.setup_graphics()
+        self.game_setup()
+
+    def present_menu(self, rects):
+        """Show the menu surface in the OpenGL window, uploading only the changed rectangles"""
+        if not rects:
+            return
+        self.menu_overlay.update(rects)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.menu_overlay.draw()
+        self.render_queue.flush()
+        pg.display.flip()
+
     def load_texture(self, filename):
-        surface = pg.image.load(filename)
-        image = pg.image.tostring(surface, 'RGBA', True)
-        width, height = surface.get_size()
-        tex_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex_id)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, image)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        return tex_id
+        """Load a texture through the shared texture manager (cached, mipmapped)"""
+        return self.texture_manager.load(filename)
         
         # Reset Arduino controls position
         if hasattr(self.controls, 'reset_position'):
             self.controls.reset_position()
 
-    def show_start_screen(self):
-        surface = pg.display.set_mode((800, 600))  # Temporarily disable OpenGL for start screen
+    def build_scenes(self):
+        """Start -> instructions -> playing -> game over -> start, run without recursion"""
+        self.scenes = SceneManager()
+        self.scenes.add(Scene('start', self.start_frame, enter=self.enter_start))
+        self.scenes.add(Scene('instructions', self.instructions_frame, enter=self.enter_instructions))
+        self.scenes.add(Scene('playing', self.playing_frame, enter=self.enter_playing))
+        self.scenes.add(Scene('game_over', self.game_over_frame, enter=self.enter_game_over))
+
+    def run(self):
+        """Run the game until the window is closed"""
+        self.scenes.run('start')
+        print(f"Scene timing: {self.scenes.get_stats()}")
+        self.quit()
+
+    def enter_start(self):
         # Clean up previous controls if they exist
         if self.controls and hasattr(self.controls, 'cleanup'):
             self.controls.cleanup()
-        # Phase 1: Show selection screen with Arduino status
-        showing_selection = True
-        selected_control = None
-        while showing_selection:
-            events = pg.event.get()
-            result = self.start_screen.handle_events(events)
-            self.start_screen.draw(surface)
-            if result == "QUIT":
-                pg.quit()
-                exit()
-            elif result == "SELECT_ARDUINO":
-                selected_control = "arduino"
-                self.initialize_selected_controls("arduino")
-                showing_selection = False
-            elif result == "SELECT_KEYBOARD":
-                selected_control = "keyboard"
-                self.initialize_selected_controls("keyboard")
-                showing_selection = False
-        # Phase 2: Show control instructions for 3 seconds
-        if selected_control:
-            self.start_screen.show_control_instructions(surface, selected_control)
-        # After countdown, set up the game and start main loop
-        self.display_control_info()
+        self.start_screen.invalidate()  # The game was drawn over the menu since it was last shown
+
+    def start_frame(self):
+        """Selection screen with Arduino status"""
+        # Menus are drawn by pygame into an offscreen surface shown as a GL overlay
+        self.present_menu(self.start_screen.draw(self.menu_overlay.surface))
+        self.clock.tick(30)  # Cap menu redraws when events flood in
+        # Sleep until input arrives or the connection log needs to fade
+        events = wait_for_events(self.start_screen.next_update_delay())
+        result = self.start_screen.handle_events(events)
+        if result == "QUIT":
+            return QUIT
+        elif result == "SELECT_ARDUINO":
+            self.selected_control = "arduino"
+        elif result == "SELECT_KEYBOARD":
+            self.selected_control = "keyboard"
+        else:
+            return None
+        self.initialize_selected_controls(self.selected_control)
+        return 'instructions'
+
+    def enter_instructions(self):
+        # The instructions never change during the countdown - draw them once
+        surface = self.menu_overlay.surface
+        self.start_screen.draw_instructions_page(surface, self.selected_control)
+        self.present_menu([surface.get_rect()])
+        self.instructions_start = time.time()
+        self.shown_countdown = None
+
+    def instructions_frame(self):
+        """Control instructions with a 3 second countdown"""
+        remaining_time = INSTRUCTIONS_DURATION - (time.time() - self.instructions_start)
+        if remaining_time <= 0:
+            self.display_control_info()
+            return 'playing'
+        countdown = int(remaining_time) + 1
+        
+        # Only the countdown line changes, once per second
+        if countdown != self.shown_countdown:
+            self.present_menu([self.start_screen.draw_countdown(self.menu_overlay.surface, countdown)])
+            self.shown_countdown = countdown
+        
+        # Sleep until the next countdown step unless an event arrives
+        events = wait_for_events((remaining_time - (countdown - 1)) * 1000)
+        if any(event.type == pg.QUIT for event in events):
+            return QUIT
+        return None
+
+    def enter_playing(self):
         self.game_setup()
-        self.mainLoop()
-
-    def mainLoop(self):
-        running = True
-        frame_count = 0
-
-        while running:
-            # Get all events
-            events = pg.event.get()
-            
-            # Check for quit events
-            for event in events:
-                if event.type == pg.QUIT:
-                    running = False
-                elif event.type == pg.KEYDOWN:
-                    # Additional keyboard shortcuts
-                    if event.key == pg.K_r:  # R key to reset timer
-                        self.game_timer.reset_timer()
-                        print("Timer reset!")
-                    elif event.key == pg.K_p:  # P key to pause/resume timer
-                        if self.game_timer.is_paused:
-                            self.game_timer.resume_timer()
-                            print("Timer resumed!")
-                        else:
-                            self.game_timer.pause_timer()
-                            print("Timer paused!")
-                    elif event.key == pg.K_i:  # I key to show sensor info (Arduino only)
-                        if self.using_arduino and hasattr(self.controls, 'get_sensor_status'):
-                            status = self.controls.get_sensor_status()
-                            print(f"Arduino Status: {status}")
-            
-            # Handle game controls
+        self.frame_count = 0
+
+    def playing_frame(self):
+        """One frame of the game; returns 'game_over' when the cube is hit"""
+        # Get all events
+        events = pg.event.get()
+        
+        # Check for quit events
+        for event in events:
+            if event.type == pg.QUIT:
+                return QUIT
+            elif event.type == pg.KEYDOWN:
+                # Additional keyboard shortcuts
+                if event.key == pg.K_r:  # R key to reset timer
+                    self.game_timer.reset_timer()
+                    print("Timer reset!")
+                elif event.key == pg.K_p:  # P key to pause/resume timer
+                    if self.game_timer.is_paused:
+                        self.game_timer.resume_timer()
+                        print("Timer resumed!")
+                    else:
+                        self.game_timer.pause_timer()
+                        print("Timer paused!")
+                elif event.key == pg.K_l:  # L key to show sphere LOD tiers
+                    self.sphere_lod.toggle_debug()
+                elif event.key == pg.K_c:  # C key to show culling stats for the last frame
+                    print(f"Culling: {self.frustum.get_stats()}")
+                elif event.key == pg.K_t:  # T key to show texture memory use
+                    print(f"Textures: {self.texture_manager.get_stats()}")
+                elif event.key == pg.K_q:  # Q key to show render queue state changes for the last frame
+                    print(f"Render queue: {self.render_queue.get_stats()}")
+                elif event.key == pg.K_f:  # F key to show font/text cache hit rate
+                    print(f"Font cache: {font_cache.get_stats()}")
+                elif event.key == pg.K_s:  # S key to show time spent in each scene
+                    print(f"Scenes: {self.scenes.get_stats()}")
+                elif event.key == pg.K_i:  # I key to show sensor info (Arduino only)
+                    if self.using_arduino and hasattr(self.controls, 'get_sensor_status'):
+                        status = self.controls.get_sensor_status()
+                        print(f"Arduino Status: {status}")
+        
+        self.profiler.begin_frame()
+        hit = self.simulate(events)
+        # On a hit, show the moment of contact
+        self.render_frame(self.hits[0].fraction if hit else self.timestep.alpha)
+        if hit:
+            # Show the frame with the collision during the game-over pause
+            pg.display.flip()
+            return 'game_over'
+
+        # Display Arduino sensor info periodically (every 60 frames = 1 second)
+        if self.using_arduino and hasattr(self.controls, 'get_sensor_status'):
+            self.frame_count += 1
+            if self.frame_count % 60 == 0:  # Every second
+                status = self.controls.get_sensor_status()
+                print(f"Arduino: Joystick=({status.get('joystick_x', 'N/A'):+4}, {status.get('joystick_y', 'N/A'):+4}), "
+                      f"Distance={status.get('ultrasonic_distance', 'N/A'):5.1f}cm, "
+                      f"Lane={status.get('lane_name', 'N/A')}, "
+                      f"State={status.get('movement_state', 'N/A')}")
+        
+        with self.profiler.section('present'):
+            pg.display.flip()
+        self.profiler.end_frame()
+
+        # Frame cap only - a missed frame no longer slows the game down
+        self.clock.tick(60)
+        return None
+
+    def enter_game_over(self):
+        self.game_timer.end_timer()
+        final_time = self.game_timer.format_time(self.game_timer.get_elapsed_time())
+        self.start_screen.set_final_time(final_time)
+        print(f"Game over after {final_time}: {self.hits}")
+        if self.recorder is not None:
+            print(f"Replay saved to {save_replay(self.recorder.finish(self.hits[0].time))}")
+        self.game_over_start = time.time()
+
+    def game_over_frame(self):
+        """Hold the final frame for a second (the window stays responsive) before the start screen"""
+        remaining_time = GAME_OVER_PAUSE - (time.time() - self.game_over_start)
+        if remaining_time <= 0:
+            return 'start'
+        events = wait_for_events(remaining_time * 1000)
+        if any(event.type == pg.QUIT for event in events):
+            return QUIT
+        return None
+
+    def simulate(self, events):
+        """Run the simulation ticks owed since the last frame; returns True if the cube was hit"""
+        # Key presses wait for the next tick if none is due this frame
+        self.pending_events.extend(events)
+        for _ in range(self.timestep.advance()):
+            events, self.pending_events = split_tick_events(self.pending_events)
+            if self.update_frame(events):
+                return True
+        return False
+
+    def update_frame(self, events):
+        """Advance controls and obstacles by one simulation tick; returns the tick's hit events"""
+        self.previous_cube = self.controls.get_cube_position()
+        # Handle game controls
+        with self.profiler.section('input'):
             self.controls.handle_events(events)
             self.controls.handle_continuous_input()
             self.controls.update_movement()
-            
-            # Get cube position from controls
-            cube_x, cube_y, cube_distance = self.controls.get_cube_position()
+        
+        # Move objects (wall and spheres) using SphereManager
+        with self.profiler.section('simulation'):
+            self.sphere_manager.update_positions()
+        
+        with self.profiler.section('collision'):
+            self.hits = self.check_collision()
+        if self.recorder is not None:
+            self.recorder.record(actions_for(events))
+        return self.hits
+
+    def check_collision(self):
+        """Hit events for the obstacles touching the cube (empty list if none)"""
+        return self.collision.check(self.sphere_manager, self.controls.get_cube_position(), self.previous_cube)
+
+    def render_frame(self, alpha=1.0):
+        """Draw the scene between the previous simulation tick (alpha=0) and the latest one (alpha=1)"""
+        cube_x, cube_y, cube_distance = lerp(self.previous_cube, self.controls.get_cube_position(), alpha)
+        # Draws are charged back to the section that queued them (headless.py swaps in its own profiler)
+        self.render_queue.profiler = self.profiler
 
-            # Refresh screen
+        # Refresh screen
+        with self.profiler.section('clear'):
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            self.frustum.begin_frame()
 
             # Apply camera transformation
             glLoadIdentity()  # Reset transformations
             glTranslatef(-self.camera_x, -self.camera_y, -self.camera_z)  # Move camera
-            
-            # Draw background surface with MrElectric.png
-            self.shapes.draw_background_surface(self.mr_electric_texture)
-            # Draw the cube using the shapes module
+        
+        # Draw the baked static layer (background with MrElectric.png, ground lanes, boundary walls)
+        with self.profiler.section('static_scene'):
+            self.static_scene.draw()
+        # Draw the cube using the shapes module
+        with self.profiler.section('cube'):
             self.shapes.draw_cube(cube_x, cube_y, cube_distance, self.rotation_angle)
-            
-            # Update and draw objects (wall and spheres) using SphereManager
-            self.sphere_manager.update_positions()
-            self.sphere_manager.draw_objects(self.shapes, self.rotation_angle)
-
-            # Collision detection logic (using Arduino control lane positions)
-            cube_lane = None
-            if abs(cube_x - (-4.0)) < 0.5:  # Left lane at -4.0
-                cube_lane = 'left'
-            elif abs(cube_x - 0.0) < 0.5:   # Center lane at 0.0
-                cube_lane = 'middle'
-            elif abs(cube_x - 4.0) < 0.5:   # Right lane at 4.0
-                cube_lane = 'right'
-            
-            collision_threshold = 2.0
-            objects = [
-                ('left', self.sphere_manager.left_sphere_z, self.sphere_manager.left_sphere_y, self.sphere_manager.left_is_wall),
-                ('middle', self.sphere_manager.middle_sphere_z, self.sphere_manager.middle_sphere_y, self.sphere_manager.middle_is_wall),
-                ('right', self.sphere_manager.right_sphere_z, self.sphere_manager.right_sphere_y, self.sphere_manager.right_is_wall)
-            ]
-            cube_radius = 1.0
-            
-            for lane, obj_z, obj_y, is_wall in objects:
-                if cube_lane == lane and abs(obj_z - cube_distance) < collision_threshold:
-                    if is_wall:
-                        # Hit a wall - game over
-                        self.game_timer.end_timer()
-                        final_time = self.game_timer.format_time(self.game_timer.get_elapsed_time())
-                        self.start_screen.set_final_time(final_time)
-                        pg.display.flip()
-                        pg.time.wait(1000)
-                        self.show_start_screen()
-                        return
-                    else:
-                        # Hit a sphere - check Y collision too
-                        if abs(cube_y - obj_y) < (cube_radius + 1.5):
-                            self.game_timer.end_timer()
-                            final_time = self.game_timer.format_time(self.game_timer.get_elapsed_time())
-                            self.start_screen.set_final_time(final_time)
-                            pg.display.flip()
-                            pg.time.wait(1000)
-                            self.show_start_screen()
-                            return
-
-            # Draw lane markers
-            self.lane_markers.draw_all_lane_markers()
-
-            # Draw timer on top (last, so it appears over everything)
-            self.game_timer.draw_timer()
+        with self.profiler.section('obstacles'):
+            self.sphere_manager.draw_objects_batched(self.obstacle_renderer, self.rotation_angle, alpha)
 
-            # Update rotation
-            # self.rotation_angle += 1
-            # if self.rotation_angle >= 360:
-            self.rotation_angle = 0
-            
-            # Display Arduino sensor info periodically (every 60 frames = 1 second)
-            if self.using_arduino and hasattr(self.controls, 'get_sensor_status'):
-                frame_count += 1
-                if frame_count % 60 == 0:  # Every second
-                    status = self.controls.get_sensor_status()
-                    print(f"Arduino: Joystick=({status.get('joystick_x', 'N/A'):+4}, {status.get('joystick_y', 'N/A'):+4}), "
-                          f"Distance={status.get('ultrasonic_distance', 'N/A'):5.1f}cm, "
-                          f"Lane={status.get('lane_name', 'N/A')}, "
-                          f"State={status.get('movement_state', 'N/A')}")
-            
-            pg.display.flip()
+        # Draw timer on top (last, so it appears over everything)
+        with self.profiler.section('hud'):
+            self.game_timer.draw_timer()
+        with self.profiler.section('submit'):
+            self.render_queue.flush()
 
-            # Timing
-            self.clock.tick(60)
+        # Update rotation
+        # self.rotation_angle += 1
+        # if self.rotation_angle >= 360:
+        self.rotation_angle = 0
     
     def quit(self):
         """Clean up resources"""
         if self.using_arduino and hasattr(self.controls, 'cleanup'):
             self.controls.cleanup()
+        self.texture_manager.release_all()
         pg.quit()
 
 class RegularApp:
     """Regular keyboard-only version for compatibility"""
-    def __init__(self):
+    def __init__(self, renderer_backend='auto', headless=False, tick_rate=TICK_RATE):
         # This is the same as the original base.py but organized
-        from controls import GameControls
-        
         # Initialize pygame
         pg.init()
+        self.clock = pg.time.Clock()
+        self.renderer_backend = renderer_backend
+        self.timestep = FixedTimestep(tick_rate)
+        self.pending_events = []
+        self.controls = GameControls(tick_rate)
+        self.previous_cube = self.controls.get_cube_position()
+        self.collision = CollisionDetector()
+        self.hits = []
+        self.recorder = None if headless else ReplayRecorder(tick_rate)
+        # Per-subsystem frame timings (enabled by the headless benchmark)
+        self.profiler = FrameProfiler(enabled=False)
+        if headless:
+            # Offscreen benchmark: the caller owns the context and drives frames (see headless.py)
+            return
+        
         self.screen = pg.display.set_mode((800, 600), pg.OPENGL | pg.DOUBLEBUF)
         pg.display.set_caption("Force Cube Runner - Keyboard Controls")
-        self.clock = pg.time.Clock()
+        Mesh.invalidate_all()
+        self.setup_scene()
         
-        # Show start screen
+        # Start screen (as an overlay in the same OpenGL window), then play
         self.start_screen = StartScreen((800, 600))
-        self.show_start_screen()
+        self.scenes = SceneManager()
+        self.scenes.add(Scene('start', self.start_frame, enter=self.start_screen.invalidate))
+        self.scenes.add(Scene('playing', self.playing_frame, enter=self.enter_playing))
+        self.scenes.add(Scene('game_over', self.game_over_frame, enter=self.enter_game_over))
+        self.scenes.run('start')
+        print(f"Scene timing: {self.scenes.get_stats()}")
+        self.quit()
 
-        # Continue OpenGL setup after start
+    def setup_scene(self):
+        """Create the renderer and game objects for the current OpenGL context"""
         glClearColor(1, 0.929, 0.961, 0.5)
         glEnable(GL_DEPTH_TEST)
 
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(45, 800/600, 0.1, 50.0)
-        glMatrixMode(GL_MODELVIEW)
+        self.renderer = create_renderer(self.renderer_backend)
+        self.renderer.set_projection(45, 800/600, 0.1, 50.0)
+        # Draw calls are queued and submitted sorted by state once per frame
+        self.render_queue = RenderQueue(self.renderer)
+        set_renderer(self.render_queue)
         
         self.rotation_angle = 0
-        self.controls = GameControls()
         self.shapes = Shapes()
         
         self.lane_markers = LaneMarkers()
-        self.sphere_manager = SphereManager()
+        self.sphere_manager = SphereManager(tick_rate=self.timestep.tick_rate)
+        self.sphere_lod = SphereLOD()
+        self.frustum = Frustum(45, 800/600, 0.1, 50.0)  # Must match set_projection above
+        self.obstacle_renderer = ObstacleBatchRenderer(lod=self.sphere_lod, frustum=self.frustum)
         self.game_timer = GameTimer()
-        
+        self.static_scene = StaticScene()
+        self.menu_overlay = MenuOverlay((800, 600))
+
+    def present_menu(self, rects):
+        """Show the menu surface in the OpenGL window, uploading only the changed rectangles"""
+        if not rects:
+            return
+        self.menu_overlay.update(rects)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.menu_overlay.draw()
+        self.render_queue.flush()
+        pg.display.flip()
+
+    def start_frame(self):
+        self.present_menu(self.start_screen.draw(self.menu_overlay.surface))
+        self.clock.tick(30)  # Cap menu redraws when events flood in
+        # Nothing on this screen animates - sleep until input arrives
+        events = wait_for_events()
+        result = self.start_screen.handle_events(events)
+        if result == "QUIT":
+            return QUIT
+        elif result == "START":
+            return 'playing'
+        return None
+
+    def enter_playing(self):
+        # Fresh round with the same manager, renderer and GPU objects
+        self.sphere_manager.reset()
+        self.controls = GameControls(self.timestep.tick_rate)
+        self.previous_cube = self.controls.get_cube_position()
+        self.pending_events = []
+        if self.recorder is not None:
+            self.recorder.start(self.sphere_manager, self.controls)
+        self.game_timer.reset_timer()  # Start timing when play begins
+        self.timestep.reset()
         print("KEYBOARD CONTROLS: LEFT/RIGHT=lanes, UP=jump, DOWN=crouch")
+
+    def playing_frame(self):
+        events = pg.event.get()
         
-        self.mainLoop()
-
-    def show_start_screen(self):
-        surface = pg.display.set_mode((800, 600))
-        showing = True
-        while showing:
-            events = pg.event.get()
-            result = self.start_screen.handle_events(events)
-            self.start_screen.draw(surface)
-            if result == "QUIT":
-                pg.quit()
-                exit()
-            elif result == "START":
-                showing = False
-        self.screen = pg.display.set_mode((800, 600), pg.OPENGL | pg.DOUBLEBUF)
+        for event in events:
+            if event.type == pg.QUIT:
+                return QUIT
+            elif event.type == pg.KEYDOWN:
+                if event.key == pg.K_r:
+                    self.game_timer.reset_timer()
+                elif event.key == pg.K_l:
+                    self.sphere_lod.toggle_debug()
+                elif event.key == pg.K_s:
+                    print(f"Scenes: {self.scenes.get_stats()}")
+        
+        self.profiler.begin_frame()
+        self.pending_events.extend(events)
+        hit = False
+        for _ in range(self.timestep.advance()):
+            events, self.pending_events = split_tick_events(self.pending_events)
+            if self.update_frame(events):
+                hit = True
+                break
+        self.render_frame(self.hits[0].fraction if hit else self.timestep.alpha)
+        with self.profiler.section('present'):
+            pg.display.flip()
+        self.profiler.end_frame()
+        if hit:
+            return 'game_over'
+        self.clock.tick(60)
+        return None
+
+    def enter_game_over(self):
+        self.game_timer.end_timer()
+        self.start_screen.set_final_time(self.game_timer.format_time(self.game_timer.get_elapsed_time()))
+        if self.recorder is not None:
+            print(f"Replay saved to {save_replay(self.recorder.finish(self.hits[0].time))}")
+        self.game_over_start = time.time()
+
+    def game_over_frame(self):
+        remaining_time = GAME_OVER_PAUSE - (time.time() - self.game_over_start)
+        if remaining_time <= 0:
+            return 'start'
+        events = wait_for_events(remaining_time * 1000)
+        if any(event.type == pg.QUIT for event in events):
+            return QUIT
+        return None
 
-    def mainLoop(self):
-        running = True
-        while running:
-            events = pg.event.get()
-            
-            for event in events:
-                if event.type == pg.QUIT:
-                    running = False
-                elif event.type == pg.KEYDOWN:
-                    if event.key == pg.K_r:
-                        self.game_timer.reset_timer()
-            
+    def update_frame(self, events):
+        """Advance controls and obstacles by one simulation tick; returns the tick's hit events"""
+        self.previous_cube = self.controls.get_cube_position()
+        with self.profiler.section('input'):
             self.controls.handle_events(events)
             self.controls.handle_continuous_input()
             self.controls.update_movement()
-            
-            cube_x, cube_y, cube_distance = self.controls.get_cube_position()
+        with self.profiler.section('simulation'):
+            self.sphere_manager.update_positions()
+        with self.profiler.section('collision'):
+            self.hits = self.collision.check(self.sphere_manager, self.controls.get_cube_position(),
+                                             self.previous_cube)
+        if self.recorder is not None:
+            self.recorder.record(actions_for(events))
+        return self.hits
+
+    def render_frame(self, alpha=1.0):
+        """Draw the scene between the previous simulation tick (alpha=0) and the latest one (alpha=1)"""
+        cube_x, cube_y, cube_distance = lerp(self.previous_cube, self.controls.get_cube_position(), alpha)
+        # Draws are charged back to the section that queued them (headless.py swaps in its own profiler)
+        self.render_queue.profiler = self.profiler
 
+        with self.profiler.section('clear'):
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            self.frustum.begin_frame()
+        with self.profiler.section('cube'):
             self.shapes.draw_cube(cube_x, cube_y, cube_distance, self.rotation_angle)
-            self.sphere_manager.update_positions()
-            self.sphere_manager.draw_objects(self.shapes, self.rotation_angle)
-            self.lane_markers.draw_all_lane_markers()
+        with self.profiler.section('obstacles'):
+            self.sphere_manager.draw_objects_batched(self.obstacle_renderer, self.rotation_angle, alpha)
+        with self.profiler.section('static_scene'):
+            self.static_scene.draw()
+        with self.profiler.section('hud'):
             self.game_timer.draw_timer()
-            
-            self.rotation_angle = 0
-            pg.display.flip()
-            self.clock.tick(60)
+        with self.profiler.section('submit'):
+            self.render_queue.flush()
+        
+        self.rotation_angle = 0
     
     def quit(self):
         pg.quit()
 
 if __name__ == "__main__":
+    import sys
+    # --fixed-function keeps the legacy OpenGL 1.x pipeline for old drivers
+    backend = 'fixed' if '--fixed-function' in sys.argv[1:] else 'auto'
     # Start the Arduino-enabled game with GUI startup flow
-    myApp = ArduinoApp()
+    myApp = ArduinoApp(renderer_backend=backend)
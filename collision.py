@@ -0,0 +1,325 @@
+from collections import deque
+import numpy as np
+
+# Half extents of the player's cube and of a wall obstacle (see Shapes.draw_cube / draw_wall)
+CUBE_HALF_EXTENTS = (1.0, 1.0, 1.0)
+WALL_HALF_EXTENTS = (1.5, 3.0, 1.0)
+
+
+class LaneQueues:
+    """
+    Obstacle slots of each lane in spawn order
+
+    Obstacles in a lane all move at the same speed, so spawn order is also
+    z order: the front of each queue is the obstacle nearest the player.
+    Slots are reused, so every entry carries the slot's generation and
+    entries from an earlier use of the slot are dropped when reached.
+    """
+
+    def __init__(self, lane_count, slot_count):
+        self.lanes = [deque() for _ in range(lane_count)]
+        self.generation = np.zeros(slot_count, dtype=np.int64)
+
+    def clear(self):
+        for queue in self.lanes:
+            queue.clear()
+
+    def push(self, slots, lanes):
+        """Record newly spawned obstacles (at the back of their lanes)"""
+        for slot, lane in zip(slots.tolist(), lanes.tolist()):
+            self.generation[slot] += 1
+            self.lanes[lane].append((slot, int(self.generation[slot])))
+
+
+class HitEvent:
+    """One obstacle touching the cube"""
+
+    def __init__(self, slot, lane, is_wall, position, fraction=1.0, time=None):
+        self.slot = slot
+        self.lane = lane
+        self.is_wall = is_wall
+        self.position = position  # Obstacle center (x, y, z) at the moment of contact
+        self.fraction = fraction  # When contact began within the last tick (0 = start, 1 = end)
+        self.time = time          # Seconds since the round started, if known
+
+    def __repr__(self):
+        kind = "wall" if self.is_wall else "sphere"
+        return (f"HitEvent({kind}, lane={self.lane}, slot={self.slot}, position={self.position}, "
+                f"fraction={self.fraction:.3f})")
+
+
+def aabb_overlap(center_a, half_a, center_b, half_b):
+    """True if two axis-aligned boxes overlap"""
+    return all(abs(a - b) < ha + hb for a, ha, b, hb in zip(center_a, half_a, center_b, half_b))
+
+
+def aabb_sphere_overlap(center, half, sphere_center, radius):
+    """True if a box and a sphere overlap (closest point on the box inside the sphere)"""
+    return _box_distance_sq(sphere_center, center, half) < radius * radius
+
+
+def _box_distance_sq(point, center, half):
+    """Squared distance from a point to a box (0 inside)"""
+    distance_sq = 0.0
+    for p, c, h in zip(point, center, half):
+        d = abs(p - c) - h
+        if d > 0:
+            distance_sq += d * d
+    return distance_sq
+
+
+def swept_aabb(start_a, end_a, half_a, start_b, end_b, half_b):
+    """
+    Time span in [0, 1] during which two moving boxes overlap: (enter, exit) or None
+
+    Both boxes move in a straight line from start to end over the interval;
+    per axis the overlap is an interval of time (slab test), and the boxes
+    touch where all three intervals meet.
+    """
+    enter, exit = 0.0, 1.0
+    for a0, a1, ha, b0, b1, hb in zip(start_a, end_a, half_a, start_b, end_b, half_b):
+        extent = ha + hb
+        offset = b0 - a0                  # B relative to A at t = 0
+        velocity = (b1 - b0) - (a1 - a0)  # ... and its change over the interval
+        if velocity == 0.0:
+            if abs(offset) >= extent:
+                return None
+            continue
+        t1 = (-extent - offset) / velocity
+        t2 = (extent - offset) / velocity
+        if t1 > t2:
+            t1, t2 = t2, t1
+        enter = max(enter, t1)
+        exit = min(exit, t2)
+        if enter >= exit:
+            return None
+    return enter, exit
+
+
+def swept_aabb_sphere(start_box, end_box, half, start_sphere, end_sphere, radius, iterations=24):
+    """
+    Earliest time in [0, 1] at which a moving box and a moving sphere overlap, or None
+
+    The box/sphere distance along straight-line motion is convex in time,
+    so after a conservative box test narrows the interval, the closest
+    approach is found by ternary search and the first contact by bisection.
+    """
+    span = swept_aabb(start_box, end_box, half, start_sphere, end_sphere, (radius, radius, radius))
+    if span is None:
+        return None
+    radius_sq = radius * radius
+
+    def gap(t):
+        box = [s + (e - s) * t for s, e in zip(start_box, end_box)]
+        sphere = [s + (e - s) * t for s, e in zip(start_sphere, end_sphere)]
+        return _box_distance_sq(sphere, box, half) - radius_sq
+
+    low, high = span
+    if gap(low) < 0:
+        return low
+    # Closest approach within the span
+    a, b = low, high
+    for _ in range(iterations):
+        m1 = a + (b - a) / 3.0
+        m2 = b - (b - a) / 3.0
+        if gap(m1) < gap(m2):
+            b = m2
+        else:
+            a = m1
+    closest = (a + b) / 2.0
+    if gap(closest) >= 0:
+        return None
+    # First contact: gap falls from >= 0 at `low` to < 0 at `closest`
+    a, b = low, closest
+    for _ in range(iterations):
+        middle = (a + b) / 2.0
+        if gap(middle) < 0:
+            b = middle
+        else:
+            a = middle
+    return b
+
+
+class CollisionDetector:
+    """
+    Broad phase over per-lane z-ordered queues, then exact box/sphere tests
+
+    Each check drops obstacles that have passed the cube from the front of
+    their lane's queue and tests only the ones within reach, stopping at
+    the first obstacle that hasn't reached the cube yet - a constant amount
+    of work per lane however many obstacles are on the track.
+
+    In continuous mode every obstacle is swept from its previous-tick
+    position (prev_z) to its current one and the cube from previous_cube
+    to cube_position, so fast obstacles or lane changes can't tunnel
+    through each other between ticks; hits report when contact began.
+    """
+
+    def __init__(self, cube_half_extents=CUBE_HALF_EXTENTS, wall_half_extents=WALL_HALF_EXTENTS,
+                 continuous=True):
+        self.cube_half = cube_half_extents
+        self.wall_half = wall_half_extents
+        self.continuous = continuous
+        self.tests = 0  # Narrow-phase tests in the last check
+
+    def check(self, obstacles, cube_position, previous_cube=None):
+        """
+        Return a HitEvent for every obstacle touching the cube, earliest contact first
+
+        `obstacles` is a SphereManager (lane_x, x/y/z/prev_z/radius/is_wall
+        arrays and lane_queues()). Without previous_cube (or with
+        continuous off) only the current positions are tested.
+        """
+        if not self.continuous or previous_cube is None:
+            return self._check_discrete(obstacles, cube_position)
+        return self._check_swept(obstacles, previous_cube, cube_position)
+
+    def _check_discrete(self, obstacles, cube_position):
+        cx, cy, cz = cube_position
+        hx, hy, hz = self.cube_half
+        z, radius, is_wall = obstacles.z, obstacles.radius, obstacles.is_wall
+        queues = obstacles.lane_queues()
+        generation = queues.generation
+        # Largest distance an obstacle can reach from its center along x and z
+        reach_x = max(self.wall_half[0], float(obstacles.lane_radius.max()))
+        reach_z = max(self.wall_half[2], float(obstacles.lane_radius.max()))
+        hits = []
+        self.tests = 0
+
+        for lane, queue in enumerate(queues.lanes):
+            lane_x = float(obstacles.lane_x[lane])
+            # Drop obstacles that are past the cube for good (z only increases), or whose slot was reused
+            while queue:
+                slot, gen = queue[0]
+                if gen == generation[slot] and z[slot] - reach_z <= cz + hz:
+                    break
+                queue.popleft()
+            if abs(lane_x - cx) >= hx + reach_x:
+                continue  # Cube is nowhere near this lane
+
+            for slot, gen in queue:
+                if z[slot] + reach_z <= cz - hz:
+                    break  # This one and everything behind it hasn't reached the cube
+                if gen != generation[slot]:
+                    continue
+                self.tests += 1
+                center = (lane_x, float(obstacles.y[slot]), float(z[slot]))
+                if is_wall[slot]:
+                    hit = aabb_overlap(cube_position, self.cube_half, center, self.wall_half)
+                else:
+                    hit = aabb_sphere_overlap(cube_position, self.cube_half, center, float(radius[slot]))
+                if hit:
+                    hits.append(HitEvent(slot, lane, bool(is_wall[slot]), center, 1.0, obstacles.time_of(1.0)))
+        return hits
+
+    def _check_swept(self, obstacles, previous_cube, cube_position):
+        hx, hy, hz = self.cube_half
+        # Region the cube covered during the tick
+        min_x = min(previous_cube[0], cube_position[0]) - hx
+        max_x = max(previous_cube[0], cube_position[0]) + hx
+        min_z = min(previous_cube[2], cube_position[2]) - hz
+        max_z = max(previous_cube[2], cube_position[2]) + hz
+        z, prev_z, y = obstacles.z, obstacles.prev_z, obstacles.y
+        radius, is_wall = obstacles.radius, obstacles.is_wall
+        queues = obstacles.lane_queues()
+        generation = queues.generation
+        reach_x = max(self.wall_half[0], float(obstacles.lane_radius.max()))
+        reach_z = max(self.wall_half[2], float(obstacles.lane_radius.max()))
+        hits = []
+        self.tests = 0
+
+        for lane, queue in enumerate(queues.lanes):
+            lane_x = float(obstacles.lane_x[lane])
+            # Past the cube's region at the start of the tick means past for good
+            while queue:
+                slot, gen = queue[0]
+                if gen == generation[slot] and prev_z[slot] - reach_z < max_z:
+                    break
+                queue.popleft()
+            if lane_x + reach_x <= min_x or lane_x - reach_x >= max_x:
+                continue  # Cube was nowhere near this lane during the tick
+
+            for slot, gen in queue:
+                if z[slot] + reach_z <= min_z:
+                    break  # Didn't reach the cube's region this tick, nor did anything behind it
+                if gen != generation[slot]:
+                    continue
+                self.tests += 1
+                start = (lane_x, float(y[slot]), float(prev_z[slot]))
+                end = (lane_x, float(y[slot]), float(z[slot]))
+                if is_wall[slot]:
+                    span = swept_aabb(previous_cube, cube_position, self.cube_half, start, end, self.wall_half)
+                    fraction = None if span is None else span[0]
+                else:
+                    fraction = swept_aabb_sphere(previous_cube, cube_position, self.cube_half,
+                                                 start, end, float(radius[slot]))
+                if fraction is not None:
+                    center = (lane_x, start[1], start[2] + (end[2] - start[2]) * fraction)
+                    hits.append(HitEvent(slot, lane, bool(is_wall[slot]), center, fraction,
+                                         obstacles.time_of(fraction)))
+        hits.sort(key=lambda hit: hit.fraction)
+        return hits
+
+
+def swept_aabb_batch(offset, velocity, extent):
+    """
+    Vectorized swept_aabb on relative motion, for arrays of shape (..., 3)
+
+    offset is B - A at the start of the interval, velocity its change over
+    the interval and extent the summed half extents. Returns (enter, exit)
+    arrays; there is no contact where enter >= exit.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (-extent - offset) / velocity
+        t2 = (extent - offset) / velocity
+    still = velocity == 0
+    inside = np.abs(offset) < extent
+    # An axis without relative motion overlaps always or never
+    t_low = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    t_high = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+    enter = np.maximum(t_low.max(axis=-1), 0.0)
+    exit = np.minimum(t_high.min(axis=-1), 1.0)
+    return enter, exit
+
+
+def swept_aabb_sphere_batch(offset, velocity, half, radius, iterations=24):
+    """
+    Vectorized swept_aabb_sphere: first contact time of each box/sphere pair, NaN if none
+
+    offset/velocity are the sphere center relative to the box center (at
+    the start, and its change over the interval), shape (n, 3).
+    """
+    half = np.asarray(half, dtype=np.float64)
+    radius = np.asarray(radius, dtype=np.float64)
+    result = np.full(len(offset), np.nan)
+    enter, exit = swept_aabb_batch(offset, velocity, half + radius[:, None])
+    candidates = enter < exit
+    if not candidates.any():
+        return result
+    offset, velocity = offset[candidates], velocity[candidates]
+    radius_sq = radius[candidates] ** 2
+    low, high = enter[candidates], exit[candidates]
+
+    def gap(t):
+        d = np.maximum(np.abs(offset + velocity * t[:, None]) - half, 0.0)
+        return (d * d).sum(axis=-1) - radius_sq
+
+    # Closest approach (ternary search), then first contact (bisection)
+    a, b = low.copy(), high.copy()
+    for _ in range(iterations):
+        m1 = a + (b - a) / 3.0
+        m2 = b - (b - a) / 3.0
+        left = gap(m1) < gap(m2)
+        b = np.where(left, m2, b)
+        a = np.where(left, a, m1)
+    closest = (a + b) / 2.0
+    start_inside = gap(low) < 0
+    hit = start_inside | (gap(closest) < 0)
+    a, b = low.copy(), closest
+    for _ in range(iterations):
+        middle = (a + b) / 2.0
+        inside = gap(middle) < 0
+        b = np.where(inside, middle, b)
+        a = np.where(inside, a, middle)
+    result[candidates] = np.where(hit, np.where(start_inside, low, b), np.nan)
+    return result
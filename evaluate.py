@@ -0,0 +1,328 @@
+"""
+Multiprocess evaluation of scripted and bot players
+
+Plays many headless game sessions (simulation.Simulation, no window or
+GPU) across a process pool and reports the distribution of survival
+times - the time the on-screen GameTimer would show at game over. Session
+i uses obstacle seed `seed + i`, so results are reproducible and match
+the seeded games in headless.py and the apps.
+
+    python evaluate.py --sessions 2000 --policy bot
+    python evaluate.py --policy script --script moves.txt --workers 8 --json results.json
+
+Workers write each session's result straight into shared-memory arrays;
+only a small throughput record per batch of sessions goes back through
+the pool.
+"""
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool, shared_memory
+import numpy as np
+from fixed_timestep import TICK_RATE, ticks_for
+from simulation import (Simulation, format_time, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP,
+                        ACTION_CROUCH, MAX_TICK_ACTIONS)
+from collision import CUBE_HALF_EXTENTS, WALL_HALF_EXTENTS
+from sphere_manager import LANE_X
+from replay import Replay, CONTROLS_KEYBOARD, decode_keys
+
+# Script key names (same as the headless benchmark scripts)
+KEY_ACTIONS = {'left': ACTION_LEFT, 'right': ACTION_RIGHT, 'up': ACTION_JUMP, 'down': ACTION_CROUCH}
+
+# Visit every lane, jump and crouch once per 4 seconds of play
+DEFAULT_SCRIPT = [(20, 'left'), (60, 'up'), (110, 'right'), (130, 'right'),
+                  (170, 'down'), (220, 'left')]
+
+
+def read_script(path):
+    """Read a script with one "tick key" pair per line (# starts a comment)"""
+    script = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if line:
+                tick, key = line.split()
+                script.append((int(tick), key.lower()))
+    return script
+
+
+class ScriptPolicy:
+    """
+    Key presses at fixed ticks, repeating every `loop_ticks` (like the headless benchmark)
+
+    Every press in the script is kept. As in the games, a tick takes at
+    most MAX_TICK_ACTIONS presses and the rest wait for the following ticks.
+    """
+
+    def __init__(self, script=None, loop_ticks=240):
+        self.loop_ticks = loop_ticks
+        self.by_tick = {}
+        for tick, key in (script if script is not None else DEFAULT_SCRIPT):
+            self.by_tick.setdefault(tick % loop_ticks, []).append(KEY_ACTIONS[key])
+        self.pending = []
+
+    def reset(self, sim):
+        self.pending = []
+
+    def __call__(self, sim):
+        pending = self.pending + self.by_tick.get(sim.tick % self.loop_ticks, [])
+        self.pending = pending[MAX_TICK_ACTIONS:]
+        return pending[:MAX_TICK_ACTIONS]
+
+
+class ReplayPolicy:
+    """
+    Recorded key presses, one entry per tick (none once they run out)
+
+    Entries are replay key bytes (see replay.encode_keys), so a tick can
+    hold two presses; a plain action number is a tick with one press.
+    Policies made from a Replay keep it in `replay`: its games only
+    reproduce with the replay's seed, lanes and tick rate (replay_options).
+    """
+
+    def __init__(self, keys, replay=None):
+        self.keys = np.asarray(keys, dtype=np.uint8)
+        self.replay = replay
+
+    @classmethod
+    def from_replay(cls, replay):
+        if replay.controls_type != CONTROLS_KEYBOARD:
+            raise ValueError("Arduino replays record sensor readings, not key presses - view them with replay.py")
+        return cls(replay.inputs['keys'], replay)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a recorded game (.fcr), a .npy action array, or a text file with one action number per line"""
+        if path.endswith('.fcr'):
+            return cls.from_replay(Replay.load(path))
+        if path.endswith('.npy'):
+            return cls(np.load(path))
+        return cls(np.loadtxt(path, dtype=np.uint8, ndmin=1))
+
+    def replay_options(self, max_seconds=0.0):
+        """evaluate() keyword arguments that play the recorded round itself (one session)"""
+        replay = self.replay
+        return {'sessions': 1, 'seed': replay.seed, 'tick_rate': replay.tick_rate,
+                'lanes': replay.lane_x.tolist(), 'per_lane': replay.per_lane,
+                'max_seconds': max(max_seconds, (len(replay) + 1) / replay.tick_rate)}
+
+    def reset(self, sim):
+        pass
+
+    def __call__(self, sim):
+        tick = sim.tick
+        return decode_keys(int(self.keys[tick])) if tick < len(self.keys) else []
+
+
+class DodgeBot:
+    """
+    Reacts to the nearest obstacle in its lane
+
+    Walls are dodged by changing to a lane that isn't walled off; low
+    spheres are jumped over and high ones crouched under, timed so the cube
+    is clear when the sphere arrives.
+    """
+
+    def __init__(self, wall_ticks=None, sphere_ticks=None, tick_rate=TICK_RATE):
+        self.wall_ticks = wall_ticks if wall_ticks is not None else ticks_for(0.6, tick_rate)
+        self.sphere_ticks = sphere_ticks if sphere_ticks is not None else ticks_for(0.2, tick_rate)
+
+    def reset(self, sim):
+        pass
+
+    def _nearest(self, obstacles, lane, cube_z):
+        """(ticks until contact, slot) of the next obstacle to reach the cube in `lane`, or (None, None)"""
+        reach = np.where(obstacles.is_wall, WALL_HALF_EXTENTS[2], obstacles.radius) + CUBE_HALF_EXTENTS[2]
+        ahead = obstacles.active & (obstacles.lane == lane) & (obstacles.z - reach < cube_z)
+        if not ahead.any():
+            return None, None
+        slots = np.flatnonzero(ahead)
+        slot = slots[np.argmax(obstacles.z[slots])]
+        return (cube_z - reach[slot] - obstacles.z[slot]) / obstacles.speed, slot
+
+    def __call__(self, sim):
+        cube, obstacles = sim.cube, sim.obstacles
+        if cube.is_jumping or cube.is_crouching:
+            return ACTION_NONE
+        ticks, slot = self._nearest(obstacles, cube.current_lane, cube.cube_distance)
+        if ticks is None:
+            return ACTION_NONE
+        if obstacles.is_wall[slot]:
+            if ticks > self.wall_ticks:
+                return ACTION_NONE
+            # Prefer a clear neighbouring lane, then one with a sphere (that can be jumped or ducked)
+            options = []
+            for action, lane in ((ACTION_LEFT, cube.current_lane - 1), (ACTION_RIGHT, cube.current_lane + 1)):
+                if 0 <= lane < len(cube.lanes):
+                    other, other_slot = self._nearest(obstacles, lane, cube.cube_distance)
+                    blocked = other is not None and other < self.wall_ticks and obstacles.is_wall[other_slot]
+                    options.append((blocked, other is not None and other < self.wall_ticks, action))
+            return min(options)[2] if options else ACTION_NONE
+        if ticks > self.sphere_ticks:
+            return ACTION_NONE
+        return ACTION_JUMP if obstacles.y[slot] < -1.0 else ACTION_CROUCH
+
+
+class IdlePolicy:
+    """Never presses anything (baseline)"""
+
+    def reset(self, sim):
+        pass
+
+    def __call__(self, sim):
+        return ACTION_NONE
+
+
+POLICIES = {'idle': IdlePolicy, 'script': ScriptPolicy, 'replay': ReplayPolicy, 'bot': DodgeBot}
+
+
+# Per-process worker state (set up once by the pool initializer)
+_worker = {}
+
+
+def _attach(names, sessions, tick_rate, lanes, per_lane):
+    """Pool initializer: map the shared result arrays into this worker"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker['blocks'] = blocks  # Keep the mappings alive
+    _worker['survival'] = np.ndarray(sessions, dtype=np.float64, buffer=blocks[0].buf)
+    _worker['ticks'] = np.ndarray(sessions, dtype=np.int64, buffer=blocks[1].buf)
+    _worker['simulation'] = Simulation(tick_rate=tick_rate, lanes=lanes, per_lane=per_lane)
+
+
+def _play(task):
+    """Play sessions [start, stop); returns (pid, sessions, ticks, seconds) for throughput stats"""
+    start, stop, seed, policy, max_ticks = task
+    sim = _worker['simulation']
+    survival, ticks = _worker['survival'], _worker['ticks']
+    began = time.perf_counter()
+    total = 0
+    for session in range(start, stop):
+        sim.reset(seed + session)
+        policy.reset(sim)
+        survival[session] = sim.run(policy, max_ticks)
+        ticks[session] = sim.tick
+        total += sim.tick
+    return os.getpid(), stop - start, total, time.perf_counter() - began
+
+
+def evaluate(policy, sessions=1000, seed=0, workers=None, max_seconds=120.0, tick_rate=TICK_RATE,
+             chunk=None, lanes=LANE_X, per_lane=1):
+    """
+    Play `sessions` games with `policy` on `workers` processes
+
+    Returns (survival seconds per session, stats dict). Games still running
+    after max_seconds stop there (and count as surviving that long).
+    """
+    if sessions < 1:
+        raise ValueError(f"sessions must be at least 1, got {sessions}")
+    workers = min(workers or os.cpu_count(), sessions)
+    chunk = chunk or max(1, min(64, sessions // (workers * 8)))
+    max_ticks = ticks_for(max_seconds, tick_rate)
+
+    blocks = [shared_memory.SharedMemory(create=True, size=sessions * 8) for _ in range(2)]
+    try:
+        survival = np.ndarray(sessions, dtype=np.float64, buffer=blocks[0].buf)
+        ticks = np.ndarray(sessions, dtype=np.int64, buffer=blocks[1].buf)
+        tasks = [(start, min(start + chunk, sessions), seed, policy, max_ticks)
+                 for start in range(0, sessions, chunk)]
+        began = time.perf_counter()
+        per_worker = {}
+        with Pool(workers, initializer=_attach, initargs=([b.name for b in blocks], sessions, tick_rate, lanes, per_lane)) as pool:
+            for pid, count, played, seconds in pool.imap_unordered(_play, tasks):
+                entry = per_worker.setdefault(pid, [0, 0, 0.0])
+                entry[0] += count
+                entry[1] += played
+                entry[2] += seconds
+        elapsed = time.perf_counter() - began
+        survival = survival.copy()
+        total_ticks = int(ticks.sum())
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    stats = {
+        'policy': type(policy).__name__,
+        'sessions': sessions,
+        'seed': seed,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'ticks': total_ticks,
+        'ticks_per_second': round(total_ticks / elapsed),
+        'survival': survival_stats(survival, max_seconds),
+        'per_worker': [{'sessions': count, 'ticks': played, 'busy_seconds': round(seconds, 3),
+                        'ticks_per_second': round(played / seconds) if seconds > 0 else 0}
+                       for count, played, seconds in sorted(per_worker.values(), reverse=True)]
+    }
+    return survival, stats
+
+
+def survival_stats(survival, max_seconds=None):
+    """Summary of a survival-time distribution (seconds, plus GameTimer-style strings)"""
+    percentiles = {f'p{p}': float(np.percentile(survival, p)) for p in (10, 25, 50, 75, 90, 99)}
+    stats = {'mean': float(survival.mean()), 'min': float(survival.min()), 'max': float(survival.max())}
+    stats.update(percentiles)
+    stats = {name: round(value, 3) for name, value in stats.items()}
+    stats['formatted'] = {name: format_time(value) for name, value in stats.items()}
+    if max_seconds is not None:
+        stats['reached_limit'] = int(np.count_nonzero(survival >= max_seconds))
+    return stats
+
+
+def format_report(stats):
+    """Human-readable summary of evaluate()'s stats"""
+    survival = stats['survival']
+    lines = [f"{stats['policy']}: {stats['sessions']} sessions on {stats['workers']} workers in "
+             f"{stats['seconds']:.2f}s ({stats['ticks_per_second']:,} ticks/s)",
+             f"{'survival':<10}" + ''.join(f"{name:>11}" for name in ('mean', 'p10', 'p50', 'p90', 'max')),
+             f"{'':<10}" + ''.join(f"{survival['formatted'][name]:>11}" for name in ('mean', 'p10', 'p50', 'p90', 'max'))]
+    if survival.get('reached_limit'):
+        lines.append(f"{survival['reached_limit']} sessions reached the time limit")
+    lines.append(f"{'worker':<10}{'sessions':>10}{'ticks':>12}{'busy s':>10}{'ticks/s':>12}")
+    for index, worker in enumerate(stats['per_worker']):
+        lines.append(f"{index:<10}{worker['sessions']:>10}{worker['ticks']:>12}"
+                     f"{worker['busy_seconds']:>10.2f}{worker['ticks_per_second']:>12,}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate scripted and bot players on headless games")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='bot')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0, help="Session i uses obstacle seed seed + i")
+    parser.add_argument('--workers', type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument('--max-seconds', type=float, default=120.0, help="Stop sessions that survive this long")
+    parser.add_argument('--script', help="Input script file for --policy script (lines of: tick key)")
+    parser.add_argument('--replay', help="Actions for --policy replay (.fcr replay, .npy, or one action per line); "
+                                         "a .fcr replay is played against its own obstacles")
+    parser.add_argument('--json', help="Also write the stats to this file")
+    args = parser.parse_args()
+
+    if args.policy == 'script':
+        policy = ScriptPolicy(read_script(args.script) if args.script else None)
+    elif args.policy == 'replay':
+        if not args.replay:
+            parser.error("--policy replay needs --replay")
+        try:
+            policy = ReplayPolicy.from_file(args.replay)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        policy = POLICIES[args.policy]()
+
+    options = {'sessions': args.sessions, 'seed': args.seed, 'max_seconds': args.max_seconds}
+    if args.policy == 'replay' and policy.replay is not None:
+        options = policy.replay_options(args.max_seconds)
+    survival, stats = evaluate(policy, workers=args.workers, **options)
+    print(format_report(stats))
+    if args.policy == 'replay' and policy.replay is not None:
+        print(f"Recorded: {format_time(policy.replay.survival_time)}, replayed: {format_time(survival[0])}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(stats, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
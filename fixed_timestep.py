@@ -0,0 +1,69 @@
+import time
+
+# Simulation ticks per second. Gameplay speeds and durations were tuned per
+# frame at 60 fps, so classes that take a tick_rate scale them from this.
+TICK_RATE = 60
+
+
+def ticks_for(seconds, tick_rate=TICK_RATE):
+    """Whole number of ticks closest to `seconds` (at least one)"""
+    return max(1, round(seconds * tick_rate))
+
+
+def lerp(a, b, alpha):
+    """Blend two equal-length tuples (previous and current state)"""
+    return tuple(x + (y - x) * alpha for x, y in zip(a, b))
+
+
+class FixedTimestep:
+    """
+    Accumulator that turns real elapsed time into whole simulation ticks
+
+    Each frame, advance() returns how many ticks to simulate; `alpha` is
+    then how far real time is between the last two ticks, for rendering
+    an interpolated state. A slow frame runs more ticks (gameplay keeps
+    its speed); beyond max_ticks per frame the extra time is dropped so a
+    long stall can't snowball into ever longer frames.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.total_ticks = 0
+        self.dropped_time = 0.0
+        self.reset()
+
+    def reset(self):
+        """Start timing afresh (e.g. when a round starts, so menu time isn't simulated)"""
+        self.last_time = None
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, now=None):
+        """Add the time since the last call and return the number of ticks due"""
+        if now is None:
+            now = time.perf_counter()
+        if self.last_time is None:
+            # First frame of a round: simulate one tick so there is something to show
+            self.accumulator = self.dt
+        else:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks:
+            self.dropped_time += (ticks - self.max_ticks) * self.dt
+            self.accumulator -= (ticks - self.max_ticks) * self.dt
+            ticks = self.max_ticks
+        self.accumulator -= ticks * self.dt
+        self.alpha = self.accumulator / self.dt
+        self.total_ticks += ticks
+        return ticks
+
+    def get_stats(self):
+        return {
+            'tick_rate': self.tick_rate,
+            'ticks': self.total_ticks,
+            'dropped_ms': round(self.dropped_time * 1000.0, 3)
+        }
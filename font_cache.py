@@ -0,0 +1,80 @@
+from collections import OrderedDict
+import pygame as pg
+
+
+class FontCache:
+    """
+    Process-wide registry of pygame fonts plus an LRU cache of rendered text
+
+    Fonts are keyed by (face, size) and created once. Rendered surfaces are
+    keyed by (font, text, color, antialias); the least recently used one is
+    dropped when the cache is full. Cached surfaces are shared, so callers
+    must only blit them, never draw onto them.
+    """
+
+    def __init__(self, max_surfaces=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, face=None, size=24):
+        """Shared font for (face, size); face is a font file path or None for the default font"""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pg.font.get_init():
+                pg.font.init()
+            font = pg.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """Rendered text surface, reused while (font, text, color, antialias) is unchanged"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Drop every cached text surface (fonts are kept)"""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """Get cache statistics for tuning max_surfaces"""
+        lookups = self.hits + self.misses
+        return {
+            'fonts': len(self.fonts),
+            'surfaces': len(self.surfaces),
+            'max_surfaces': self.max_surfaces,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by every UI class in the process
+font_cache = FontCache()
+
+
+def get_font(face=None, size=24):
+    """Shared font for (face, size) from the process-wide cache"""
+    return font_cache.get_font(face, size)
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the process-wide LRU cache"""
+    return font_cache.render(font, text, color, antialias)
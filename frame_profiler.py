@@ -0,0 +1,117 @@
+import time
+from contextlib import nullcontext
+import numpy as np
+
+# Returned by disabled profilers so timing sections cost (almost) nothing
+_NULL_SECTION = nullcontext()
+
+
+class _Section:
+    """Context manager that adds its elapsed time to one profiler section"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.open_sections.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler.sync is not None:
+            self.profiler.sync()
+        elapsed = time.perf_counter() - self.start
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        self.profiler.open_sections.pop()
+        return False
+
+
+class FrameProfiler:
+    """
+    Per-frame timings for each subsystem, summarized as percentiles
+
+    Usage per frame: begin_frame(), `with profiler.section('name'):` around
+    each subsystem, end_frame(). Sections entered several times in one
+    frame are summed. A sync callable (e.g. glFinish) can be given so the
+    time spent by the GPU is charged to the section that queued the work.
+
+    Work done later on behalf of a section (the render queue submitting
+    draw calls queued by 'cube', 'obstacles', ...) is moved back to it
+    with charge().
+    """
+
+    def __init__(self, enabled=True, sync=None):
+        self.enabled = enabled
+        self.sync = sync
+        self.samples = {}   # section name -> list of per-frame times (seconds)
+        self.current = {}
+        self.open_sections = []  # Names of the sections being timed, innermost last
+        self.frame_start = None
+        self.frames = 0
+
+    def section(self, name):
+        """Time the enclosed block as part of section `name`"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def current_section(self):
+        """Name of the innermost section being timed (None if none is, or the profiler is disabled)"""
+        if not self.enabled or not self.open_sections:
+            return None
+        return self.open_sections[-1]
+
+    def charge(self, name, elapsed):
+        """Move `elapsed` seconds of the innermost open section's time to section `name`"""
+        current = self.current
+        current[name] = current.get(name, 0.0) + elapsed
+        if self.open_sections:
+            inner = self.open_sections[-1]
+            current[inner] = current.get(inner, 0.0) - elapsed
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current = {}
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.current['frame'] = time.perf_counter() - self.frame_start
+        for name, elapsed in self.current.items():
+            self.samples.setdefault(name, []).append(elapsed)
+        self.frame_start = None
+        self.frames += 1
+
+    def reset(self):
+        """Drop all recorded samples (e.g. after warm-up frames)"""
+        self.samples = {}
+        self.current = {}
+        self.open_sections = []
+        self.frame_start = None
+        self.frames = 0
+
+    def get_stats(self):
+        """Per-section {'p50', 'p95', 'p99', 'mean', 'max'} in milliseconds"""
+        stats = {}
+        for name, values in self.samples.items():
+            ms = np.asarray(values) * 1000.0
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            stats[name] = {
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'mean': float(ms.mean()),
+                'max': float(ms.max())
+            }
+        return stats
+
+    def format_report(self):
+        """Human-readable percentile table, slowest sections first"""
+        stats = self.get_stats()
+        lines = [f"{'section':<14}{'p50':>9}{'p95':>9}{'p99':>9}{'mean':>9}   (ms, {self.frames} frames)"]
+        for name, s in sorted(stats.items(), key=lambda item: (item[0] != 'frame', -item[1]['mean'])):
+            lines.append(f"{name:<14}{s['p50']:9.3f}{s['p95']:9.3f}{s['p99']:9.3f}{s['mean']:9.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,94 @@
+import math
+
+
+class Frustum:
+    """
+    View frustum matching gluPerspective(fovy, aspect, near, far)
+
+    The game draws every object after glLoadIdentity, so the camera sits at
+    the origin looking down -Z and world space equals eye space.
+    Keeps per-frame counts of drawn, culled and clipped objects.
+    """
+
+    def __init__(self, fovy=45.0, aspect=800/600, near=0.1, far=50.0):
+        self.fovy = fovy
+        self.aspect = aspect
+        self.near = near
+        self.far = far
+
+        tan_y = math.tan(math.radians(fovy) / 2.0)
+        tan_x = tan_y * aspect
+        # Planes as (nx, ny, nz, d); a point is inside when n . p + d >= 0
+        self.planes = [
+            self._plane(1.0, 0.0, -tan_x, 0.0),    # Left
+            self._plane(-1.0, 0.0, -tan_x, 0.0),   # Right
+            self._plane(0.0, 1.0, -tan_y, 0.0),    # Bottom
+            self._plane(0.0, -1.0, -tan_y, 0.0),   # Top
+            (0.0, 0.0, -1.0, -near),               # Near
+            (0.0, 0.0, 1.0, far)                   # Far
+        ]
+
+        # Per-frame statistics
+        self.drawn = 0
+        self.culled = 0
+        self.clipped = 0
+
+    @staticmethod
+    def _plane(nx, ny, nz, d):
+        length = math.sqrt(nx * nx + ny * ny + nz * nz)
+        return (nx / length, ny / length, nz / length, d / length)
+
+    def begin_frame(self):
+        """Reset the per-frame counters"""
+        self.drawn = 0
+        self.culled = 0
+        self.clipped = 0
+
+    def _count(self, visible):
+        if visible:
+            self.drawn += 1
+        else:
+            self.culled += 1
+        return visible
+
+    def sphere_visible(self, x, y, z, radius):
+        """Test a bounding sphere against the frustum (counts the result)"""
+        for nx, ny, nz, d in self.planes:
+            if nx * x + ny * y + nz * z + d < -radius:
+                return self._count(False)
+        return self._count(True)
+
+    def box_visible(self, x, y, z, half_w, half_h, half_d):
+        """Test an axis-aligned box (center + half extents) against the frustum (counts the result)"""
+        for nx, ny, nz, d in self.planes:
+            # Distance of the box corner furthest along the plane normal
+            reach = abs(nx) * half_w + abs(ny) * half_h + abs(nz) * half_d
+            if nx * x + ny * y + nz * z + d < -reach:
+                return self._count(False)
+        return self._count(True)
+
+    def clamp_depth(self, z, depth):
+        """
+        Clamp a box's depth range to the near/far planes
+
+        Returns (new_center_z, new_depth), or None (counted as culled) if the
+        box lies entirely outside the depth range.
+        """
+        back = z - depth / 2.0
+        front = z + depth / 2.0
+        clamped_back = max(back, -self.far)
+        clamped_front = min(front, -self.near)
+        if clamped_back >= clamped_front:
+            self.culled += 1
+            return None
+        if clamped_back != back or clamped_front != front:
+            self.clipped += 1
+        return (clamped_back + clamped_front) / 2.0, clamped_front - clamped_back
+
+    def get_stats(self):
+        """Get this frame's culling statistics"""
+        return {
+            'drawn': self.drawn,
+            'culled': self.culled,
+            'clipped': self.clipped
+        }
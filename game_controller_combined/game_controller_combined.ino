@@ -15,6 +15,13 @@
  *   - VRx -> A2 (X-axis)
  *   - VRy -> A3 (Y-axis)
  *   - SW -> A4 (Button)
+ * 
+ * Serial output is text lines by default. The host can send "MODE BIN"
+ * to switch to 12-byte binary packets (and "MODE TEXT" to switch back):
+ *   0xA5 sync | sequence (1) | millis() (4, little-endian) | X (1, signed) |
+ *   Y (1, signed) | buttons (1, bit 0) | distance in 0.01 cm (2, little-endian) |
+ *   CRC-8 of the 10 bytes between sync and CRC (polynomial 0x07)
+ * See SensorStreamParser in arduino_controls.py.
  */
 
 // Ultrasonic Sensor Pins
@@ -35,6 +42,13 @@ float duration, distance;
 int joystick_x, joystick_y;
 bool button_pressed;
 
+// Output format (switched by commands from the host)
+const byte PACKET_SYNC = 0xA5;
+bool binaryMode = false;
+byte packetSequence = 0;
+char commandBuffer[16];
+byte commandLength = 0;
+
 void setup() {
   // Initialize ultrasonic sensor pins
   pinMode(trigPin, OUTPUT);
@@ -53,6 +67,9 @@ void setup() {
 }
 
 void loop() {
+  // Switch output format if the host asked
+  checkHostCommands();
+  
   // Read ultrasonic sensor
   readUltrasonicSensor();
   
@@ -60,7 +77,11 @@ void loop() {
   readJoystick();
   
   // Send all data in the format expected by arduino_controls.py
-  sendSensorData();
+  if (binaryMode) {
+    sendBinaryPacket();
+  } else {
+    sendSensorData();
+  }
   
   // Small delay to avoid overwhelming the serial connection
   delay(50);  // 20 readings per second
@@ -118,6 +139,67 @@ void sendSensorData() {
   Serial.println(distance);
 }
 
+void checkHostCommands() {
+  // Collect command lines ("MODE BIN" / "MODE TEXT") from the host
+  while (Serial.available() > 0) {
+    char c = Serial.read();
+    if (c == '\r') {
+      continue;
+    }
+    if (c != '\n') {
+      if (commandLength < sizeof(commandBuffer) - 1) {
+        commandBuffer[commandLength++] = c;
+      }
+      continue;
+    }
+    commandBuffer[commandLength] = '\0';
+    commandLength = 0;
+    
+    if (strcmp(commandBuffer, "MODE BIN") == 0) {
+      // Acknowledge in text so the host sees it even if it misses packets
+      Serial.println("MODE BIN OK");
+      binaryMode = true;
+    } else if (strcmp(commandBuffer, "MODE TEXT") == 0) {
+      binaryMode = false;
+      Serial.println("MODE TEXT OK");
+    }
+  }
+}
+
+void sendBinaryPacket() {
+  // One packet with every field from the same reading
+  byte packet[12];
+  unsigned long now = millis();
+  unsigned int distanceHundredths = (unsigned int)(distance * 100 + 0.5);
+  
+  packet[0] = PACKET_SYNC;
+  packet[1] = packetSequence++;
+  packet[2] = now & 0xFF;
+  packet[3] = (now >> 8) & 0xFF;
+  packet[4] = (now >> 16) & 0xFF;
+  packet[5] = (now >> 24) & 0xFF;
+  packet[6] = (byte)(int8_t)constrain(joystick_x, -128, 127);
+  packet[7] = (byte)(int8_t)constrain(joystick_y, -128, 127);
+  packet[8] = button_pressed ? 1 : 0;
+  packet[9] = distanceHundredths & 0xFF;
+  packet[10] = (distanceHundredths >> 8) & 0xFF;
+  packet[11] = crc8(packet + 1, 10);
+  
+  Serial.write(packet, sizeof(packet));
+}
+
+// CRC-8 (polynomial 0x07, initial value 0), same as crc8() in arduino_controls.py
+byte crc8(const byte *data, byte length) {
+  byte crc = 0;
+  for (byte i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (byte bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+    }
+  }
+  return crc;
+}
+
 // Helper function to map analog reading to 0-255 range
 byte readAnalogAxisLevel(int pin) {
   return map(analogRead(pin), 0, 1023, 0, 255);
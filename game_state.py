@@ -0,0 +1,119 @@
+"""
+Compact game state with cheap snapshot and restore
+
+The mutable state of a round lives in flat memory instead of loose
+instance attributes:
+
+- StateStruct (a ctypes struct) for the cube controls and the timer - the
+  fields read and write like ordinary attributes.
+- StateArrays (NumPy arrays sharing one bytearray) for the obstacle pool.
+
+A snapshot is then a bytes copy and a restore a blit back. GameState
+combines them for rollback, replay keyframes and what-if searches:
+
+    state = GameState(sim.obstacles, sim.cube)
+    saved = state.snapshot()
+    for action in candidates:
+        state.restore(saved)
+        ...try the action...
+"""
+import ctypes
+import numpy as np
+
+
+class StateStruct(ctypes.Structure):
+    """
+    Base for objects whose mutable state is a C struct (listed in _fields_)
+
+    Configuration (lanes, speeds, fonts, ...) stays in ordinary attributes
+    and isn't part of snapshots.
+    """
+
+    def snapshot(self):
+        return bytes(self)
+
+    def restore(self, data):
+        memoryview(self).cast('B')[:] = data
+
+
+class StateArrays:
+    """Named NumPy arrays laid out in one bytearray, so they snapshot and restore as one blit"""
+
+    __slots__ = ('buffer', 'array')
+
+    def __init__(self, fields):
+        """fields: (name, dtype, shape) tuples, as for a NumPy structured dtype"""
+        dtype = np.dtype(fields)
+        self.buffer = bytearray(dtype.itemsize)
+        self.array = np.frombuffer(self.buffer, dtype, 1)
+
+    def __getitem__(self, name):
+        """Writable view of one field"""
+        return self.array[name][0]
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def snapshot(self):
+        return bytes(self.buffer)
+
+    def restore(self, data):
+        self.buffer[:] = data
+
+
+def movement_state(controls):
+    """The StateStruct holding the cube state (KeyboardFallbackControls wraps a GameControls)"""
+    return getattr(controls, 'game_controls', controls)
+
+
+class GameState:
+    """
+    One round's state - obstacles, cube and optionally the timer - as one bytes object
+
+    The byte views of the parts and their offsets in a snapshot are worked
+    out once, so a snapshot is a single join and a restore a slice copy per
+    part. They are worked out again when the controls object is replaced
+    between rounds (KeyboardFallbackControls.reset_position).
+    """
+
+    __slots__ = ('sphere_manager', 'controls', 'timer', '_movement', '_views', '_split', '_end')
+
+    def __init__(self, sphere_manager, controls, timer=None):
+        self.sphere_manager = sphere_manager
+        self.controls = controls
+        self.timer = timer
+        self._movement = None
+
+    def _bind(self, movement):
+        """Cache the parts' byte views and where each one sits in a snapshot"""
+        obstacles = memoryview(self.sphere_manager.state.buffer)
+        cube = memoryview(movement).cast('B')
+        self._views = (obstacles, cube) if self.timer is None else (obstacles, cube, memoryview(self.timer).cast('B'))
+        self._split = len(obstacles)
+        self._end = self._split + len(cube)
+        self._movement = movement
+
+    def __len__(self):
+        self._bind(movement_state(self.controls))
+        return sum(len(view) for view in self._views)
+
+    def snapshot(self):
+        movement = getattr(self.controls, 'game_controls', self.controls)  # movement_state, inlined
+        if movement is not self._movement:
+            self._bind(movement)
+        return b''.join(self._views)
+
+    def restore(self, data):
+        movement = getattr(self.controls, 'game_controls', self.controls)
+        if movement is not self._movement:
+            self._bind(movement)
+        views = self._views
+        split = self._split
+        views[0][:] = data[:split]
+        if self.timer is None:
+            views[1][:] = data[split:]
+        else:
+            end = self._end
+            views[1][:] = data[split:end]
+            views[2][:] = data[end:]
+        self.sphere_manager.queues_stale = True  # As SphereManager.restore: lane queues are rebuilt when next used
@@ -2,8 +2,16 @@ import pygame as pg
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import time
+import ctypes
+from text_renderer import GlyphAtlas, begin_overlay, end_overlay
+from font_cache import get_font
+from simulation import format_time
+from game_state import StateStruct
+
+class GameTimer(StateStruct):
+    # Timer state (in one struct for snapshots)
+    _fields_ = [('start_time', ctypes.c_double), ('paused_time', ctypes.c_double), ('is_paused', ctypes.c_bool)]
 
-class GameTimer:
     def end_timer(self):
         """End the timer (pause and print message)"""
         self.pause_timer()
@@ -12,9 +20,9 @@ class GameTimer:
     """
     
     def __init__(self):
-        # Initialize pygame font
-        pg.font.init()
-        self.font = pg.font.Font(None, 48)  # Font for timer display
+        # Shared pygame font
+        self.font = get_font(None, 48)  # Font for timer display
+        self.text_atlas = GlyphAtlas(self.font, "0123456789:")  # Rasterized once for MM:SS:mmm
         
         # Timer variables
         self.start_time = time.time()
@@ -52,96 +60,23 @@ class GameTimer:
     
     def format_time(self, elapsed_time):
         """Format time as MM:SS:mmm"""
-        minutes = int(elapsed_time // 60)
-        seconds = int(elapsed_time % 60)
-        milliseconds = int((elapsed_time % 1) * 1000)
-        
-        return f"{minutes:02d}:{seconds:02d}:{milliseconds:03d}"
-    
-    def create_timer_texture(self, text):
-        """Create an OpenGL texture from timer text"""
-        try:
-            # Render text to pygame surface
-            text_surface = self.font.render(text, True, self.timer_color)
-            text_width = text_surface.get_width()
-            text_height = text_surface.get_height()
-            
-            # Convert pygame surface to OpenGL texture format
-            text_data = pg.image.tostring(text_surface, "RGBA", False)  # Changed from True to False
-            
-            # Generate OpenGL texture
-            texture_id = glGenTextures(1)
-            glBindTexture(GL_TEXTURE_2D, texture_id)
-            
-            # Set texture parameters
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-            
-            # Upload texture data
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, text_width, text_height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-            
-            return texture_id, text_width, text_height
-            
-        except Exception as e:
-            print(f"Error creating timer texture: {e}")
-            return None, 0, 0
+        return format_time(elapsed_time)
     
     def draw_timer_2d(self):
-        """Draw timer using 2D overlay method (simpler approach)"""
+        """Draw timer using 2D overlay method (glyph atlas - no per-frame texture uploads)"""
         elapsed_time = self.get_elapsed_time()
         time_text = self.format_time(elapsed_time)
         
-        # Save current OpenGL state
-        glPushMatrix()
-        glPushAttrib(GL_ALL_ATTRIB_BITS)
-        
         # Switch to 2D rendering
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, 800, 600, 0, -1, 1)  # 2D orthographic projection
+        begin_overlay(800, 600)
         
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+        # Glyphs are white in the atlas and tinted with the timer color
+        r, g, b = self.timer_color
+        x, y = self.position
+        self.text_atlas.draw_text(time_text, x, y, (r / 255.0, g / 255.0, b / 255.0, 1.0))
         
-        # Disable depth testing for 2D overlay
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        # Create and draw timer texture
-        texture_id, width, height = self.create_timer_texture(time_text)
-        
-        if texture_id:
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, texture_id)
-            glColor4f(1.0, 1.0, 1.0, 1.0)  # White color
-            
-            x, y = self.position
-            
-            # Draw textured quad with corrected texture coordinates
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(x, y)                    # Top-left
-            glTexCoord2f(1, 0); glVertex2f(x + width, y)            # Top-right
-            glTexCoord2f(1, 1); glVertex2f(x + width, y + height)   # Bottom-right
-            glTexCoord2f(0, 1); glVertex2f(x, y + height)           # Bottom-left
-            glEnd()
-            
-            glDisable(GL_TEXTURE_2D)
-            glDeleteTextures([texture_id])  # Clean up texture
-        
-        # Restore OpenGL state
-        glDisable(GL_BLEND)
-        glEnable(GL_DEPTH_TEST)
-        
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        
-        glPopAttrib()
-        glPopMatrix()
+        # Restore 3D rendering
+        end_overlay()
     
     def draw_timer_simple(self):
         """Draw timer using simple OpenGL text rendering (fallback method)"""
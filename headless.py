@@ -0,0 +1,202 @@
+"""
+Headless frame-time benchmark
+
+Renders the real game scene into an offscreen OpenGL context (EGL pbuffer
+or OSMesa, no window or display needed) driven by scripted key presses,
+and reports p50/p95/p99 frame times per subsystem.
+
+    python headless.py --frames 600
+    python headless.py --app regular --fixed-function --json results.json
+    PYOPENGL_PLATFORM=osmesa python headless.py
+"""
+import os
+
+# PyOpenGL picks its platform at import time, so these must be set before anything imports OpenGL
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+os.environ.setdefault('EGL_PLATFORM', 'surfaceless')  # Mesa: no X11/Wayland display required
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import ctypes
+import json
+import pygame as pg
+from OpenGL.GL import *
+from mesh import Mesh
+from frame_profiler import FrameProfiler
+from evaluate import DEFAULT_SCRIPT, read_script
+from controls import split_tick_events
+
+
+class OffscreenContext:
+    """
+    OpenGL context without a window: an EGL pbuffer or an OSMesa buffer
+
+    The backend follows PYOPENGL_PLATFORM ("egl" or "osmesa"). EGL runs on
+    GPU drivers and on Mesa's software rasterizer alike.
+    """
+
+    def __init__(self, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.platform = os.environ['PYOPENGL_PLATFORM']
+        if self.platform == 'osmesa':
+            self._create_osmesa()
+        elif self.platform == 'egl':
+            self._create_egl()
+        else:
+            raise RuntimeError(f"Unsupported headless platform: {self.platform} (use egl or osmesa)")
+        glViewport(0, 0, width, height)
+        print(f"Offscreen context: {self.platform}, {glGetString(GL_RENDERER).decode()}")
+
+    def _create_egl(self):
+        from OpenGL import EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not EGL.eglInitialize(self.display, None, None):
+            raise RuntimeError("eglInitialize failed")
+
+        attributes = [
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8, EGL.EGL_ALPHA_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE
+        ]
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, (EGL.EGLint * len(attributes))(*attributes),
+                            ctypes.pointer(config), 1, ctypes.pointer(count))
+        if count.value == 0:
+            raise RuntimeError("No EGL config with an OpenGL pbuffer")
+
+        size = [EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE]
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, (EGL.EGLint * len(size))(*size))
+        # Desktop OpenGL (not GLES) so the fixed-function path works too
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError("eglMakeCurrent failed")
+
+    def _create_osmesa(self):
+        from OpenGL import osmesa
+        from OpenGL import arrays
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("OSMesaCreateContextExt failed")
+        self.buffer = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL_UNSIGNED_BYTE, self.width, self.height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+
+    def release(self):
+        if self.platform == 'egl':
+            from OpenGL import EGL
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroySurface(self.display, self.surface)
+            EGL.eglDestroyContext(self.display, self.context)
+            EGL.eglTerminate(self.display)
+        else:
+            from OpenGL import osmesa
+            osmesa.OSMesaDestroyContext(self.context)
+
+
+class ScriptedInput:
+    """
+    Deterministic key presses delivered as synthetic pygame KEYDOWN events
+
+    The script is a list of (frame, key name) pairs that repeats every
+    `loop_frames` frames, so any benchmark length gets the same workload.
+    """
+
+    KEYS = {'left': pg.K_LEFT, 'right': pg.K_RIGHT, 'up': pg.K_UP, 'down': pg.K_DOWN}
+
+    def __init__(self, script=None, loop_frames=240):
+        self.loop_frames = loop_frames
+        self.by_frame = {}
+        for frame, key in (script if script is not None else DEFAULT_SCRIPT):
+            self.by_frame.setdefault(frame % loop_frames, []).append(self.KEYS[key])
+
+    @classmethod
+    def from_file(cls, path, loop_frames=240):
+        """Read a script with one "frame key" pair per line (# starts a comment)"""
+        return cls(read_script(path), loop_frames)
+
+    def events(self, frame):
+        """Events to deliver on this frame"""
+        return [pg.event.Event(pg.KEYDOWN, key=key, mod=0, unicode='', scancode=0)
+                for key in self.by_frame.get(frame % self.loop_frames, ())]
+
+
+def run_benchmark(app_name='arduino', frames=600, warmup=60, renderer_backend='auto',
+                  script=None, width=800, height=600, sync_gpu=True, seed=0):
+    """
+    Render `frames` frames of the real game offscreen and return the FrameProfiler
+
+    The obstacle schedule is seeded, so runs with the same seed and script
+    simulate exactly the same game.
+
+    With sync_gpu, glFinish runs after every section so GPU time is charged
+    to the subsystem that submitted the work (slower overall, but comparable).
+    """
+    from base_arduino import ArduinoApp, RegularApp
+
+    pg.init()
+    context = OffscreenContext(width, height)
+    Mesh.invalidate_all()
+
+    if app_name == 'regular':
+        app = RegularApp(renderer_backend=renderer_backend, headless=True)
+    else:
+        app = ArduinoApp(renderer_backend=renderer_backend, headless=True)
+    app.setup_scene()
+    app.sphere_manager.reset(seed)
+    app.profiler = FrameProfiler(sync=glFinish if sync_gpu else None)
+    script = script if script is not None else ScriptedInput()
+
+    hits = 0
+    pending = []
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            app.profiler.reset()
+        app.profiler.begin_frame()
+        # One tick per frame; presses beyond a tick's limit wait, as in the games
+        events, pending = split_tick_events(pending + script.events(frame))
+        if app.update_frame(events):
+            hits += 1  # Keep rendering - the benchmark measures frames, not survival
+        app.render_frame()
+        with app.profiler.section('present'):
+            glFinish()
+        app.profiler.end_frame()
+
+    error = glGetError()
+    if error != GL_NO_ERROR:
+        print(f"OpenGL error during benchmark: {error}")
+    print(f"Renderer: {app.renderer.name}, frames: {frames} (+{warmup} warm-up), collisions: {hits}")
+    context.release()
+    return app.profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for Force Cube Runner")
+    parser.add_argument('--app', choices=['arduino', 'regular'], default='arduino')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--warmup', type=int, default=60)
+    parser.add_argument('--fixed-function', action='store_true', help="Use the legacy OpenGL pipeline")
+    parser.add_argument('--no-sync', action='store_true', help="Don't glFinish after each section")
+    parser.add_argument('--script', help="Input script file (lines of: frame key)")
+    parser.add_argument('--seed', type=int, default=0, help="Obstacle schedule seed")
+    parser.add_argument('--json', help="Also write the percentiles to this file")
+    args = parser.parse_args()
+
+    script = ScriptedInput.from_file(args.script) if args.script else None
+    profiler = run_benchmark(args.app, args.frames, args.warmup,
+                             'fixed' if args.fixed_function else 'auto', script,
+                             sync_gpu=not args.no_sync, seed=args.seed)
+    print(profiler.format_report())
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(profiler.get_stats(), f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from OpenGL.GL import *
+from mesh import build_box_mesh, build_ground_quad_mesh
+from renderer import get_renderer
 
 class LaneMarkers:
     """
@@ -6,6 +7,20 @@ class LaneMarkers:
     Lane positions: Left (-5.0), Center (0.0), Right (+5.0)
     """
     
+    # Unit meshes shared by every marker, scaled to size at draw time
+    unit_box_mesh = build_box_mesh()
+    ground_quad_mesh = build_ground_quad_mesh()
+    
+    # Static lane layout - StaticScene re-bakes whenever config_signature() changes
+    ground_lane_positions = [-5.0, 0.0, 5.0]
+    ground_lane_colors = [
+        (0.9, 0.7, 0.7),  # Left lane - Light Red
+        (0.7, 0.9, 0.7),  # Center lane - Light Green  
+        (0.7, 0.7, 0.9)   # Right lane - Light Blue
+    ]
+    boundary_wall_positions = [-7.5, 7.5]  # Outside the leftmost and rightmost lanes
+    boundary_wall_color = (0.6, 0.6, 0.6)  # Gray
+    
     def __init__(self):
         # Lane positions (matching the controls.py lanes)
         self.lane_positions = [-5.0, 0.0, 5.0]  # Left, Center, Right
@@ -24,7 +39,7 @@ class LaneMarkers:
         ]
     
     @staticmethod
-    def draw_lane_divider_boxes():
+    def draw_lane_divider_boxes(frustum=None):
         """
         Draw two boxes positioned between the lanes to create visual separation
         These will be placed at x = -2.5 (between left and center) and x = +2.5 (between center and right)
@@ -40,11 +55,12 @@ class LaneMarkers:
                 width=0.3,
                 height=20.0,
                 depth=0.3,
-                color=divider_color
+                color=divider_color,
+                frustum=frustum
             )
     
     @staticmethod
-    def draw_lane_marker_boxes():
+    def draw_lane_marker_boxes(frustum=None):
         """
         Draw boxes at each lane position to mark the lanes
         """
@@ -63,18 +79,18 @@ class LaneMarkers:
                 width=1.5,
                 height=0.5,
                 depth=1.0,
-                color=color
+                color=color,
+                frustum=frustum
             )
     
     @staticmethod
-    def draw_lane_boundary_walls():
+    def draw_lane_boundary_walls(frustum=None):
         """
         Draw tall walls on the sides to clearly define the play area
         """
-        wall_positions = [-7.5, 7.5]  # Outside the leftmost and rightmost lanes
-        wall_color = (0.6, 0.6, 0.6)  # Gray
+        wall_color = LaneMarkers.boundary_wall_color
         
-        for x_pos in wall_positions:
+        for x_pos in LaneMarkers.boundary_wall_positions:
             LaneMarkers._draw_single_box(
                 x=x_pos,
                 y=-3.5,
@@ -82,100 +98,63 @@ class LaneMarkers:
                 width=0.5,
                 height=200.0,
                 depth=10000.0,
-                color=wall_color
+                color=wall_color,
+                frustum=frustum
             )
     
     @staticmethod
-    def draw_ground_lanes():
+    def draw_ground_lanes(frustum=None):
         """
         Draw ground markers for each lane (flat rectangular strips)
         """
-        lane_positions = [-5.0, 0.0, 5.0]
-        lane_colors = [
-            (0.9, 0.7, 0.7),  # Left lane - Light Red
-            (0.7, 0.9, 0.7),  # Center lane - Light Green  
-            (0.7, 0.7, 0.9)   # Right lane - Light Blue
-        ]
-        
-        for x_pos, color in zip(lane_positions, lane_colors):
+        for x_pos, color in zip(LaneMarkers.ground_lane_positions, LaneMarkers.ground_lane_colors):
             LaneMarkers._draw_ground_strip(
                 x=x_pos,
                 y=-3.5,  # Ground level
                 z=-15.0,
                 width=5.0,
                 depth=10000.0,
-                color=color
+                color=color,
+                frustum=frustum
             )
     
     @staticmethod
-    def _draw_single_box(x, y, z, width, height, depth, color):
+    def _draw_single_box(x, y, z, width, height, depth, color, frustum=None):
         """
         Draw a single box at the specified position with given dimensions and color
+        If a Frustum is given, the box is culled when invisible and clamped to the far plane
         """
-        glLoadIdentity()
-        glTranslatef(x, y, z)
-        
-        # Half dimensions for vertex calculation
-        w, h, d = width/2, height/2, depth/2
+        if frustum is not None:
+            clamped = frustum.clamp_depth(z, depth)
+            if clamped is None or not frustum.box_visible(x, y, clamped[0], width/2, height/2, clamped[1]/2):
+                return
+            z, depth = clamped
         
-        # Define box vertices
-        vertices = [
-            [-w, -h, -d], [w, -h, -d], [w, h, -d], [-w, h, -d],  # Back face
-            [-w, -h, d], [w, -h, d], [w, h, d], [-w, h, d]       # Front face
-        ]
-        
-        # Define faces
-        faces = [
-            ([0, 1, 2, 3]),  # Back face
-            ([4, 5, 6, 7]),  # Front face
-            ([0, 1, 5, 4]),  # Bottom face
-            ([2, 3, 7, 6]),  # Top face
-            ([0, 3, 7, 4]),  # Left face
-            ([1, 2, 6, 5])   # Right face
-        ]
-        
-        # Set color and draw
-        glColor3f(*color)
-        
-        for face in faces:
-            glBegin(GL_QUADS)
-            for vertex_index in face:
-                glVertex3f(*vertices[vertex_index])
-            glEnd()
+        # Scale and tint the shared unit box
+        get_renderer().draw_mesh(LaneMarkers.unit_box_mesh, (x, y, z), scale=(width, height, depth), color=color)
     
     @staticmethod
-    def _draw_ground_strip(x, y, z, width, depth, color):
+    def _draw_ground_strip(x, y, z, width, depth, color, frustum=None):
         """
         Draw a flat rectangular strip on the ground
+        If a Frustum is given, the strip is culled when invisible and clamped to the far plane
         """
-        glLoadIdentity()
-        glTranslatef(x, y, z)
-        
-        # Half dimensions
-        w, d = width/2, depth/2
-        
-        # Ground strip vertices (flat rectangle)
-        vertices = [
-            [-w, 0, -d],  # Back-left
-            [w, 0, -d],   # Back-right
-            [w, 0, d],    # Front-right
-            [-w, 0, d]    # Front-left
-        ]
+        if frustum is not None:
+            clamped = frustum.clamp_depth(z, depth)
+            if clamped is None or not frustum.box_visible(x, y, clamped[0], width/2, 0.0, clamped[1]/2):
+                return
+            z, depth = clamped
         
-        # Set color and draw
-        glColor3f(*color)
-        glBegin(GL_QUADS)
-        for vertex in vertices:
-            glVertex3f(*vertex)
-        glEnd()
+        # Scale and tint the shared unit quad
+        get_renderer().draw_mesh(LaneMarkers.ground_quad_mesh, (x, y, z), scale=(width, 1.0, depth), color=color)
     
     @staticmethod
-    def draw_all_lane_markers():
+    def draw_all_lane_markers(frustum=None):
         """
         Draw all lane marking elements
         """
         # Draw ground lane strips
-        LaneMarkers.draw_ground_lanes()
+        LaneMarkers.draw_ground_lanes(frustum)
         
         # Draw lane divider boxes
         #LaneMarkers.draw_lane_divider_boxes()
@@ -184,18 +163,30 @@ class LaneMarkers:
         #LaneMarkers.draw_lane_marker_boxes()
         
         # Draw boundary walls
-        LaneMarkers.draw_lane_boundary_walls()
+        LaneMarkers.draw_lane_boundary_walls(frustum)
+    
+    @staticmethod
+    def config_signature():
+        """
+        Hashable snapshot of the static lane layout (used to invalidate baked geometry)
+        """
+        return (
+            tuple(LaneMarkers.ground_lane_positions),
+            tuple(tuple(color) for color in LaneMarkers.ground_lane_colors),
+            tuple(LaneMarkers.boundary_wall_positions),
+            tuple(LaneMarkers.boundary_wall_color)
+        )
     
     @staticmethod
-    def draw_minimal_lane_markers():
+    def draw_minimal_lane_markers(frustum=None):
         """
         Draw just the essential lane markers (divider boxes only)
         """
-        LaneMarkers.draw_lane_divider_boxes()
+        LaneMarkers.draw_lane_divider_boxes(frustum)
     
     @staticmethod
-    def draw_simple_lane_ground():
+    def draw_simple_lane_ground(frustum=None):
         """
         Draw just the ground lane strips
         """
-        LaneMarkers.draw_ground_lanes()
+        LaneMarkers.draw_ground_lanes(frustum)
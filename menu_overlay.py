@@ -0,0 +1,88 @@
+import numpy as np
+import pygame as pg
+from OpenGL.GL import *
+from mesh import Mesh
+from renderer import get_renderer
+
+
+def _next_power_of_two(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+class MenuOverlay:
+    """
+    Shows pygame-drawn menu screens inside the OpenGL window
+
+    Menus draw into `surface` as before; only the rectangles they report as
+    changed are copied into a texture (glTexSubImage2D), which is drawn as a
+    full-screen quad. The OpenGL context, and every mesh and texture in it,
+    stays alive between menus and rounds.
+    """
+
+    def __init__(self, size=(800, 600)):
+        self.width, self.height = size
+        self.surface = pg.Surface(size)
+
+        # Power-of-two texture for old drivers; the menu occupies its top-left corner
+        self.texture_size = (_next_power_of_two(self.width), _next_power_of_two(self.height))
+        self.texture_id = None
+        self.generation = None
+
+        u1 = self.width / self.texture_size[0]
+        v1 = self.height / self.texture_size[1]
+        self.vertices = np.array([[0, 0], [self.width, 0], [self.width, self.height], [0, self.height]],
+                                 dtype=np.float32)
+        self.texcoords = np.array([[0, 0], [u1, 0], [u1, v1], [0, v1]], dtype=np.float32)
+        self.indices = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+    def _create_texture(self):
+        width, height = self.texture_size
+        self.texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.generation = Mesh.context_generation
+
+    def update(self, rects):
+        """Copy the given dirty rectangles of the surface into the texture"""
+        if self.generation != Mesh.context_generation:
+            # New (or first) context: the whole surface has to go up
+            self._create_texture()
+            rects = [self.surface.get_rect()]
+
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for rect in rects:
+            rect = pg.Rect(rect).clip(self.surface.get_rect())
+            if rect.width == 0 or rect.height == 0:
+                continue
+            # Rows top-first, matching the overlay's Y-down projection. RGB because
+            # the surface is opaque (its padding byte is not a valid alpha).
+            pixels = pg.image.tostring(self.surface.subsurface(rect), "RGB", False)
+            glTexSubImage2D(GL_TEXTURE_2D, 0, rect.x, rect.y, rect.width, rect.height,
+                            GL_RGB, GL_UNSIGNED_BYTE, pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def draw(self):
+        """Draw the menu texture over the whole window"""
+        if self.texture_id is None or self.generation != Mesh.context_generation:
+            self.update([])
+        renderer = get_renderer()
+        renderer.begin_overlay(self.width, self.height)
+        renderer.draw_arrays(self.vertices, self.indices, texcoords=self.texcoords,
+                             color=(1.0, 1.0, 1.0, 1.0), texture=self.texture_id)
+        renderer.end_overlay()
+
+    def release(self):
+        """Free the menu texture"""
+        if self.texture_id is not None and self.generation == Mesh.context_generation:
+            glDeleteTextures([self.texture_id])
+        self.texture_id = None
+        self.generation = None
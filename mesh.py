@@ -0,0 +1,222 @@
+import numpy as np
+from OpenGL.GL import *
+
+
+class Mesh:
+    """
+    Geometry that is uploaded to the GPU once and drawn with a single call
+
+    Uses vertex buffer objects when the driver supports them and falls back
+    to a compiled display list otherwise. Upload happens lazily on the first
+    draw, so meshes can be created before the OpenGL context exists.
+    """
+
+    # Bumped whenever the OpenGL context is recreated so meshes re-upload lazily
+    context_generation = 0
+    # None = not probed yet, True/False once the first upload has tried VBOs
+    vbo_supported = None
+
+    def __init__(self, vertices, indices, colors=None, mode=GL_TRIANGLES, texcoords=None):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.indices = np.ascontiguousarray(indices, dtype=np.uint32)
+        self.colors = None if colors is None else np.ascontiguousarray(colors, dtype=np.float32)
+        self.texcoords = None if texcoords is None else np.ascontiguousarray(texcoords, dtype=np.float32)
+        self.mode = mode
+
+        # GPU handles (valid only for the context generation they were created in)
+        self.generation = None
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.texcoord_buffer = None
+        self.index_buffer = None
+        self.display_list = None
+
+    @classmethod
+    def invalidate_all(cls):
+        """Forget every GPU handle - call after pg.display.set_mode recreates the context"""
+        cls.context_generation += 1
+
+    def upload(self):
+        """Upload geometry to the GPU (VBO if available, otherwise a display list)"""
+        self._clear_handles()
+
+        if Mesh.vbo_supported is not False:
+            try:
+                self.vertex_buffer = self._create_buffer(GL_ARRAY_BUFFER, self.vertices)
+                if self.colors is not None:
+                    self.color_buffer = self._create_buffer(GL_ARRAY_BUFFER, self.colors)
+                if self.texcoords is not None:
+                    self.texcoord_buffer = self._create_buffer(GL_ARRAY_BUFFER, self.texcoords)
+                self.index_buffer = self._create_buffer(GL_ELEMENT_ARRAY_BUFFER, self.indices)
+                Mesh.vbo_supported = True
+            except Exception as e:
+                print(f"VBOs unavailable, using display lists: {e}")
+                Mesh.vbo_supported = False
+                self._clear_handles()
+
+        if not Mesh.vbo_supported:
+            self.display_list = glGenLists(1)
+            glNewList(self.display_list, GL_COMPILE)
+            self._draw_client_arrays()
+            glEndList()
+
+        self.generation = Mesh.context_generation
+
+    def _clear_handles(self):
+        self.vertex_buffer = self.color_buffer = self.texcoord_buffer = self.index_buffer = None
+        self.display_list = None
+
+    def ensure_uploaded(self):
+        """Upload the mesh if it has no GPU objects in the current context"""
+        if self.generation != Mesh.context_generation:
+            self.upload()
+
+    @staticmethod
+    def _create_buffer(target, data):
+        buffer_id = glGenBuffers(1)
+        glBindBuffer(target, buffer_id)
+        glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+        glBindBuffer(target, 0)
+        return buffer_id
+
+    def draw(self):
+        """Draw the mesh at the current modelview matrix (fixed-function pipeline)"""
+        self.ensure_uploaded()
+
+        if self.display_list is not None:
+            glCallList(self.display_list)
+            return
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        if self.color_buffer is not None:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+            glColorPointer(3, GL_FLOAT, 0, None)
+        if self.texcoord_buffer is not None:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.texcoord_buffer)
+            glTexCoordPointer(2, GL_FLOAT, 0, None)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+        glDrawElements(self.mode, len(self.indices), GL_UNSIGNED_INT, None)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        if self.texcoord_buffer is not None:
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        if self.color_buffer is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _draw_client_arrays(self):
+        """Draw straight from the NumPy arrays (used to compile display lists)"""
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self.vertices)
+        if self.colors is not None:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, 0, self.colors)
+        if self.texcoords is not None:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, 0, self.texcoords)
+        glDrawElements(self.mode, len(self.indices), GL_UNSIGNED_INT, self.indices)
+        if self.texcoords is not None:
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        if self.colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def release(self):
+        """Free the GPU objects (only if they belong to the current context)"""
+        if self.generation == Mesh.context_generation:
+            buffers = [b for b in (self.vertex_buffer, self.color_buffer, self.texcoord_buffer, self.index_buffer)
+                       if b is not None]
+            if buffers:
+                glDeleteBuffers(len(buffers), buffers)
+            if self.display_list is not None:
+                glDeleteLists(self.display_list, 1)
+        self.generation = None
+        self._clear_handles()
+
+
+def quads_to_triangles(quads):
+    """Split quads given as (a, b, c, d) index tuples into two triangles each"""
+    quads = np.asarray(quads, dtype=np.uint32)
+    return quads[:, [0, 1, 2, 0, 2, 3]].reshape(-1)
+
+
+def build_box_mesh(half_extents=(0.5, 0.5, 0.5), face_colors=None):
+    """
+    Build a box mesh centered on the origin
+
+    Parameters:
+    - half_extents: Half width/height/depth (default: unit box)
+    - face_colors: Optional list of 6 RGB tuples (back, front, bottom, top, left, right).
+      Without it the mesh has no color array and uses the current glColor.
+    """
+    w, h, d = half_extents
+    corners = np.array([
+        [-w, -h, -d], [w, -h, -d], [w, h, -d], [-w, h, -d],  # Back face
+        [-w, -h, d], [w, -h, d], [w, h, d], [-w, h, d]       # Front face
+    ], dtype=np.float32)
+    faces = [
+        [0, 1, 2, 3],  # Back face
+        [4, 5, 6, 7],  # Front face
+        [0, 1, 5, 4],  # Bottom face
+        [2, 3, 7, 6],  # Top face
+        [0, 3, 7, 4],  # Left face
+        [1, 2, 6, 5]   # Right face
+    ]
+
+    if face_colors is None:
+        return Mesh(corners, quads_to_triangles(faces))
+
+    # Per-face colors need their own copy of each corner
+    vertices = corners[np.array(faces).reshape(-1)]
+    colors = np.repeat(np.asarray(face_colors, dtype=np.float32), 4, axis=0)
+    quads = np.arange(24).reshape(6, 4)
+    return Mesh(vertices, quads_to_triangles(quads), colors)
+
+
+def build_pyramid_mesh():
+    """Build the pyramid used by Shapes.draw_triangle (apex up, square base)"""
+    apex = [0.0, 2.0, 0.0]
+    base = [
+        [-1.5, -1.0, 1.5],  # Front-left
+        [1.5, -1.0, 1.5],   # Front-right
+        [1.5, -1.0, -1.5],  # Back-right
+        [-1.5, -1.0, -1.5]  # Back-left
+    ]
+    side_a = (175 / 255, 205 / 255, 237 / 255)
+    side_b = (175 / 255, 237 / 255, 209 / 255)
+    bottom = (84 / 255, 118 / 255, 153 / 255)
+
+    vertices = [
+        apex, base[0], base[1],   # Front face
+        apex, base[1], base[2],   # Right face
+        apex, base[2], base[3],   # Back face
+        apex, base[3], base[0],   # Left face
+        base[0], base[1], base[2], base[3]  # Base (square bottom)
+    ]
+    colors = [side_a] * 3 + [side_b] * 3 + [side_a] * 3 + [side_b] * 3 + [bottom] * 4
+    indices = list(range(12)) + [12, 13, 14, 12, 14, 15]
+    return Mesh(vertices, indices, colors)
+
+
+def build_ground_quad_mesh():
+    """Build a flat unit quad in the XZ plane, centered on the origin"""
+    vertices = [
+        [-0.5, 0, -0.5],  # Back-left
+        [0.5, 0, -0.5],   # Back-right
+        [0.5, 0, 0.5],    # Front-right
+        [-0.5, 0, 0.5]    # Front-left
+    ]
+    return Mesh(vertices, [0, 1, 2, 0, 2, 3])
+
+
+def build_textured_quad_mesh():
+    """Build a unit quad in the XY plane (facing +Z) with texture coordinates"""
+    vertices = [[-0.5, -0.5, 0], [0.5, -0.5, 0], [0.5, 0.5, 0], [-0.5, 0.5, 0]]
+    texcoords = [[0, 0], [1, 0], [1, 1], [0, 1]]
+    return Mesh(vertices, [0, 1, 2, 0, 2, 3], texcoords=texcoords)
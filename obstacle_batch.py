@@ -0,0 +1,161 @@
+import math
+import numpy as np
+from mesh import build_box_mesh
+from renderer import get_renderer, rotation_matrix
+from sphere_mesh_cache import build_sphere_geometry
+
+
+class MeshBatch:
+    """
+    Instance arrays (position, scale, color) for one mesh type
+
+    Every instance is expanded on the CPU with vectorized NumPy and the whole
+    batch is submitted to the active renderer with a single draw call.
+    """
+
+    def __init__(self, vertices, indices, shade=None, rotation_axis=(0, 1, 0), capacity=16):
+        self.vertices = np.asarray(vertices, dtype=np.float32)
+        self.indices = np.asarray(indices, dtype=np.uint32)
+        # Per-vertex brightness factor (gradient); 1.0 everywhere for flat meshes
+        if shade is None:
+            shade = np.ones(len(self.vertices), dtype=np.float32)
+        self.shade = np.asarray(shade, dtype=np.float32)
+        self.rotation_axis = rotation_axis
+
+        self.count = 0
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.scales = np.ones((capacity, 3), dtype=np.float32)
+        self.colors = np.ones((capacity, 3), dtype=np.float32)
+        self._index_cache = {}
+
+    def clear(self):
+        """Remove all instances (call once per frame)"""
+        self.count = 0
+
+    def add(self, position, scale, color):
+        """Queue one instance of the mesh"""
+        if self.count == len(self.positions):
+            self._grow()
+        i = self.count
+        self.positions[i] = position
+        self.scales[i] = scale
+        self.colors[i] = color
+        self.count += 1
+
+    def _grow(self):
+        capacity = len(self.positions) * 2
+        for name in ('positions', 'scales', 'colors'):
+            old = getattr(self, name)
+            new = np.ones((capacity, 3), dtype=np.float32)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _instance_indices(self, count):
+        """Index array for `count` instances (cached per instance count)"""
+        indices = self._index_cache.get(count)
+        if indices is None:
+            offsets = (np.arange(count, dtype=np.uint32) * len(self.vertices))[:, None]
+            indices = (self.indices[None, :] + offsets).reshape(-1)
+            self._index_cache[count] = indices
+        return indices
+
+    def build_arrays(self, rotation_angle=0):
+        """Expand all instances into world-space vertex and color arrays"""
+        n = self.count
+        vertices = self.vertices[None, :, :] * self.scales[:n, None, :]
+        if rotation_angle:
+            # Row vectors, so multiply by the transposed rotation
+            vertices = vertices @ rotation_matrix(rotation_angle, self.rotation_axis).T
+        vertices += self.positions[:n, None, :]
+        colors = self.colors[:n, None, :] * self.shade[None, :, None]
+        return vertices.reshape(-1, 3), colors.reshape(-1, 3)
+
+    def draw(self, rotation_angle=0):
+        """Draw every queued instance with one call"""
+        if self.count == 0:
+            return
+        vertices, colors = self.build_arrays(rotation_angle)
+        indices = self._instance_indices(self.count)
+
+        get_renderer().draw_arrays(vertices, indices, colors)
+
+
+class ObstacleBatchRenderer:
+    """
+    Collects every visible wall and sphere for the frame and draws each mesh type in one call
+
+    Usage per frame: begin(), add_wall()/add_sphere() for each obstacle, flush(rotation_angle)
+    With a Frustum, obstacles outside the view are skipped at add time.
+    """
+
+    def __init__(self, sphere_slices=16, sphere_stacks=12, lod=None, frustum=None):
+        # Walls: unit box scaled to (width, 2 * height, 2) like Shapes.draw_wall
+        box = build_box_mesh()
+        self.wall_batch = MeshBatch(box.vertices, box.indices, rotation_axis=(1, 1, 0))
+
+        # Spheres: unit-radius meshes with the same gradient as Shapes.draw_textured_sphere,
+        # one batch per LOD tier (a single tier when no SphereLOD is given)
+        self.lod = lod
+        self.frustum = frustum
+        if lod is None:
+            details = [(sphere_slices, sphere_stacks)]
+        else:
+            details = [(slices, stacks) for _, slices, stacks in lod.tiers]
+        self.sphere_batches = [
+            MeshBatch(*build_sphere_geometry(1.0, slices, stacks), rotation_axis=(0, 1, 0))
+            for slices, stacks in details
+        ]
+
+        # Per-frame statistics
+        self.draw_calls = 0
+        self.instances_drawn = 0
+
+    def begin(self):
+        """Start a new frame"""
+        self.wall_batch.clear()
+        for batch in self.sphere_batches:
+            batch.clear()
+        if self.lod is not None:
+            self.lod.reset_frame_stats()
+
+    def add_wall(self, x, y, z, height=3.0, width=3.0, color=(1.0, 1.0, 1.0)):
+        """Queue a wall obstacle (returns False if it was culled)"""
+        if self.frustum is not None:
+            # Bounding sphere of the wall so the test holds for any rotation
+            bounding_radius = math.sqrt((width / 2.0) ** 2 + height ** 2 + 1.0)
+            if not self.frustum.sphere_visible(x, y, z, bounding_radius):
+                return False
+        self.wall_batch.add((x, y, z), (width, height * 2.0, 2.0), color)
+        return True
+
+    def add_sphere(self, x, y, z, radius=1.0, color=(1.0, 0.7, 0.3), lod_key=None):
+        """Queue a gradient-shaded sphere obstacle (returns False if it was culled)"""
+        if self.frustum is not None and not self.frustum.sphere_visible(x, y, z, radius):
+            return False
+        tier = 0
+        if self.lod is not None:
+            tier = self.lod.select(x, y, z, lod_key)
+            if self.lod.show_tiers:
+                color = self.lod.debug_color(tier)
+        self.sphere_batches[tier].add((x, y, z), (radius, radius, radius), color)
+        return True
+
+    def flush(self, rotation_angle=0):
+        """Draw all queued obstacles - one draw call per mesh type"""
+        self.draw_calls = 0
+        self.instances_drawn = 0
+        for batch in [self.wall_batch] + self.sphere_batches:
+            if batch.count:
+                batch.draw(rotation_angle)
+                self.draw_calls += 1
+                self.instances_drawn += batch.count
+
+    def get_stats(self):
+        """Get last frame's batching statistics"""
+        return {
+            'draw_calls': self.draw_calls,
+            'instances_drawn': self.instances_drawn,
+            'walls': self.wall_batch.count,
+            'spheres': sum(batch.count for batch in self.sphere_batches),
+            'spheres_per_tier': [batch.count for batch in self.sphere_batches]
+        }
@@ -0,0 +1,169 @@
+import numpy as np
+from fixed_timestep import TICK_RATE, ticks_for
+
+KIND_SPHERE = 0
+KIND_WALL = 1
+
+
+class ScheduleChunk:
+    """One block of the obstacle stream, sorted by spawn tick"""
+
+    def __init__(self, tick, lane, kind, y, color):
+        self.tick = tick      # int64 spawn tick
+        self.lane = lane      # int16 lane index
+        self.kind = kind      # uint8 KIND_SPHERE / KIND_WALL
+        self.y = y            # float32 height
+        self.color = color    # float32 (n, 3) RGB
+
+    def __len__(self):
+        return len(self.tick)
+
+
+class ObstacleSchedule:
+    """
+    Seeded stream of upcoming obstacles, generated in chunks ahead of use
+
+    Every lane spawns its next obstacle one trip down the track (split
+    between per_lane obstacles) plus up to max_wait ticks after the
+    previous one; kind, height and color are random and the newest
+    obstacles never put a wall in every lane. Chunks cover `chunk_ticks`
+    of simulation and are only generated when consumption reaches them,
+    so the per-tick cost of take() is a binary search with no RNG work.
+    Generated chunks are kept for the round, so seek() can move to any
+    tick, including back.
+
+    The same seed always produces the same stream; reset() restarts it
+    (from the seed, or from a freshly drawn one when the seed is None).
+    round_seed is the seed of the current stream.
+    """
+
+    def __init__(self, lane_count=3, per_lane=1, cycle_ticks=98, max_wait=1.0, seed=None,
+                 tick_rate=TICK_RATE, chunk_ticks=None):
+        self.lane_count = lane_count
+        self.per_lane = per_lane
+        self.interval = max(1, cycle_ticks // per_lane)
+        self.max_wait = ticks_for(max_wait, tick_rate)
+        self.chunk_ticks = chunk_ticks if chunk_ticks is not None else ticks_for(10.0, tick_rate)
+        self.seed = seed
+        self.chunks_generated = 0
+        self.entries_generated = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start the stream over at tick 0"""
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            # Draw a seed rather than seeding from entropy directly, so the round can be replayed
+            seed = int(np.random.default_rng().integers(2 ** 63))
+        self.round_seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.horizon = 0  # Ticks before this are generated
+        self.lane_wall = np.zeros(self.lane_count, dtype=bool)
+        self.chunks = []
+        self.chunk_index = 0
+        self.cursor = 0
+        self.last_tick = -1  # Last tick passed to take()
+
+        # Lanes start at different times: one at once, one after max_wait, one at random
+        first = np.resize([0, self.max_wait, -1], self.lane_count)
+        first[first < 0] = self.rng.integers(0, self.max_wait + 1, np.count_nonzero(first < 0))
+        self.rng.shuffle(first)
+        self.next_tick = first.astype(np.int64)
+        self.slot_in_lane = np.zeros(self.lane_count, dtype=np.int64)
+        self.chunks.append(self._generate())
+
+    def _generate(self):
+        """Produce every spawn in [horizon, horizon + chunk_ticks)"""
+        start, end = self.horizon, self.horizon + self.chunk_ticks
+        self.horizon = end
+
+        # Oversample each lane's gaps, keep the spawns that land inside this chunk
+        per_lane = self.chunk_ticks // self.interval + 1
+        ticks = []
+        lanes = []
+        for lane in range(self.lane_count):
+            gaps = self.interval + self.rng.integers(0, self.max_wait + 1, per_lane)
+            # Obstacles sharing a lane start one interval apart before the random gaps kick in
+            gaps[:max(0, self.per_lane - 1 - self.slot_in_lane[lane])] = self.interval
+            lane_ticks = self.next_tick[lane] + np.concatenate(([0], np.cumsum(gaps)))
+            keep = lane_ticks < end
+            count = np.count_nonzero(keep)
+            self.next_tick[lane] = lane_ticks[count]
+            self.slot_in_lane[lane] += count
+            ticks.append(lane_ticks[:count])
+            lanes.append(np.full(count, lane, dtype=np.int16))
+        tick = np.concatenate(ticks)
+        lane = np.concatenate(lanes)
+        order = np.lexsort((lane, tick))
+        tick, lane = tick[order], lane[order]
+
+        n = len(tick)
+        walls = self.rng.random(n) < 0.5
+        # Never a wall in front of every lane (sequential, but only once per chunk)
+        lane_wall = self.lane_wall
+        for i in range(n):
+            lane_wall[lane[i]] = walls[i]
+            if walls[i] and lane_wall.all():
+                walls[i] = False
+                lane_wall[lane[i]] = False
+        y = np.where(walls, 0.0, self.rng.choice([0.0, -3.0], n)).astype(np.float32)
+        color = self.rng.random((n, 3)).astype(np.float32)
+
+        self.chunks_generated += 1
+        self.entries_generated += n
+        return ScheduleChunk(tick, lane, walls.astype(np.uint8), y, color)
+
+    def take(self, tick):
+        """
+        Remove and return the obstacles due at or before `tick`
+
+        Returns (lane, kind, y, color) arrays, empty when nothing spawns.
+        Ticks are normally consecutive; any other tick (after the game state
+        was restored) first seeks to the tick before it.
+        """
+        if tick != self.last_tick + 1:
+            self.seek(tick - 1)
+        self.last_tick = tick
+        parts = []
+        while True:
+            chunk = self.chunks[self.chunk_index]
+            stop = np.searchsorted(chunk.tick, tick, side='right')
+            if stop > self.cursor:
+                parts.append((chunk, self.cursor, stop))
+                self.cursor = stop
+            if stop < len(chunk) or tick < (self.chunk_index + 1) * self.chunk_ticks:
+                break
+            # Consumed this chunk - move to the next one, generating it the first time
+            self._chunk(self.chunk_index + 1)
+            self.cursor = 0
+
+        if len(parts) == 1:
+            chunk, begin, stop = parts[0]
+            return chunk.lane[begin:stop], chunk.kind[begin:stop], chunk.y[begin:stop], chunk.color[begin:stop]
+        if not parts:
+            return (np.empty(0, dtype=np.int16), np.empty(0, dtype=np.uint8),
+                    np.empty(0, dtype=np.float32), np.empty((0, 3), dtype=np.float32))
+        return tuple(np.concatenate([getattr(chunk, name)[begin:stop] for chunk, begin, stop in parts])
+                     for name in ('lane', 'kind', 'y', 'color'))
+
+    def _chunk(self, index):
+        """Make chunk `index` current (chunks are kept, so going back needs no regeneration)"""
+        while len(self.chunks) <= index:
+            self.chunks.append(self._generate())
+        self.chunk_index = index
+        return self.chunks[index]
+
+    def seek(self, tick):
+        """Continue as if everything due up to `tick` had been taken (rollback, replay seeking)"""
+        chunk = self._chunk(max(0, tick) // self.chunk_ticks)
+        self.cursor = int(np.searchsorted(chunk.tick, tick, side='right'))
+        self.last_tick = tick
+
+    def get_stats(self):
+        return {
+            'chunks': self.chunks_generated,
+            'entries': self.entries_generated,
+            'horizon_ticks': self.horizon
+        }
+
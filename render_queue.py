@@ -0,0 +1,130 @@
+import time
+
+
+class RenderQueue:
+    """
+    Collects a frame's draw calls and submits them sorted by state
+
+    Acts as the active renderer (same draw_mesh/draw_arrays/overlay calls as
+    the backends). Nothing is drawn until flush(): 3D draws are then sorted
+    by texture, color and mesh and sent to the backend inside one batch, so
+    consecutive draws sharing a texture or color don't set it again. HUD
+    draws between begin_overlay/end_overlay keep their submission order
+    because they blend over each other.
+
+    With a profiler set, each draw remembers the profiler section that
+    queued it and flush() charges the time spent submitting it (and, with
+    a sync callable, the GPU time up to the next section's draws) back to
+    that section, so 'cube', 'obstacles', ... keep their cost and the
+    section around flush() keeps only the queue's own overhead.
+    """
+
+    name = "queue"
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.layers = [[]]  # 3D layer, then (overlay begin, overlay draws, overlay end) ...
+        self.in_overlay = False
+        self.sequence = 0
+        self.profiler = None  # FrameProfiler whose sections draws are charged to
+
+        # Last flush's statistics
+        self.commands = 0
+        self.state_changes = 0
+        self.state_changes_saved = 0
+
+    def set_projection(self, fovy, aspect, near, far):
+        self.backend.set_projection(fovy, aspect, near, far)
+
+    @staticmethod
+    def _sort_key(texture, color, mesh_key, sequence):
+        # Untextured draws first, then grouped by texture, color and mesh (submission order breaks ties)
+        return (texture is not None, texture or 0, tuple(color) if color is not None else (), mesh_key, sequence)
+
+    def _submit(self, command, texture, color, mesh_key):
+        key = None
+        if not self.in_overlay:
+            key = self._sort_key(texture, color, mesh_key, self.sequence)
+        section = self.profiler.current_section() if self.profiler is not None else None
+        self.layers[-1].append((key, command, color, texture, section))
+        self.sequence += 1
+
+    def draw_mesh(self, mesh, translate=(0.0, 0.0, 0.0), rotation=None, scale=None, color=None, texture=None):
+        """Queue a Mesh draw (same parameters as the backends)"""
+        command = (self.backend.draw_mesh, (mesh, translate, rotation, scale, color, texture))
+        self._submit(command, texture, color, id(mesh))
+
+    def draw_arrays(self, vertices, indices, colors=None, texcoords=None, color=None, texture=None):
+        """Queue a dynamic-geometry draw (same parameters as the backends)"""
+        command = (self.backend.draw_arrays, (vertices, indices, colors, texcoords, color, texture))
+        self._submit(command, texture, color, 0)
+
+    def begin_overlay(self, width=800, height=600):
+        section = self.profiler.current_section() if self.profiler is not None else None
+        self.layers.append([(None, (self.backend.begin_overlay, (width, height)), None, None, section)])
+        self.in_overlay = True
+
+    def end_overlay(self):
+        section = self.profiler.current_section() if self.profiler is not None else None
+        self.layers[-1].append((None, (self.backend.end_overlay, ()), None, None, section))
+        self.layers.append([])
+        self.in_overlay = False
+
+    def flush(self):
+        """Submit everything queued this frame to the backend, then clear the queue"""
+        backend = self.backend
+        start_requests = backend.state_requests
+        start_changes = backend.state_changes
+        self.commands = 0
+        profiler = self.profiler if self.profiler is not None and self.profiler.current_section() else None
+
+        for layer in self.layers:
+            if not layer:
+                continue
+            if layer[0][0] is not None:
+                layer.sort(key=lambda entry: entry[0])
+            backend.begin_batch()
+            if profiler is None:
+                for _, (draw, args), _, _, _ in layer:
+                    draw(*args)
+            else:
+                self._submit_timed(layer, profiler)
+            backend.end_batch()
+            self.commands += len(layer)
+
+        self.state_changes = backend.state_changes - start_changes
+        # Unbatched, every request would have been a state change
+        self.state_changes_saved = max(0, backend.state_requests - start_requests - self.state_changes)
+        self.layers = [[]]
+        self.in_overlay = False
+        self.sequence = 0
+
+    def _submit_timed(self, layer, profiler):
+        """Run a layer's draws, charging each run of draws to the section that queued it"""
+        sync = profiler.sync
+        section = None
+        start = time.perf_counter()
+        for _, (draw, args), _, _, queued_by in layer:
+            if queued_by != section:
+                if section is not None:
+                    if sync is not None:
+                        sync()
+                    now = time.perf_counter()
+                    profiler.charge(section, now - start)
+                    start = now
+                else:
+                    start = time.perf_counter()
+                section = queued_by
+            draw(*args)
+        if section is not None:
+            if sync is not None:
+                sync()
+            profiler.charge(section, time.perf_counter() - start)
+
+    def get_stats(self):
+        """Last flush's draw and state-change counts"""
+        return {
+            'commands': self.commands,
+            'state_changes': self.state_changes,
+            'state_changes_saved': self.state_changes_saved
+        }
@@ -0,0 +1,504 @@
+import math
+from contextlib import contextmanager
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from mesh import Mesh
+
+# Marks cached GL state as unknown (must be set before the next draw)
+_UNSET = object()
+
+
+def rotation_matrix(angle_degrees, axis):
+    """3x3 rotation matrix matching glRotatef(angle, *axis) (column-vector convention)"""
+    x, y, z = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    a = math.radians(angle_degrees)
+    c, s = math.cos(a), math.sin(a)
+    t = 1.0 - c
+    return np.array([
+        [t * x * x + c,     t * x * y - s * z, t * x * z + s * y],
+        [t * x * y + s * z, t * y * y + c,     t * y * z - s * x],
+        [t * x * z - s * y, t * y * z + s * x, t * z * z + c]
+    ], dtype=np.float32)
+
+
+def model_matrix(translate=(0.0, 0.0, 0.0), rotation=None, scale=None):
+    """4x4 model matrix equivalent to glTranslatef * glRotatef * glScalef"""
+    matrix = np.identity(4, dtype=np.float32)
+    linear = np.identity(3, dtype=np.float32)
+    if rotation is not None and rotation[0]:
+        linear = rotation_matrix(*rotation)
+    if scale is not None:
+        linear = linear * np.asarray(scale, dtype=np.float32)[None, :]
+    matrix[:3, :3] = linear
+    matrix[:3, 3] = translate
+    return matrix
+
+
+def perspective_matrix(fovy, aspect, near, far):
+    """4x4 projection matrix equivalent to gluPerspective"""
+    f = 1.0 / math.tan(math.radians(fovy) / 2.0)
+    return np.array([
+        [f / aspect, 0.0, 0.0, 0.0],
+        [0.0, f, 0.0, 0.0],
+        [0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)],
+        [0.0, 0.0, -1.0, 0.0]
+    ], dtype=np.float32)
+
+
+def ortho_matrix(left, right, bottom, top, near, far):
+    """4x4 projection matrix equivalent to glOrtho"""
+    return np.array([
+        [2.0 / (right - left), 0.0, 0.0, -(right + left) / (right - left)],
+        [0.0, 2.0 / (top - bottom), 0.0, -(top + bottom) / (top - bottom)],
+        [0.0, 0.0, -2.0 / (far - near), -(far + near) / (far - near)],
+        [0.0, 0.0, 0.0, 1.0]
+    ], dtype=np.float32)
+
+
+class FixedFunctionRenderer:
+    """
+    Legacy backend: GL matrix stack, glColor and client-side vertex arrays
+
+    Works on any OpenGL 1.x driver. Selected with --fixed-function, or
+    automatically when shaders are unavailable.
+    """
+
+    name = "fixed"
+
+    def __init__(self):
+        # State cache, only trusted between begin_batch() and end_batch()
+        self.batching = False
+        self.current_color = _UNSET
+        self.current_texture = _UNSET
+        self.state_requests = 0  # Color/texture settings asked for by draws
+        self.state_changes = 0   # ...and the ones actually sent to GL
+
+    def begin_batch(self):
+        """Start a run of draws that skips color/texture changes already in effect"""
+        self.batching = True
+        self.current_color = _UNSET
+        self.current_texture = None  # Unbatched draws always leave texturing disabled
+
+    def end_batch(self):
+        """Leave the batch with texturing disabled, as unbatched draws expect"""
+        if self.current_texture is not None:
+            glDisable(GL_TEXTURE_2D)
+        self.batching = False
+
+    def _set_color(self, color):
+        if color is None:
+            return
+        self.state_requests += 1
+        if self.batching and color == self.current_color:
+            return
+        if len(color) == 4:
+            glColor4f(*color)
+        else:
+            glColor3f(*color)
+        self.current_color = color
+        self.state_changes += 1
+
+    def _set_texture(self, texture):
+        if texture is not None:
+            self.state_requests += 1
+        if self.batching and texture == self.current_texture:
+            return
+        if texture is None:
+            if self.batching:
+                glDisable(GL_TEXTURE_2D)
+        else:
+            if not self.batching or self.current_texture is None:
+                glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, texture)
+        self.current_texture = texture
+        self.state_changes += 1
+
+    def _finish_draw(self, has_vertex_colors, texture):
+        if has_vertex_colors:
+            # The current color is undefined after drawing with a color array
+            self.current_color = _UNSET
+        if not self.batching and texture is not None:
+            glDisable(GL_TEXTURE_2D)
+
+    def set_projection(self, fovy, aspect, near, far):
+        """Set up the 3D perspective projection"""
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(fovy, aspect, near, far)
+        glMatrixMode(GL_MODELVIEW)
+
+    def draw_mesh(self, mesh, translate=(0.0, 0.0, 0.0), rotation=None, scale=None, color=None, texture=None):
+        """
+        Draw a Mesh with a model transform
+
+        Parameters:
+        - translate: Position (x, y, z)
+        - rotation: Optional (angle_degrees, axis) like glRotatef
+        - scale: Optional (sx, sy, sz)
+        - color: RGB/RGBA tint (ignored by meshes with a color array)
+        - texture: Optional texture id (mesh needs texcoords)
+        """
+        glLoadIdentity()
+        glTranslatef(*translate)
+        if rotation is not None:
+            glRotatef(rotation[0], *rotation[1])
+        if scale is not None:
+            glScalef(*scale)
+        self._set_color(color)
+        if texture is not None or self.batching:
+            self._set_texture(texture)
+        mesh.draw()
+        self._finish_draw(mesh.colors is not None, texture)
+
+    def draw_arrays(self, vertices, indices, colors=None, texcoords=None, color=None, texture=None):
+        """Draw world-space triangles straight from NumPy arrays (dynamic geometry)"""
+        glLoadIdentity()
+        self._set_color(color)
+        if texture is not None or self.batching:
+            self._set_texture(texture)
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(vertices.shape[1], GL_FLOAT, 0, vertices)
+        if colors is not None:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, 0, colors)
+        if texcoords is not None:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+
+        glDrawElements(GL_TRIANGLES, len(indices), GL_UNSIGNED_INT, indices)
+
+        if texcoords is not None:
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        if colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        self._finish_draw(colors is not None, texture)
+
+    def begin_overlay(self, width=800, height=600):
+        """Switch to a 2D pixel projection (origin top-left) for HUD drawing"""
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, width, height, 0, -1, 1)
+
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        # Disable depth testing for 2D overlay
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    def end_overlay(self):
+        """Restore the 3D projection and state changed by begin_overlay"""
+        glDisable(GL_BLEND)
+        glEnable(GL_DEPTH_TEST)
+
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
+
+
+VERTEX_SHADER = """
+#version 120
+attribute vec3 a_position;
+attribute vec3 a_color;
+attribute vec2 a_texcoord;
+uniform mat4 u_mvp;
+varying vec3 v_color;
+varying vec2 v_texcoord;
+void main() {
+    v_color = a_color;
+    v_texcoord = a_texcoord;
+    gl_Position = u_mvp * vec4(a_position, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+uniform vec4 u_color;
+uniform float u_use_vertex_color;
+uniform float u_use_texture;
+uniform sampler2D u_texture;
+varying vec3 v_color;
+varying vec2 v_texcoord;
+void main() {
+    vec4 color = u_color;
+    if (u_use_vertex_color > 0.5) {
+        color *= vec4(v_color, 1.0);
+    }
+    if (u_use_texture > 0.5) {
+        color *= texture2D(u_texture, v_texcoord);
+    }
+    gl_FragColor = color;
+}
+"""
+
+
+class ShaderRenderer:
+    """
+    Programmable-pipeline backend: one GLSL program, vertex attributes and uniforms
+
+    Transforms are computed with NumPy and passed as a single MVP uniform;
+    colors and textures are uniforms too, so no GL matrix stack or glColor
+    calls are involved. Needs OpenGL 2.0 (GLSL 1.20) and vertex buffers.
+    """
+
+    name = "shader"
+
+    def __init__(self):
+        if not bool(glCreateShader) or not bool(glGenBuffers):
+            raise RuntimeError("OpenGL 2.0 shaders are not supported by this driver")
+        self.program = self._build_program()
+        self.attributes = {name: glGetAttribLocation(self.program, name)
+                           for name in ('a_position', 'a_color', 'a_texcoord')}
+        self.uniforms = {name: glGetUniformLocation(self.program, name)
+                         for name in ('u_mvp', 'u_color', 'u_use_vertex_color', 'u_use_texture', 'u_texture')}
+        self.projection = np.identity(4, dtype=np.float32)
+        self.overlay_stack = []
+
+        # Uniform/texture cache, only trusted between begin_batch() and end_batch()
+        self.batching = False
+        self.current = {}
+        self.state_requests = 0  # Program/uniform/texture settings asked for by draws
+        self.state_changes = 0   # ...and the ones actually sent to GL
+
+        glUseProgram(self.program)
+        glUniform1i(self.uniforms['u_texture'], 0)
+        glUseProgram(0)
+
+    @staticmethod
+    def _compile(source, shader_type):
+        shader = glCreateShader(shader_type)
+        glShaderSource(shader, source)
+        glCompileShader(shader)
+        if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+            raise RuntimeError(f"Shader compile failed: {glGetShaderInfoLog(shader)}")
+        return shader
+
+    def _build_program(self):
+        vertex = self._compile(VERTEX_SHADER, GL_VERTEX_SHADER)
+        fragment = self._compile(FRAGMENT_SHADER, GL_FRAGMENT_SHADER)
+        program = glCreateProgram()
+        glAttachShader(program, vertex)
+        glAttachShader(program, fragment)
+        # Attribute 0 must be the position on compatibility contexts
+        glBindAttribLocation(program, 0, 'a_position')
+        glLinkProgram(program)
+        if not glGetProgramiv(program, GL_LINK_STATUS):
+            raise RuntimeError(f"Shader link failed: {glGetProgramInfoLog(program)}")
+        glDeleteShader(vertex)
+        glDeleteShader(fragment)
+        return program
+
+    def set_projection(self, fovy, aspect, near, far):
+        """Set up the 3D perspective projection"""
+        self.projection = perspective_matrix(fovy, aspect, near, far)
+
+    def begin_batch(self):
+        """Start a run of draws that keeps the program bound and skips unchanged uniforms"""
+        self.batching = True
+        self.current = {}
+        glUseProgram(self.program)
+        self.state_changes += 1
+
+    def end_batch(self):
+        glUseProgram(0)
+        self.batching = False
+
+    def _changed(self, name, value):
+        """True (and remembered) if a cached uniform/binding must be set to value"""
+        self.state_requests += 1
+        if self.batching and self.current.get(name, _UNSET) == value:
+            return False
+        self.current[name] = value
+        self.state_changes += 1
+        return True
+
+    def _set_uniforms(self, model, color, use_vertex_color, texture):
+        mvp = self.projection @ model
+        glUniformMatrix4fv(self.uniforms['u_mvp'], 1, GL_TRUE, mvp)
+        if color is None:
+            color = (1.0, 1.0, 1.0, 1.0)
+        elif len(color) == 3:
+            color = (color[0], color[1], color[2], 1.0)
+        if self._changed('u_color', tuple(color)):
+            glUniform4f(self.uniforms['u_color'], *color)
+        if self._changed('u_use_vertex_color', use_vertex_color):
+            glUniform1f(self.uniforms['u_use_vertex_color'], 1.0 if use_vertex_color else 0.0)
+        if self._changed('u_use_texture', texture is not None):
+            glUniform1f(self.uniforms['u_use_texture'], 1.0 if texture is not None else 0.0)
+        if texture is not None and self._changed('texture', texture):
+            glActiveTexture(GL_TEXTURE0)
+            glBindTexture(GL_TEXTURE_2D, texture)
+
+    def _bind_attribute(self, name, size, buffer_id, array):
+        location = self.attributes[name]
+        if location < 0:
+            return None
+        glEnableVertexAttribArray(location)
+        if buffer_id is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, buffer_id)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, 0, None)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        else:
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, 0, array)
+        return location
+
+    def _draw(self, vertices, vertex_buffer, colors, color_buffer, texcoords, texcoord_buffer,
+              indices, index_buffer, model, color, texture):
+        self.state_requests += 1
+        if not self.batching:
+            glUseProgram(self.program)
+            self.state_changes += 1
+        use_vertex_color = colors is not None
+        self._set_uniforms(model, color, use_vertex_color, texture)
+
+        enabled = [self._bind_attribute('a_position', vertices.shape[1], vertex_buffer, vertices)]
+        if use_vertex_color:
+            enabled.append(self._bind_attribute('a_color', 3, color_buffer, colors))
+        if texture is not None and texcoords is not None:
+            enabled.append(self._bind_attribute('a_texcoord', 2, texcoord_buffer, texcoords))
+
+        if index_buffer is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, index_buffer)
+            glDrawElements(GL_TRIANGLES, len(indices), GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            glDrawElements(GL_TRIANGLES, len(indices), GL_UNSIGNED_INT, indices)
+
+        for location in enabled:
+            if location is not None:
+                glDisableVertexAttribArray(location)
+        if not self.batching:
+            glUseProgram(0)
+
+    def draw_mesh(self, mesh, translate=(0.0, 0.0, 0.0), rotation=None, scale=None, color=None, texture=None):
+        """Draw a Mesh with a model transform (same parameters as FixedFunctionRenderer)"""
+        mesh.ensure_uploaded()
+        self._draw(mesh.vertices, mesh.vertex_buffer, mesh.colors, mesh.color_buffer,
+                   mesh.texcoords, mesh.texcoord_buffer, mesh.indices, mesh.index_buffer,
+                   model_matrix(translate, rotation, scale), color, texture)
+
+    def draw_arrays(self, vertices, indices, colors=None, texcoords=None, color=None, texture=None):
+        """Draw world-space triangles straight from NumPy arrays (dynamic geometry)"""
+        self._draw(vertices, None, colors, None, texcoords, None, indices, None,
+                   np.identity(4, dtype=np.float32), color, texture)
+
+    def begin_overlay(self, width=800, height=600):
+        """Switch to a 2D pixel projection (origin top-left) for HUD drawing"""
+        self.overlay_stack.append(self.projection)
+        self.projection = ortho_matrix(0, width, height, 0, -1, 1)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    def end_overlay(self):
+        """Restore the 3D projection and state changed by begin_overlay"""
+        glDisable(GL_BLEND)
+        glEnable(GL_DEPTH_TEST)
+        self.projection = self.overlay_stack.pop()
+
+
+class GeometryRecorder:
+    """
+    Pseudo-renderer that captures draw calls as world-space geometry instead of drawing
+
+    Used to bake static geometry: everything drawn while it is active is
+    transformed on the CPU and merged into one Mesh per texture.
+    """
+
+    name = "recorder"
+
+    def __init__(self):
+        self.parts = {}  # texture id (or None) -> list of (vertices, colors, texcoords, indices)
+
+    def set_projection(self, fovy, aspect, near, far):
+        pass
+
+    def draw_mesh(self, mesh, translate=(0.0, 0.0, 0.0), rotation=None, scale=None, color=None, texture=None):
+        model = model_matrix(translate, rotation, scale)
+        vertices = mesh.vertices @ model[:3, :3].T + model[:3, 3]
+        self._add(vertices, mesh.indices, mesh.colors, mesh.texcoords, color, texture)
+
+    def draw_arrays(self, vertices, indices, colors=None, texcoords=None, color=None, texture=None):
+        self._add(vertices, indices, colors, texcoords, color, texture)
+
+    def _add(self, vertices, indices, colors, texcoords, color, texture):
+        if colors is None:
+            tint = (1.0, 1.0, 1.0) if color is None else color[:3]
+            colors = np.tile(np.asarray(tint, dtype=np.float32), (len(vertices), 1))
+        if texture is None:
+            texcoords = None
+        self.parts.setdefault(texture, []).append((vertices, colors, texcoords, indices))
+
+    def build_meshes(self):
+        """Merge the captured geometry into a list of (Mesh, texture) pairs"""
+        meshes = []
+        for texture, parts in self.parts.items():
+            offsets = np.cumsum([0] + [len(part[0]) for part in parts[:-1]])
+            vertices = np.concatenate([part[0] for part in parts])
+            colors = np.concatenate([part[1] for part in parts])
+            indices = np.concatenate([part[3] + offset for part, offset in zip(parts, offsets)])
+            texcoords = None
+            if texture is not None:
+                texcoords = np.concatenate([part[2] for part in parts])
+            meshes.append((Mesh(vertices, indices, colors, texcoords=texcoords), texture))
+        return meshes
+
+    def begin_overlay(self, width=800, height=600):
+        pass
+
+    def end_overlay(self):
+        pass
+
+
+# Active backend used by Shapes, LaneMarkers, the obstacle batches and HUD text
+_active_renderer = FixedFunctionRenderer()
+
+
+def get_renderer():
+    """Return the active renderer backend"""
+    return _active_renderer
+
+
+def set_renderer(renderer):
+    """Make renderer the active backend"""
+    global _active_renderer
+    _active_renderer = renderer
+
+
+@contextmanager
+def use_renderer(renderer):
+    """Temporarily switch the active backend (e.g. to a GeometryRecorder)"""
+    previous = get_renderer()
+    set_renderer(renderer)
+    try:
+        yield renderer
+    finally:
+        set_renderer(previous)
+
+
+def create_renderer(backend="auto"):
+    """
+    Create a renderer backend for the current OpenGL context and make it active
+
+    Parameters:
+    - backend: "shader", "fixed", or "auto" (shader with fixed-function fallback)
+    """
+    renderer = None
+    if backend in ("auto", "shader"):
+        try:
+            renderer = ShaderRenderer()
+            print("Renderer: programmable pipeline (GLSL 1.20)")
+        except Exception as e:
+            print(f"Shader renderer unavailable, using fixed-function pipeline: {e}")
+    if renderer is None:
+        renderer = FixedFunctionRenderer()
+        print("Renderer: fixed-function pipeline")
+    set_renderer(renderer)
+    return renderer
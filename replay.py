@@ -0,0 +1,299 @@
+"""
+Recording and playback of games
+
+A replay stores the round's obstacle seed, every tick's input and a
+keyframe of the obstacle and cube state every `keyframe_ticks` ticks:
+
+    header      magic, version, tick rate, seed, sizes (struct, little-endian)
+    lane_x      float32 per lane
+    inputs      INPUT_DTYPE per tick (4 bytes), zlib-compressed
+    keyframes   GameState snapshot per keyframe, zlib-compressed
+
+An hour of play is well under a megabyte. ReplayPlayer re-simulates from
+the keyframe at or before any tick, so seeking costs at most
+keyframe_ticks ticks wherever it lands:
+
+    python replay.py replays/2026-10-17_14-03-22-517.fcr
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+import numpy as np
+from fixed_timestep import TICK_RATE
+from sphere_manager import SphereManager
+from collision import CollisionDetector
+from simulation import CubeMotion, format_time, MAX_TICK_ACTIONS
+from game_state import GameState
+
+MAGIC = b'FCRP'
+VERSION = 2
+# magic, version, tick rate, seed, ticks, survival, lanes, per lane, keyframe ticks, keyframes, keyframe bytes
+HEADER = struct.Struct('<4sHHQqdHHIII')
+
+REPLAY_DIR = 'replays'  # The apps save every round here
+
+CONTROLS_KEYBOARD = 0
+CONTROLS_ARDUINO = 1
+
+# Per tick: up to MAX_TICK_ACTIONS (two) key presses (low nibble first), or the Arduino joystick and distance (0.01 cm)
+INPUT_DTYPE = np.dtype([('keys', 'u1'), ('joystick', 'i1'), ('distance', '<u2')])
+
+
+def encode_keys(actions):
+    """Pack a tick's actions into one byte (the games apply at most two per tick, see split_tick_events)"""
+    if len(actions) > MAX_TICK_ACTIONS:
+        raise ValueError(f"A tick holds at most {MAX_TICK_ACTIONS} actions, got {len(actions)}")
+    first = actions[0] if actions else 0
+    second = actions[1] if len(actions) > 1 else 0
+    return first | (second << 4)
+
+
+def decode_keys(keys):
+    return [action for action in (keys & 15, keys >> 4) if action]
+
+
+class Replay:
+    """One recorded round: seed, per-tick inputs and keyframes"""
+
+    def __init__(self, seed, tick_rate, lane_x, per_lane, controls_type, keyframe_ticks, inputs, keyframes,
+                 survival_time=0.0):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.lane_x = np.asarray(lane_x, dtype=np.float32)
+        self.per_lane = per_lane
+        self.controls_type = controls_type
+        self.keyframe_ticks = keyframe_ticks
+        self.inputs = inputs
+        self.keyframes = keyframes
+        self.survival_time = survival_time
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def save(self, path):
+        inputs = zlib.compress(self.inputs.tobytes(), 9)
+        keyframes = zlib.compress(self.keyframes.tobytes(), 9)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed, len(self.inputs), self.survival_time,
+                                len(self.lane_x), self.per_lane, self.keyframe_ticks, len(self.keyframes),
+                                self.keyframes.dtype.itemsize))
+            f.write(struct.pack('<B', self.controls_type))
+            f.write(self.lane_x.astype('<f4').tobytes())
+            for block in (inputs, keyframes):
+                f.write(struct.pack('<I', len(block)))
+                f.write(block)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        (magic, version, tick_rate, seed, ticks, survival, lanes, per_lane, keyframe_ticks, keyframe_count,
+         keyframe_size) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        offset = HEADER.size
+        controls_type = data[offset]
+        offset += 1
+        lane_x = np.frombuffer(data, '<f4', lanes, offset)
+        offset += 4 * lanes
+        blocks = []
+        for _ in range(2):
+            size, = struct.unpack_from('<I', data, offset)
+            blocks.append(zlib.decompress(data[offset + 4:offset + 4 + size]))
+            offset += 4 + size
+        inputs = np.frombuffer(blocks[0], INPUT_DTYPE, ticks)
+        keyframes = np.frombuffer(blocks[1], np.dtype((np.void, keyframe_size)), keyframe_count)
+        return cls(seed, tick_rate, lane_x, per_lane, controls_type, keyframe_ticks, inputs, keyframes, survival)
+
+
+class ReplayRecorder:
+    """
+    Records a round as it is played
+
+    start() when the round begins, record() after every simulation tick
+    with the tick's key actions, finish() at game over.
+    """
+
+    def __init__(self, keyframe_ticks=TICK_RATE):
+        self.keyframe_ticks = keyframe_ticks
+        self.inputs = np.zeros(TICK_RATE * 60, dtype=INPUT_DTYPE)
+        self.ticks = 0
+
+    def start(self, sphere_manager, controls, arduino=False):
+        self.sphere_manager = sphere_manager
+        self.controls = controls
+        self.arduino = arduino
+        self.ticks = 0
+        self.inputs[:] = 0  # The buffer is reused between rounds
+        self.state = GameState(sphere_manager, controls)
+        self.keyframes = np.zeros(64, dtype=np.dtype((np.void, len(self.state))))
+        self.keyframe_count = 0
+        self._keyframe()
+
+    def _keyframe(self):
+        if self.keyframe_count == len(self.keyframes):
+            self.keyframes = np.concatenate([self.keyframes, np.zeros_like(self.keyframes)])
+        self.keyframes[self.keyframe_count] = self.state.snapshot()
+        self.keyframe_count += 1
+
+    def record(self, actions):
+        """Log the tick that just ran"""
+        if self.ticks == len(self.inputs):
+            self.inputs = np.concatenate([self.inputs, np.zeros_like(self.inputs)])
+        entry = self.inputs[self.ticks]
+        if self.arduino:
+            joystick_x, distance = self.controls.last_input
+            entry['joystick'] = max(-128, min(127, joystick_x))
+            entry['distance'] = max(0, min(65535, round(distance * 100)))
+        else:
+            entry['keys'] = encode_keys(actions)
+        self.ticks += 1
+        if self.ticks % self.keyframe_ticks == 0:
+            self._keyframe()
+
+    def finish(self, survival_time=0.0):
+        """The recorded round as a Replay"""
+        sphere_manager = self.sphere_manager
+        return Replay(sphere_manager.schedule.round_seed, sphere_manager.tick_rate, sphere_manager.lane_x,
+                      sphere_manager.per_lane, CONTROLS_ARDUINO if self.arduino else CONTROLS_KEYBOARD,
+                      self.keyframe_ticks, self.inputs[:self.ticks].copy(),
+                      self.keyframes[:self.keyframe_count].copy(), survival_time)
+
+
+def save_replay(replay, directory=REPLAY_DIR):
+    """Write a replay named after the current time (to the millisecond, never overwriting); returns its path"""
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    name = time.strftime('%Y-%m-%d_%H-%M-%S', time.localtime(now)) + f'-{int(now * 1000) % 1000:03d}'
+    path = os.path.join(directory, name + '.fcr')
+    count = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f'{name}_{count}.fcr')
+        count += 1
+    replay.save(path)
+    return path
+
+
+class ReplayPlayer:
+    """
+    Re-simulates a Replay with seeking
+
+    A seek restores the nearest earlier keyframe (the obstacle schedule
+    follows its tick) and simulates the remaining ticks (fewer than
+    keyframe_ticks).
+    """
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.obstacles = SphereManager(replay.lane_x, replay.per_lane, seed=replay.seed, tick_rate=replay.tick_rate)
+        if replay.controls_type == CONTROLS_ARDUINO:
+            from arduino_controls import ArduinoControls
+            self.controls = ArduinoControls(None, tick_rate=replay.tick_rate)
+        else:
+            self.controls = CubeMotion(replay.tick_rate, replay.lane_x.tolist())
+        self.state = GameState(self.obstacles, self.controls)
+        if len(self.state) != replay.keyframes.dtype.itemsize:
+            raise ValueError("Replay keyframes don't match this version's game state layout")
+        self.collision = CollisionDetector()
+        self.previous_cube = self.controls.get_cube_position()
+        self.hits = []
+        self.seek(0)
+
+    @property
+    def tick(self):
+        return self.obstacles.tick
+
+    def seek(self, tick):
+        """Jump to the state after `tick` ticks"""
+        replay = self.replay
+        tick = max(0, min(tick, len(replay)))
+        keyframe = replay.keyframes[min(tick // replay.keyframe_ticks, len(replay.keyframes) - 1)]
+        self.state.restore(keyframe.tobytes())
+        self.previous_cube = self.controls.get_cube_position()
+        self.hits = []
+        while self.tick < tick:
+            self.step()
+
+    def step(self):
+        """Play one recorded tick; returns its hit events"""
+        if self.tick >= len(self.replay):
+            return self.hits
+        entry = self.replay.inputs[self.tick]
+        self.previous_cube = self.controls.get_cube_position()
+        if self.replay.controls_type == CONTROLS_ARDUINO:
+            self.controls.apply_sensors(int(entry['joystick']), int(entry['distance']) / 100)
+        else:
+            for action in decode_keys(int(entry['keys'])):
+                self.controls.apply(action)
+        self.controls.update_movement()
+        self.obstacles.update_positions()
+        self.hits = self.collision.check(self.obstacles, self.controls.get_cube_position(), self.previous_cube)
+        return self.hits
+
+
+def view(path, speed=1.0):
+    """Play a replay in a window: SPACE pause, UP/DOWN speed, LEFT/RIGHT seek 5 s, HOME restart"""
+    import pygame as pg
+    from base_arduino import RegularApp
+    from mesh import Mesh
+
+    replay = Replay.load(path)
+    player = ReplayPlayer(replay)
+    print(f"Replay: {len(replay)} ticks ({format_time(len(replay) / replay.tick_rate)}), "
+          f"seed {replay.seed}, final time {format_time(replay.survival_time)}")
+
+    app = RegularApp(headless=True, tick_rate=replay.tick_rate)
+    pg.display.set_mode((800, 600), pg.OPENGL | pg.DOUBLEBUF)
+    pg.display.set_caption(f"Force Cube Runner - Replay {path}")
+    Mesh.invalidate_all()
+    app.setup_scene()
+    app.sphere_manager = player.obstacles
+    app.controls = player.controls
+    clock = pg.time.Clock()
+    position = 0.0  # Replay time in ticks (fractional part = interpolation alpha)
+    paused = False
+
+    while True:
+        for event in pg.event.get():
+            if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                pg.quit()
+                return
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_SPACE:
+                    paused = not paused
+                elif event.key == pg.K_UP:
+                    speed *= 2.0
+                elif event.key == pg.K_DOWN:
+                    speed /= 2.0
+                elif event.key in (pg.K_LEFT, pg.K_RIGHT, pg.K_HOME):
+                    if event.key == pg.K_HOME:
+                        position = 0.0
+                    else:
+                        position += 5 * replay.tick_rate * (1 if event.key == pg.K_RIGHT else -1)
+                    position = max(0.0, min(position, len(replay)))
+                    player.seek(int(position))
+
+        seconds = clock.tick(60) / 1000.0
+        if not paused:
+            position = min(position + seconds * speed * replay.tick_rate, len(replay))
+        target = int(position)
+        if target < player.tick or target - player.tick > replay.keyframe_ticks:
+            player.seek(target)
+        while player.tick < target:
+            player.step()
+
+        # The timer shows replay time
+        app.game_timer.paused_time = min(position / replay.tick_rate, replay.survival_time or float('inf'))
+        app.game_timer.is_paused = True
+        app.previous_cube = player.previous_cube
+        app.render_frame(1.0 if target == len(replay) else position - target)
+        pg.display.flip()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python replay.py <replay file> [speed]")
+    else:
+        view(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
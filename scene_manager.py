@@ -0,0 +1,94 @@
+import time
+
+# Returned by a scene's frame callback to stop the manager
+QUIT = "QUIT"
+
+
+class Scene:
+    """
+    One state of the game (start menu, instructions, playing, game over)
+
+    frame() runs one iteration of the scene and returns the name of the
+    scene to switch to, None to stay, or QUIT. enter()/exit() are optional
+    hooks called on transitions.
+    """
+
+    def __init__(self, name, frame, enter=None, exit=None):
+        self.name = name
+        self.frame = frame
+        self.enter = enter
+        self.exit = exit
+
+
+class SceneStats:
+    """Time spent in one scene across the session"""
+
+    def __init__(self):
+        self.entries = 0
+        self.frames = 0
+        self.seconds = 0.0
+        self.max_frame = 0.0
+
+    def as_dict(self):
+        return {
+            'entries': self.entries,
+            'frames': self.frames,
+            'seconds': round(self.seconds, 3),
+            'mean_frame_ms': round(self.seconds / self.frames * 1000.0, 3) if self.frames else 0.0,
+            'max_frame_ms': round(self.max_frame * 1000.0, 3)
+        }
+
+
+class SceneManager:
+    """
+    Flat state machine that runs one scene at a time
+
+    Transitions happen in the run() loop, so moving between menus and
+    rounds never nests calls (no stack growth over an all-day session) and
+    the scenes reuse the app's long-lived objects.
+    """
+
+    def __init__(self):
+        self.scenes = {}
+        self.stats = {}
+        self.current = None
+
+    def add(self, scene):
+        self.scenes[scene.name] = scene
+        self.stats[scene.name] = SceneStats()
+        return scene
+
+    def switch(self, name):
+        """Leave the current scene (if any) and enter `name`"""
+        if self.current is not None and self.current.exit is not None:
+            self.current.exit()
+        self.current = self.scenes[name]
+        self.stats[name].entries += 1
+        if self.current.enter is not None:
+            self.current.enter()
+
+    def run(self, initial):
+        """Run scenes starting with `initial` until one returns QUIT"""
+        self.switch(initial)
+        while True:
+            scene = self.current
+            start = time.perf_counter()
+            next_scene = scene.frame()
+            elapsed = time.perf_counter() - start
+
+            stats = self.stats[scene.name]
+            stats.frames += 1
+            stats.seconds += elapsed
+            stats.max_frame = max(stats.max_frame, elapsed)
+
+            if next_scene == QUIT:
+                if scene.exit is not None:
+                    scene.exit()
+                self.current = None
+                return
+            if next_scene is not None:
+                self.switch(next_scene)
+
+    def get_stats(self):
+        """Per-scene entries, frames and time spent"""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
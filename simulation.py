@@ -0,0 +1,411 @@
+"""
+Game simulation without pygame or OpenGL
+
+Simulation runs one game tick by tick from actions, with the same
+obstacles (SphereManager), cube movement (CubeMotion, which the keyboard
+controls also use) and collisions (CollisionDetector) as the real game.
+BatchSimulation steps thousands of independent games at once as NumPy
+array operations, for tuning difficulty and checking obstacle patterns:
+
+    sim = BatchSimulation(4096, seed=1)
+    times = sim.run(max_ticks=60 * 60)   # Seconds survived by each game
+"""
+import ctypes
+import numpy as np
+from fixed_timestep import TICK_RATE, ticks_for
+from game_state import GameState, StateStruct
+from sphere_manager import SphereManager, LANE_X, LANE_RADIUS, SPAWN_Z, RESET_Z, SPEED, MAX_RESET_WAIT
+from collision import (CollisionDetector, CUBE_HALF_EXTENTS, WALL_HALF_EXTENTS,
+                       swept_aabb_batch, swept_aabb_sphere_batch)
+
+# One action per tick
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_JUMP = 3
+ACTION_CROUCH = 4
+MAX_TICK_ACTIONS = 2  # Key presses handled per tick (a replay stores two); later ones wait a tick
+
+CUBE_Y = -2.0           # Resting height
+CUBE_DISTANCE = -15.0   # The cube stays at this z; obstacles come to it
+LANE_SPEED = 18.0       # Units per second while changing lanes
+JUMP_HEIGHT = 3.0
+CROUCH_DEPTH = 1.95
+MOVE_PHASE = 0.25       # Seconds to rise (or drop), and again to come back
+MOVE_PAUSE = 1 / 3      # Seconds held at the peak/bottom
+
+
+def format_time(seconds):
+    """Format a survival time as MM:SS:mmm, like the on-screen GameTimer"""
+    minutes = int(seconds // 60)
+    whole = int(seconds % 60)
+    milliseconds = int((seconds % 1) * 1000)
+    return f"{minutes:02d}:{whole:02d}:{milliseconds:03d}"
+
+
+class CubeMotion(StateStruct):
+    """Lane changes, jumps and crouches of the player's cube, one tick at a time"""
+
+    # Cube state (in one struct for snapshots); lanes, speeds and durations are ordinary attributes
+    _fields_ = [('current_lane', ctypes.c_int32), ('target_x', ctypes.c_double), ('cube_x', ctypes.c_double),
+                ('cube_y', ctypes.c_double), ('cube_distance', ctypes.c_double),
+                ('is_moving_side', ctypes.c_bool), ('is_jumping', ctypes.c_bool), ('is_crouching', ctypes.c_bool),
+                ('jump_timer', ctypes.c_int32), ('crouch_timer', ctypes.c_int32)]
+
+    def __init__(self, tick_rate=TICK_RATE, lanes=LANE_X):
+        # update_movement() runs once per simulation tick; speeds and durations below are per tick
+        # Define lanes (x positions for the cube)
+        self.lanes = list(lanes)
+        self.current_lane = len(self.lanes) // 2  # Start in the center lane
+
+        # Smooth lane switching variables
+        self.target_x = self.lanes[self.current_lane]
+        self.cube_x = self.lanes[self.current_lane]
+        self.is_moving_side = False
+        self.move_speed = LANE_SPEED / tick_rate  # 0.3 per tick at 60 ticks/s
+
+        # Jump and crouch state
+        self.is_jumping = False
+        self.is_crouching = False
+        self.jump_timer = 0
+        self.crouch_timer = 0
+
+        # Position variables
+        self.cube_y = CUBE_Y  # Start lower on the screen
+        self.cube_distance = CUBE_DISTANCE
+
+        # Jump/crouch: rise (or drop), hold, then come back
+        self.pause_duration = ticks_for(MOVE_PAUSE, tick_rate)  # Ticks to pause at peak/bottom
+        self.phase_ticks = ticks_for(MOVE_PHASE, tick_rate)
+        self.move_duration = 2 * self.phase_ticks + self.pause_duration
+        self.jump_step = JUMP_HEIGHT / self.phase_ticks
+        self.crouch_step = CROUCH_DEPTH / self.phase_ticks
+
+    def apply(self, action):
+        """Start the movement for one action (ignored if it isn't possible right now)"""
+        if action == ACTION_LEFT:  # Move to the left lane
+            if self.current_lane > 0:
+                self.current_lane -= 1
+                self.target_x = self.lanes[self.current_lane]
+                self.is_moving_side = True
+        elif action == ACTION_RIGHT:  # Move to the right lane
+            if self.current_lane < len(self.lanes) - 1:
+                self.current_lane += 1
+                self.target_x = self.lanes[self.current_lane]
+                self.is_moving_side = True
+        elif action == ACTION_JUMP:
+            if not self.is_jumping and not self.is_crouching:
+                self.is_jumping = True
+                self.jump_timer = self.move_duration
+        elif action == ACTION_CROUCH:
+            if not self.is_crouching and not self.is_jumping:
+                self.is_crouching = True
+                self.crouch_timer = self.move_duration
+
+    def update_movement(self):
+        """Update movement animations (jump, crouch, lane switching)"""
+        # Handle jump
+        if self.is_jumping:
+            down_frames = self.phase_ticks
+            # Up phase
+            if self.jump_timer > (down_frames + self.pause_duration):
+                self.cube_y += self.jump_step
+            # Pause phase
+            elif self.jump_timer > down_frames:
+                pass
+            # Down phase
+            elif self.jump_timer > 0:
+                self.cube_y -= self.jump_step
+            self.jump_timer -= 1
+            if self.jump_timer == 0:
+                self.is_jumping = False
+
+        # Handle crouch
+        if self.is_crouching:
+            up_frames = self.phase_ticks
+            # Down phase
+            if self.crouch_timer > (up_frames + self.pause_duration):
+                self.cube_y -= self.crouch_step
+            # Pause phase
+            elif self.crouch_timer > up_frames:
+                pass
+            # Up phase
+            elif self.crouch_timer > 0:
+                self.cube_y += self.crouch_step
+            self.crouch_timer -= 1
+            if self.crouch_timer == 0:
+                self.is_crouching = False
+
+        # Smooth side-to-side movement
+        if self.is_moving_side:
+            if abs(self.cube_x - self.target_x) < self.move_speed:
+                self.cube_x = self.target_x
+                self.is_moving_side = False
+            else:
+                direction = 1 if self.target_x > self.cube_x else -1
+                self.cube_x += direction * self.move_speed
+        else:
+            self.cube_x = self.target_x  # Ensure exact position when not moving
+
+    def get_cube_position(self):
+        """Return the current cube position"""
+        return self.cube_x, self.cube_y, self.cube_distance
+
+
+class Simulation:
+    """
+    One game, advanced one tick per step(action)
+
+    Same update order as the apps: cube input and movement, obstacles,
+    then (swept) collision. The obstacle stream follows the seed.
+    """
+
+    def __init__(self, seed=None, tick_rate=TICK_RATE, lanes=LANE_X, per_lane=1, continuous=True):
+        self.tick_rate = tick_rate
+        self.lanes = lanes
+        self.obstacles = SphereManager(lanes, per_lane, seed=seed, tick_rate=tick_rate)
+        self.collision = CollisionDetector(continuous=continuous)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start a new game (from `seed` if given)"""
+        self.obstacles.reset(seed)
+        self.cube = CubeMotion(self.tick_rate, self.lanes)
+        self.state = GameState(self.obstacles, self.cube)
+        self.hits = []
+        self.done = False
+
+    @property
+    def tick(self):
+        return self.obstacles.tick
+
+    def step(self, action=ACTION_NONE):
+        """
+        Advance one tick; returns the tick's hit events (the game is over if there are any)
+
+        `action` is one action, or a list of the tick's actions applied in
+        order (like the key presses the apps handle in one tick).
+        """
+        previous = self.cube.get_cube_position()
+        if isinstance(action, (list, tuple)):
+            for tick_action in action:
+                self.cube.apply(tick_action)
+        else:
+            self.cube.apply(action)
+        self.cube.update_movement()
+        self.obstacles.update_positions()
+        self.hits = self.collision.check(self.obstacles, self.cube.get_cube_position(), previous)
+        if self.hits:
+            self.done = True
+        return self.hits
+
+    def snapshot(self):
+        """Obstacle and cube state as bytes, for restore()"""
+        return self.state.snapshot()
+
+    def restore(self, data):
+        """Go back to a snapshot (e.g. to try other actions from the same point)"""
+        self.state.restore(data)
+        self.hits = []
+        self.done = False
+
+    def survival_time(self):
+        """Seconds survived - up to the moment of contact once the game is over"""
+        if self.hits:
+            return self.hits[0].time
+        return self.tick / self.tick_rate
+
+    def run(self, policy=None, max_ticks=TICK_RATE * 60):
+        """Play until a hit or max_ticks; policy(sim) returns each tick's action"""
+        while not self.done and self.tick < max_ticks:
+            self.step(policy(self) if policy is not None else ACTION_NONE)
+        return self.survival_time()
+
+
+class BatchSimulation:
+    """
+    `count` independent games stepped together as array operations
+
+    Cube and obstacle state are arrays with one row per game. Obstacles
+    follow the same rules as ObstacleSchedule (first spawns staggered per
+    lane, one trip plus a random wait between spawns, never a wall in
+    every lane), drawn from one generator for the whole batch, so a batch
+    is reproducible from its seed but game i doesn't replay
+    Simulation(seed=i). Finished games stay frozen at their time of
+    impact while the others continue.
+    """
+
+    def __init__(self, count, seed=None, tick_rate=TICK_RATE, lanes=LANE_X, per_lane=1, lane_radius=None):
+        self.count = count
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.lane_x = np.asarray(lanes, dtype=np.float64)
+        lane_count = len(self.lane_x)
+        if lane_radius is None:
+            lane_radius = LANE_RADIUS if lane_count == len(LANE_RADIUS) else [1.5] * lane_count
+        self.lane_count = lane_count
+        self.per_lane = per_lane
+
+        # Slot layout as in SphereManager: obstacle k of lane l at l * per_lane + k
+        self.slot_lane = np.repeat(np.arange(lane_count), per_lane)
+        self.slot_x = self.lane_x[self.slot_lane]
+        self.slot_radius = np.asarray(lane_radius, dtype=np.float64)[self.slot_lane]
+
+        self.speed = SPEED / tick_rate
+        cycle_ticks = int((RESET_Z - SPAWN_Z) / self.speed) + 1
+        self.interval = max(1, cycle_ticks // per_lane)
+        self.max_wait = ticks_for(MAX_RESET_WAIT, tick_rate)
+
+        # Movement constants shared with the single-game cube
+        self.motion = CubeMotion(tick_rate, lanes)
+        self.cube_half = np.asarray(CUBE_HALF_EXTENTS, dtype=np.float64)
+        self.wall_half = np.asarray(WALL_HALF_EXTENTS, dtype=np.float64)
+        self.reach_x = max(self.wall_half[0], self.slot_radius.max())
+        self.reach_z = max(self.wall_half[2], self.slot_radius.max())
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start every game over"""
+        n, lanes, slots = self.count, self.lane_count, len(self.slot_lane)
+        self.rng = np.random.default_rng(self.seed if seed is None else seed)
+        self.tick = 0
+        self.alive = np.ones(n, dtype=bool)
+        self.death_time = np.full(n, np.nan)
+
+        self.lane = np.full(n, self.motion.current_lane)
+        self.cube_x = self.lane_x[self.lane].copy()
+        self.target_x = self.cube_x.copy()
+        self.cube_y = np.full(n, float(self.motion.cube_y))
+        self.jump_timer = np.zeros(n, dtype=np.int32)
+        self.crouch_timer = np.zeros(n, dtype=np.int32)
+
+        self.z = np.full((n, slots), SPAWN_Z)
+        self.prev_z = self.z.copy()
+        self.y = np.zeros((n, slots))
+        self.is_wall = np.zeros((n, slots), dtype=bool)
+        self.active = np.zeros((n, slots), dtype=bool)
+        self.spawned = np.zeros((n, lanes), dtype=np.int64)
+        self.lane_wall = np.zeros((n, lanes), dtype=bool)
+
+        # Lanes start at different times: one at once, one after max_wait, one at random (shuffled per game)
+        first = np.tile(np.resize([0, self.max_wait, -1], lanes), (n, 1))
+        random_start = first < 0
+        first[random_start] = self.rng.integers(0, self.max_wait + 1, np.count_nonzero(random_start))
+        order = np.argsort(self.rng.random((n, lanes)), axis=1)
+        self.next_spawn = np.take_along_axis(first, order, axis=1).astype(np.int64)
+        self._spawn_due()
+
+    def _spawn_due(self):
+        games, lanes = np.nonzero(self.next_spawn == self.tick)
+        count = len(games)
+        if count == 0:
+            return
+        walls = self.rng.random(count) < 0.5
+        self.lane_wall[games, lanes] = walls
+        # Never a wall in every lane: the last lane spawning this tick becomes a sphere
+        blocked = self.lane_wall.all(axis=1)
+        if blocked.any():
+            last = np.zeros(self.count, dtype=np.int64)
+            last[games] = np.arange(count)  # Higher lanes come later in the nonzero order
+            flip = last[blocked]
+            walls[flip] = False
+            self.lane_wall[games[flip], lanes[flip]] = False
+
+        slots = lanes * self.per_lane + self.spawned[games, lanes] % self.per_lane
+        self.z[games, slots] = SPAWN_Z
+        self.prev_z[games, slots] = SPAWN_Z
+        self.is_wall[games, slots] = walls
+        self.y[games, slots] = np.where(walls, 0.0, self.rng.choice([0.0, -3.0], count))
+        self.active[games, slots] = True
+
+        self.spawned[games, lanes] += 1
+        gaps = self.interval + self.rng.integers(0, self.max_wait + 1, count)
+        # Obstacles sharing a lane start one interval apart
+        gaps[self.spawned[games, lanes] < self.per_lane] = self.interval
+        self.next_spawn[games, lanes] += gaps
+
+    def step(self, actions=ACTION_NONE):
+        """Advance every game one tick; returns the mask of games that ended this tick"""
+        actions = np.broadcast_to(np.asarray(actions), (self.count,))
+        motion = self.motion
+        previous_x = self.cube_x.copy()
+        previous_y = self.cube_y.copy()
+
+        # Actions (same rules as CubeMotion.apply)
+        self.lane -= (actions == ACTION_LEFT) & (self.lane > 0)
+        self.lane += (actions == ACTION_RIGHT) & (self.lane < self.lane_count - 1)
+        self.target_x = self.lane_x[self.lane]
+        idle = (self.jump_timer == 0) & (self.crouch_timer == 0)
+        self.jump_timer[(actions == ACTION_JUMP) & idle] = motion.move_duration
+        self.crouch_timer[(actions == ACTION_CROUCH) & idle] = motion.move_duration
+
+        # Movement (same phases as CubeMotion.update_movement)
+        hold = motion.phase_ticks + motion.pause_duration
+        jumping = self.jump_timer > 0
+        crouching = self.crouch_timer > 0
+        rising = (jumping & (self.jump_timer > hold)) | (crouching & (self.crouch_timer <= motion.phase_ticks))
+        falling = (jumping & (self.jump_timer <= motion.phase_ticks)) | (crouching & (self.crouch_timer > hold))
+        step = np.where(jumping, motion.jump_step, motion.crouch_step)
+        self.cube_y += step * rising - step * falling
+        self.jump_timer -= jumping
+        self.crouch_timer -= crouching
+        offset = self.target_x - self.cube_x
+        self.cube_x = np.where(np.abs(offset) < motion.move_speed, self.target_x,
+                               self.cube_x + np.sign(offset) * motion.move_speed)
+
+        # Obstacles
+        self.prev_z[:] = self.z
+        np.add(self.z, self.speed, out=self.z, where=self.active)
+        self.tick += 1
+        self._spawn_due()
+
+        return self._collide(previous_x, previous_y)
+
+    def _collide(self, previous_x, previous_y):
+        """Swept cube/obstacle contacts for the games still running"""
+        cz = CUBE_DISTANCE
+        hx, hy, hz = self.cube_half
+        low_x = np.minimum(previous_x, self.cube_x)[:, None] - hx
+        high_x = np.maximum(previous_x, self.cube_x)[:, None] + hx
+        near = (self.alive[:, None] & self.active &
+                (self.z + self.reach_z > cz - hz) & (self.prev_z - self.reach_z < cz + hz) &
+                (self.slot_x + self.reach_x > low_x) & (self.slot_x - self.reach_x < high_x))
+        games, slots = np.nonzero(near)
+        ended = np.zeros(self.count, dtype=bool)
+        if len(games) == 0:
+            return ended
+
+        # Obstacle relative to the cube at the start of the tick, and its change over the tick
+        offset = np.stack([self.slot_x[slots] - previous_x[games],
+                           self.y[games, slots] - previous_y[games],
+                           self.prev_z[games, slots] - cz], axis=1)
+        velocity = np.stack([previous_x[games] - self.cube_x[games],
+                             previous_y[games] - self.cube_y[games],
+                             self.z[games, slots] - self.prev_z[games, slots]], axis=1)
+        fraction = np.full(len(games), np.nan)
+        walls = self.is_wall[games, slots]
+        if walls.any():
+            enter, exit = swept_aabb_batch(offset[walls], velocity[walls], self.cube_half + self.wall_half)
+            fraction[walls] = np.where(enter < exit, enter, np.nan)
+        spheres = ~walls
+        if spheres.any():
+            fraction[spheres] = swept_aabb_sphere_batch(offset[spheres], velocity[spheres], self.cube_half,
+                                                        self.slot_radius[slots[spheres]])
+
+        hit = ~np.isnan(fraction)
+        first = np.full(self.count, np.inf)
+        np.minimum.at(first, games[hit], fraction[hit])
+        ended = np.isfinite(first)
+        self.death_time[ended] = (self.tick - 1 + first[ended]) / self.tick_rate
+        self.alive &= ~ended
+        return ended
+
+    def survival_times(self):
+        """Seconds survived by each game (so far, for games still running)"""
+        return np.where(self.alive, self.tick / self.tick_rate, self.death_time)
+
+    def run(self, policy=None, max_ticks=TICK_RATE * 60):
+        """Step until every game has ended or max_ticks; policy(sim) returns an action array per tick"""
+        while self.alive.any() and self.tick < max_ticks:
+            self.step(policy(self) if policy is not None else ACTION_NONE)
+        return self.survival_times()
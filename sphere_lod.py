@@ -0,0 +1,83 @@
+import math
+
+
+class SphereLOD:
+    """
+    Distance-based level of detail for spheres
+
+    Each tier is (max_distance, slices, stacks); the first tier whose max
+    distance covers the object is used. Objects remember their tier (by key)
+    and only switch once they are `hysteresis` units past a tier boundary,
+    so spheres sitting on a boundary do not pop back and forth.
+    """
+
+    DEFAULT_TIERS = [
+        (20.0, 16, 12),         # Near - same tessellation as draw_textured_sphere
+        (35.0, 12, 8),          # Mid
+        (float('inf'), 8, 6)    # Far (spawn point is 50 units away)
+    ]
+
+    # Debug tint per tier: green = near, yellow = mid, red = far
+    TIER_DEBUG_COLORS = [(0.2, 1.0, 0.2), (1.0, 1.0, 0.2), (1.0, 0.2, 0.2)]
+
+    def __init__(self, tiers=None, hysteresis=2.0):
+        self.tiers = list(tiers) if tiers else list(self.DEFAULT_TIERS)
+        self.hysteresis = hysteresis
+        self.show_tiers = False     # Debug toggle: tint spheres by active tier
+        self.current_tiers = {}     # key -> tier index last used for that object
+        self.tier_counts = [0] * len(self.tiers)
+
+    def toggle_debug(self):
+        """Toggle tier visualization"""
+        self.show_tiers = not self.show_tiers
+        print(f"Sphere LOD debug: {'ON' if self.show_tiers else 'OFF'}")
+        return self.show_tiers
+
+    def _raw_tier(self, distance):
+        for i, (max_distance, _, _) in enumerate(self.tiers):
+            if distance <= max_distance:
+                return i
+        return len(self.tiers) - 1
+
+    def _tier_bounds(self, tier):
+        lower = self.tiers[tier - 1][0] if tier > 0 else 0.0
+        return lower, self.tiers[tier][0]
+
+    def select_tier(self, distance, key=None):
+        """Pick a tier index for an object at `distance` (key enables hysteresis)"""
+        tier = self._raw_tier(distance)
+        if key is not None:
+            previous = self.current_tiers.get(key)
+            if previous is not None and previous != tier:
+                lower, upper = self._tier_bounds(previous)
+                # Stay in the previous tier while inside its band widened by the hysteresis
+                if lower - self.hysteresis <= distance <= upper + self.hysteresis:
+                    tier = previous
+            self.current_tiers[key] = tier
+        self.tier_counts[tier] += 1
+        return tier
+
+    def select(self, x, y, z, key=None):
+        """Pick a tier for an object at (x, y, z); the camera sits at the origin"""
+        return self.select_tier(math.sqrt(x * x + y * y + z * z), key)
+
+    def get_detail(self, x, y, z, key=None):
+        """Return (slices, stacks) for an object at (x, y, z)"""
+        _, slices, stacks = self.tiers[self.select(x, y, z, key)]
+        return slices, stacks
+
+    def debug_color(self, tier):
+        """Tint color used when tier visualization is on"""
+        return self.TIER_DEBUG_COLORS[min(tier, len(self.TIER_DEBUG_COLORS) - 1)]
+
+    def reset_frame_stats(self):
+        """Clear per-frame tier usage counts"""
+        self.tier_counts = [0] * len(self.tiers)
+
+    def get_stats(self):
+        """Get per-tier usage for the current frame"""
+        return {
+            'tier_counts': list(self.tier_counts),
+            'tracked_objects': len(self.current_tiers),
+            'show_tiers': self.show_tiers
+        }
@@ -1,108 +1,189 @@
-import random
+import numpy as np
+from fixed_timestep import TICK_RATE
+from obstacle_schedule import ObstacleSchedule, KIND_WALL
+from collision import LaneQueues
+from game_state import StateArrays
+
+# Default track: three lanes, the middle sphere slightly smaller
+LANE_X = (-4.0, 0.0, 4.0)
+LANE_RADIUS = (1.5, 1.2, 1.5)
+
+SPAWN_Z = -50.0         # Obstacles appear here
+RESET_Z = -1.0          # An obstacle must pass this point before its slot is reused
+SPEED = 30.0            # Units per second (0.5 per tick at 60 ticks/s)
+MAX_RESET_WAIT = 1.0    # Seconds an obstacle can linger past the cube before respawning
+WALL_HEIGHT = 3.0
+
+
+def _occurrence(lanes):
+    """How many earlier entries of `lanes` have the same lane (0 for the first in each lane)"""
+    if len(lanes) < 2:
+        return np.zeros(len(lanes), dtype=np.int64)
+    order = np.argsort(lanes, kind='stable')
+    ordered = lanes[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    counts = np.diff(np.r_[starts, len(lanes)])
+    occurrence = np.empty(len(lanes), dtype=np.int64)
+    occurrence[order] = np.arange(len(lanes)) - np.repeat(starts, counts)
+    return occurrence
+
 
 class SphereManager:
-    def __init__(self):
-        # Initial z positions for the spheres
-        self.left_sphere_z = -50.0
-        self.middle_sphere_z = -50.0
-        self.right_sphere_z = -50.0
-        # Track if each object is a wall
-        self.left_is_wall = random.choice([True, False])
-        self.middle_is_wall = random.choice([True, False])
-        self.right_is_wall = random.choice([True, False])
-        # Wait counters for each object (only used for initial movement)
-        wait_options = [0, 60, random.randint(0, 60)]
-        random.shuffle(wait_options)
-        self.left_wait = wait_options[0]
-        self.middle_wait = wait_options[1]
-        self.right_wait = wait_options[2]
-        # Wait before reset counters (used only when object reaches reset point)
-        self.left_wait_before_reset = 0
-        self.middle_wait_before_reset = 0
-        self.right_wait_before_reset = 0
-        # Initial y positions for the spheres
-        self.left_sphere_y = 0.0 if self.left_is_wall else random.choice([0.0, -3.0])
-        self.middle_sphere_y = 0.0 if self.middle_is_wall else random.choice([0.0, -3.0])
-        self.right_sphere_y = 0.0 if self.right_is_wall else random.choice([0.0, -3.0])
-        # Initial random colors for spheres and walls
-        self.left_color = self.random_color()
-        self.middle_color = self.random_color()
-        self.right_color = self.random_color()
-        self.left_wall_color = self.random_color()
-        self.middle_wall_color = self.random_color()
-        self.right_wall_color = self.random_color()
-
-    def random_color(self):
-        return (random.random(), random.random(), random.random())
+    """
+    Pool of obstacles (spheres and walls) stored as parallel NumPy arrays
+
+    Slot i is obstacle i: lane[i], z[i], y[i], is_wall[i], color[i] and
+    active[i]. Obstacles come from an ObstacleSchedule: each tick the ones
+    due are placed at the far end, reusing the oldest slot of their lane,
+    and every active obstacle moves forward. Updates work on whole arrays,
+    so the per-tick cost hardly grows with the number of lanes or obstacles
+    per lane.
+
+    update_positions() advances one simulation tick; prev_z keeps the
+    positions from before it so frames can be drawn between two ticks.
+    Pass a seed (or a schedule) for a reproducible obstacle stream.
+    The arrays that change share one buffer, so snapshot()/restore() are
+    a single copy.
+    """
+
+    def __init__(self, lanes=LANE_X, per_lane=1, lane_radius=None, seed=None, tick_rate=TICK_RATE,
+                 schedule=None):
+        self.lane_x = np.asarray(lanes, dtype=np.float32)
+        if lane_radius is None:
+            lane_radius = LANE_RADIUS if len(lanes) == len(LANE_RADIUS) else [1.5] * len(lanes)
+        self.lane_radius = np.asarray(lane_radius, dtype=np.float32)
+        self.lane_count = len(self.lane_x)
+        self.per_lane = per_lane
+        self.tick_rate = tick_rate
+        self.speed = SPEED / tick_rate
+        if schedule is None:
+            # Ticks from the spawn point until an obstacle is past the reset point
+            cycle_ticks = int((RESET_Z - SPAWN_Z) / self.speed) + 1
+            schedule = ObstacleSchedule(self.lane_count, per_lane, cycle_ticks, MAX_RESET_WAIT, seed, tick_rate)
+        self.schedule = schedule
+
+        # Slot layout: obstacle k of lane l lives at l * per_lane + k
+        count = self.lane_count * per_lane
+        self.lane = np.repeat(np.arange(self.lane_count), per_lane)
+        self.x = self.lane_x[self.lane]
+        self.radius = self.lane_radius[self.lane]
+        # Everything that changes during a round shares one buffer (see snapshot/restore)
+        self.state = StateArrays([('tick', np.int64), ('z', np.float32, count), ('prev_z', np.float32, count),
+                                  ('y', np.float32, count), ('color', np.float32, (count, 3)),
+                                  ('is_wall', bool, count), ('active', bool, count),
+                                  ('spawned', np.int64, self.lane_count)])  # Obstacles spawned per lane so far
+        self._tick = self.state.array['tick']
+        self.z = self.state['z']
+        self.prev_z = self.state['prev_z']
+        self.y = self.state['y']
+        self.color = self.state['color']
+        self.is_wall = self.state['is_wall']
+        self.active = self.state['active']
+        self.spawned = self.state['spawned']
+        # Slots of each lane in z order, for the collision broad phase (see lane_queues)
+        self.queues = LaneQueues(self.lane_count, count)
+        self.queues_stale = False
+        self.reset()
+
+    def __len__(self):
+        return len(self.z)
+
+    @property
+    def tick(self):
+        return int(self._tick[0])
+
+    @tick.setter
+    def tick(self, value):
+        self._tick[0] = value
+
+    def snapshot(self):
+        """Obstacle state as bytes (one copy of the state buffer)"""
+        return self.state.snapshot()
+
+    def restore(self, data):
+        """Return to a snapshot (the schedule and lane queues catch up when next used)"""
+        self.state.restore(data)
+        self.queues_stale = True
+
+    def lane_queues(self):
+        """LaneQueues matching the arrays - rebuilt after a restore"""
+        if self.queues_stale:
+            # Active obstacles of each lane, nearest the player first
+            self.queues.clear()
+            slots = np.flatnonzero(self.active)
+            slots = slots[np.lexsort((-self.z[slots], self.lane[slots]))]
+            self.queues.push(slots, self.lane[slots])
+            self.queues_stale = False
+        return self.queues
+
+    def reset(self, seed=None):
+        """Start a new round: no obstacles, schedule back at tick 0 (reuses this object between rounds)"""
+        self.tick = 0
+        self.active[:] = False
+        self.z[:] = SPAWN_Z
+        self.prev_z[:] = SPAWN_Z
+        self.spawned[:] = 0
+        self.queues.clear()
+        self.queues_stale = False
+        self.schedule.reset(seed)
+        self.spawn_due()
+
+    def spawn_due(self):
+        """Place the obstacles scheduled up to the current tick at the far end"""
+        lanes, kinds, y, color = self.schedule.take(self.tick)
+        if len(lanes) == 0:
+            return
+        # Each lane recycles its oldest slot; a lane spawning several obstacles at once takes the next ones too
+        indices = lanes * self.per_lane + (self.spawned[lanes] + _occurrence(lanes)) % self.per_lane
+        np.add.at(self.spawned, lanes, 1)
+
+        self.z[indices] = SPAWN_Z
+        self.prev_z[indices] = SPAWN_Z  # Don't interpolate across a respawn
+        self.is_wall[indices] = kinds == KIND_WALL
+        self.y[indices] = y
+        self.color[indices] = color
+        self.active[indices] = True
+        if not self.queues_stale:
+            self.queues.push(indices, lanes)
 
     def update_positions(self):
-        # Only wait before moving right after the game starts
-        if self.left_wait > 0:
-            self.left_wait -= 1
-        else:
-            self.left_sphere_z += 0.5
-        if self.middle_wait > 0:
-            self.middle_wait -= 1
-        else:
-            self.middle_sphere_z += 0.5
-        if self.right_wait > 0:
-            self.right_wait -= 1
-        else:
-            self.right_sphere_z += 0.5
-        self.reset_if_needed()
-
-    def reset_if_needed(self):
-        # Always wait before resetting an object
-        if self.left_sphere_z > -1.0:
-            if self.left_wait_before_reset > 0:
-                self.left_wait_before_reset -= 1
-            else:
-                self.left_sphere_z = -50.0
-                self.left_is_wall = random.choice([True, False])
-                if self.left_is_wall and self.middle_is_wall and self.right_is_wall:
-                    self.left_is_wall = False
-                self.left_sphere_y = 0.0 if self.left_is_wall else random.choice([0.0, -3.0])
-                self.left_wait_before_reset = random.randint(0, 60)
-                self.left_color = self.random_color()
-                self.left_wall_color = self.random_color()
-        if self.middle_sphere_z > -1.0:
-            if self.middle_wait_before_reset > 0:
-                self.middle_wait_before_reset -= 1
+        """Advance every obstacle by one simulation tick"""
+        self.prev_z[:] = self.z
+        np.add(self.z, self.speed, out=self.z, where=self.active)
+        self._tick[0] += 1
+        self.spawn_due()
+
+    def time_of(self, fraction):
+        """Seconds since the round started at `fraction` of the way through the last tick"""
+        return (self.tick - 1 + fraction) / self.tick_rate
+
+    def interpolated_z(self, alpha=1.0):
+        """Obstacle z between the previous tick (alpha=0) and the current one (alpha=1)"""
+        if alpha >= 1.0:
+            return self.z
+        return self.prev_z + (self.z - self.prev_z) * alpha
+
+    def draw_objects(self, shapes, rotation_angle, alpha=1.0):
+        for x, y, z, is_wall, color, radius in self.lane_objects(alpha):
+            if is_wall:
+                shapes.draw_wall(x, y, z, rotation_angle, height=WALL_HEIGHT, color=color)
             else:
-                self.middle_sphere_z = -50.0
-                self.middle_is_wall = random.choice([True, False])
-                if self.middle_is_wall and self.left_is_wall and self.right_is_wall:
-                    self.middle_is_wall = False
-                self.middle_sphere_y = 0.0 if self.middle_is_wall else random.choice([0.0, -3.0])
-                self.middle_wait_before_reset = random.randint(0, 60)
-                self.middle_color = self.random_color()
-                self.middle_wall_color = self.random_color()
-        if self.right_sphere_z > -1.0:
-            if self.right_wait_before_reset > 0:
-                self.right_wait_before_reset -= 1
+                shapes.draw_textured_sphere(x, y, z, radius=radius, color=color, rotation_angle=rotation_angle)
+
+    def lane_objects(self, alpha=1.0):
+        """Return (x, y, z, is_wall, color, radius) for every active obstacle (z interpolated by alpha)"""
+        active = self.active
+        return list(zip(self.x[active].tolist(), self.y[active].tolist(), self.interpolated_z(alpha)[active].tolist(),
+                        self.is_wall[active].tolist(), [tuple(color) for color in self.color[active].tolist()],
+                        self.radius[active].tolist()))
+
+    def draw_objects_batched(self, renderer, rotation_angle, alpha=1.0):
+        """Draw all objects through an ObstacleBatchRenderer (one draw call per mesh type)"""
+        renderer.begin()
+        slots = np.flatnonzero(self.active).tolist()
+        for slot, (x, y, z, is_wall, color, radius) in zip(slots, self.lane_objects(alpha)):
+            if is_wall:
+                renderer.add_wall(x, y, z, height=WALL_HEIGHT, color=color)
             else:
-                self.right_sphere_z = -50.0
-                self.right_is_wall = random.choice([True, False])
-                if self.right_is_wall and self.left_is_wall and self.middle_is_wall:
-                    self.right_is_wall = False
-                self.right_sphere_y = 0.0 if self.right_is_wall else random.choice([0.0, -3.0])
-                self.right_wait_before_reset = random.randint(0, 60)
-                self.right_color = self.random_color()
-                self.right_wall_color = self.random_color()
-
-    def draw_objects(self, shapes, rotation_angle):
-        # Draw left object
-        if self.left_is_wall:
-            shapes.draw_wall(-4.0, self.left_sphere_y, self.left_sphere_z, rotation_angle, height=3.0, color=self.left_wall_color)
-        else:
-            shapes.draw_textured_sphere(-4.0, self.left_sphere_y, self.left_sphere_z, radius=1.5, color=self.left_color, rotation_angle=rotation_angle)
-        # Draw middle object
-        if self.middle_is_wall:
-            shapes.draw_wall(0.0, self.middle_sphere_y, self.middle_sphere_z, rotation_angle, height=3.0, color=self.middle_wall_color)
-        else:
-            shapes.draw_textured_sphere(0.0, self.middle_sphere_y, self.middle_sphere_z, radius=1.2, color=self.middle_color, rotation_angle=rotation_angle)
-        # Draw right object
-        if self.right_is_wall:
-            shapes.draw_wall(4.0, self.right_sphere_y, self.right_sphere_z, rotation_angle, height=3.0, color=self.right_wall_color)
-        else:
-            shapes.draw_textured_sphere(4.0, self.right_sphere_y, self.right_sphere_z, radius=1.5, color=self.right_color, rotation_angle=rotation_angle)
+                renderer.add_sphere(x, y, z, radius=radius, color=color, lod_key=slot)
+        renderer.flush(rotation_angle)
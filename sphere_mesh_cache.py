@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from mesh import Mesh
+
+
+@lru_cache(maxsize=64)
+def build_sphere_geometry(radius, slices, stacks):
+    """
+    Build sphere geometry as NumPy arrays (same latitude bands as the old quad strips)
+
+    Returns:
+    - vertices: float32 array (N, 3)
+    - indices: uint32 array of triangle indices
+    - shade: float32 array (N,) with the per-band gradient factor (0.5 at the bottom to ~1.0 at the top)
+    """
+    # Latitude of every band edge and longitude of every slice edge
+    lat = np.pi * (-0.5 + np.arange(stacks + 1, dtype=np.float64) / stacks)
+    lng = 2.0 * np.pi * np.arange(slices + 1, dtype=np.float64) / slices
+
+    # Each band owns its two rows of vertices so it can carry its own flat color
+    band = np.arange(stacks)
+    rows = band[:, None] + np.arange(2)[None, :]          # (stacks, 2) latitude index per row
+    ring_z = radius * np.sin(lat)[rows]                   # (stacks, 2)
+    ring_r = radius * np.cos(lat)[rows]                   # (stacks, 2)
+
+    vertices = np.empty((stacks, 2, slices + 1, 3), dtype=np.float32)
+    vertices[..., 0] = ring_r[..., None] * np.cos(lng)
+    vertices[..., 1] = ring_r[..., None] * np.sin(lng)
+    vertices[..., 2] = ring_z[..., None]
+    vertices = vertices.reshape(-1, 3)
+
+    # Two triangles per quad: (row0 j, row1 j, row0 j+1) and (row0 j+1, row1 j, row1 j+1)
+    row_len = slices + 1
+    base = (band * 2 * row_len)[:, None]
+    j = np.arange(slices)[None, :]
+    bottom = base + j
+    top = bottom + row_len
+    indices = np.stack([bottom, top, bottom + 1, bottom + 1, top, top + 1], axis=-1)
+    indices = indices.reshape(-1).astype(np.uint32)
+
+    # Gradient factor per band, repeated for every vertex of the band
+    shade = np.repeat(0.5 + 0.5 * band / float(stacks), 2 * row_len).astype(np.float32)
+
+    return vertices, indices, shade
+
+
+class SphereMeshCache:
+    """
+    LRU cache of sphere meshes keyed by (radius, slices, stacks, gradient color)
+
+    Meshes keep their NumPy arrays, so they re-upload themselves after the
+    OpenGL context is recreated and can be shared by every Shapes instance.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.meshes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, radius, slices, stacks, gradient_color=None):
+        """Return the cached mesh for these parameters, building it on first use"""
+        if gradient_color is not None:
+            gradient_color = tuple(round(float(c), 4) for c in gradient_color)
+        key = (round(float(radius), 4), int(slices), int(stacks), gradient_color)
+
+        mesh = self.meshes.get(key)
+        if mesh is not None:
+            self.meshes.move_to_end(key)
+            self.hits += 1
+            return mesh
+
+        self.misses += 1
+        vertices, indices, shade = build_sphere_geometry(key[0], key[1], key[2])
+        colors = None
+        if gradient_color is not None:
+            colors = shade[:, None] * np.asarray(gradient_color, dtype=np.float32)
+        mesh = Mesh(vertices, indices, colors)
+
+        self.meshes[key] = mesh
+        # Evict the least recently used meshes once we are over budget
+        while len(self.meshes) > self.max_entries:
+            _, evicted = self.meshes.popitem(last=False)
+            evicted.release()
+        return mesh
+
+    def clear(self):
+        """Drop every cached mesh and free its GPU objects"""
+        for mesh in self.meshes.values():
+            mesh.release()
+        self.meshes.clear()
+
+    def get_stats(self):
+        """Get cache statistics for debugging"""
+        return {
+            'entries': len(self.meshes),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -1,5 +1,6 @@
 import pygame as pg
 from button import Button
+from font_cache import get_font, render_text
 
 class StartScreen:
     def __init__(self, screen_size):
@@ -8,31 +9,45 @@ class StartScreen:
         self.active = True  # Start screen active flag
         self.final_time = None
         self.leaderboard_entries = []  # Add this to hold leaderboard data
+        
+        # Shared fonts instead of new ones on every draw
+        self.leaderboard_font = get_font(None, 36)
+        self.game_over_font = get_font(None, 64)
+        self.final_time_font = get_font(None, 48)
+        # What the screen currently shows; draw() is a no-op while it is unchanged
+        self.drawn_state = None
+
+    def invalidate(self):
+        """Redraw on the next draw (e.g. after pg.display.set_mode)"""
+        self.drawn_state = None
 
     def set_leaderboard(self, entries):
         """Set leaderboard entries to display on start screen."""
         self.leaderboard_entries = entries
 
     def draw(self, surface, show_leaderboard=False, leaderboard=None):
+        """Draw the screen if it changed; returns the redrawn rectangles for the caller to present"""
+        state = (show_leaderboard, repr(leaderboard), self.final_time)
+        if state == self.drawn_state:
+            return []
+        self.drawn_state = state
         surface.fill((255, 210, 241))  # Purple background
         self.button.draw(surface)
         # Draw leaderboard if toggled
         if show_leaderboard and leaderboard:
-            font = pg.font.Font(None, 36)
+            font = self.leaderboard_font
             y_offset = 60
-            surface.blit(font.render("Leaderboard:", True, (80, 0, 80)), (self.width // 2 - 100, y_offset))
+            surface.blit(render_text(font, "Leaderboard:", (80, 0, 80)), (self.width // 2 - 100, y_offset))
             for i, entry in enumerate(leaderboard):
                 score_text = f"{i+1}. {entry['name']}: {entry['score']:.2f} seconds"
-                surface.blit(font.render(score_text, True, (0, 0, 0)), (self.width // 2 - 100, y_offset + 30 + i * 28))
+                surface.blit(render_text(font, score_text, (0, 0, 0)), (self.width // 2 - 100, y_offset + 30 + i * 28))
         # Draw game over and final time if available
         if self.final_time:
-            font = pg.font.Font(None, 64)
-            game_over_surface = font.render("Game Over", True, (255, 80, 80))
+            game_over_surface = render_text(self.game_over_font, "Game Over", (255, 80, 80))
             surface.blit(game_over_surface, (self.width // 2 - game_over_surface.get_width() // 2, self.height // 2 - 120))
-            font_small = pg.font.Font(None, 48)
-            time_surface = font_small.render(f"Final Time: {self.final_time}", True, (255, 255, 255))
+            time_surface = render_text(self.final_time_font, f"Final Time: {self.final_time}", (255, 255, 255))
             surface.blit(time_surface, (self.width // 2 - time_surface.get_width() // 2, self.height // 2 + 60))
-        pg.display.flip()
+        return [surface.get_rect()]
 
     def set_final_time(self, time_str):
         self.final_time = time_str
@@ -44,4 +59,4 @@ class StartScreen:
             if self.button.is_clicked(event):
                 self.active = False
                 return "START"
-        return None
\ No newline at end of file
+        return None
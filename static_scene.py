@@ -0,0 +1,75 @@
+from frustum import Frustum
+from lane_markers import LaneMarkers
+from mesh import Mesh
+from renderer import GeometryRecorder, get_renderer, use_renderer
+from shapes import Shapes
+
+
+class StaticScene:
+    """
+    Bakes the geometry that never changes during a round into merged meshes
+
+    Covers the ground lane strips, the boundary walls and the textured
+    background quad. The draw calls are recorded once into one mesh per
+    texture (so a single draw for the lanes and walls, one for the
+    background) and re-baked only when the lane configuration, the
+    background texture or the OpenGL context changes.
+    """
+
+    def __init__(self, background_texture=None, frustum=None):
+        self.background_texture = background_texture
+        # Used once at bake time to clamp the 10000-unit strips to the far plane
+        self.frustum = frustum if frustum is not None else Frustum()
+
+        self.meshes = []  # (Mesh, texture id or None)
+        self.baked_signature = None
+        self.generation = None
+        self.bake_count = 0
+
+    def signature(self):
+        """Everything the baked geometry depends on"""
+        return (LaneMarkers.config_signature(), self.background_texture)
+
+    def set_background_texture(self, texture_id):
+        """Change the background texture (re-bakes on next draw)"""
+        self.background_texture = texture_id
+
+    def invalidate(self):
+        """Force a re-bake on the next draw"""
+        self.baked_signature = None
+
+    def is_valid(self):
+        """True if the baked meshes can be reused as-is"""
+        return (self.generation == Mesh.context_generation
+                and self.baked_signature == self.signature())
+
+    def bake(self):
+        """Record all static geometry and merge it into one mesh per texture"""
+        self.release()
+
+        with use_renderer(GeometryRecorder()) as recorder:
+            if self.background_texture is not None:
+                Shapes.draw_background_surface(self.background_texture)
+            LaneMarkers.draw_ground_lanes(self.frustum)
+            LaneMarkers.draw_lane_boundary_walls(self.frustum)
+        self.meshes = recorder.build_meshes()
+
+        self.baked_signature = self.signature()
+        self.generation = Mesh.context_generation
+        self.bake_count += 1
+        print(f"Static scene baked ({self.bake_count})")
+
+    def draw(self):
+        """Draw the static layer, re-baking first if anything changed"""
+        if not self.is_valid():
+            self.bake()
+        renderer = get_renderer()
+        for mesh, texture in self.meshes:
+            renderer.draw_mesh(mesh, texture=texture)
+
+    def release(self):
+        """Free the baked meshes"""
+        for mesh, _ in self.meshes:
+            mesh.release()
+        self.meshes = []
+        self.baked_signature = None
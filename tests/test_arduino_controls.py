@@ -0,0 +1,129 @@
+import pytest
+from arduino_controls import (ArduinoControls, SensorStreamParser, crc8, encode_packet, PACKET_SIZE,
+                              BINARY_MODE_COMMAND, MODE_RETRY_SECONDS, MODE_RETRIES)
+
+
+def feed_in_pieces(parser, data, size):
+    updates = []
+    for start in range(0, len(data), size):
+        updates += parser.feed(data[start:start + size])
+    return updates
+
+
+def test_crc8_check_value():
+    assert crc8(b"123456789") == 0xF4
+
+
+def test_text_lines():
+    parser = SensorStreamParser()
+    updates = parser.feed(b"X:-3\r\nY:5\nButton pressed\nButton not pressed\nDistance:23.45\nhello\n")
+    assert updates == [{'joystick_x': -3}, {'joystick_y': 5}, {'joystick_button': True},
+                       {'joystick_button': False}, {'ultrasonic_distance': 23.45}, {'unknown': 'hello'}]
+
+
+def test_packet_fields():
+    parser = SensorStreamParser()
+    [update] = parser.feed(encode_packet(7, 123456, -128, 127, True, 400.0))
+    assert update == {'joystick_x': -128, 'joystick_y': 127, 'joystick_button': True,
+                      'ultrasonic_distance': 400.0, 'sequence': 7, 'device_time': 123456}
+
+
+@pytest.mark.parametrize('size', [1, 3, PACKET_SIZE - 1, 1000])
+def test_packets_split_across_reads(size):
+    data = b"".join(encode_packet(i, 50 * i, i - 10, 0, False, 10 + i) for i in range(20))
+    parser = SensorStreamParser()
+    updates = feed_in_pieces(parser, data, size)
+    assert [u['sequence'] for u in updates] == list(range(20))
+    assert parser.get_stats() == {'packets': 20, 'lines': 0, 'crc_errors': 0, 'dropped_packets': 0}
+    assert not parser.buffer
+
+
+def test_corrupted_packet_is_skipped_and_parser_resyncs():
+    corrupted = bytearray(encode_packet(1, 50, 0, 0, False, 12.5))
+    corrupted[4] ^= 0x10
+    data = encode_packet(0, 0, 1, 0, False, 12.0) + bytes(corrupted) + encode_packet(2, 100, 3, 0, False, 13.0)
+    parser = SensorStreamParser()
+    updates = feed_in_pieces(parser, data, 5)
+    assert [u['sequence'] for u in updates] == [0, 2]
+    assert parser.crc_errors >= 1
+    assert parser.dropped == 1
+
+
+def test_sequence_gaps_wrap_around():
+    parser = SensorStreamParser()
+    parser.feed(encode_packet(254, 0, 0, 0, False, 1.0) + encode_packet(255, 0, 0, 0, False, 1.0))
+    parser.feed(encode_packet(2, 0, 0, 0, False, 1.0))  # 0 and 1 missing
+    assert parser.dropped == 2
+
+
+def test_switch_from_text_to_binary_mid_line():
+    data = b"MODE BIN OK\nX:4\nDistance:3" + encode_packet(0, 0, 9, 0, False, 8.0)
+    parser = SensorStreamParser()
+    updates = feed_in_pieces(parser, data, 4)
+    # The cut-off "Distance:3" is dropped, the packet that interrupted it is kept
+    assert updates[:2] == [{'mode': 'binary'}, {'joystick_x': 4}]
+    assert len(updates) == 3 and updates[2]['joystick_x'] == 9
+
+
+def test_noise_without_line_breaks_is_bounded():
+    parser = SensorStreamParser()
+    parser.feed(b"x" * 10000)
+    assert len(parser.buffer) <= SensorStreamParser.MAX_LINE
+    assert parser.feed(b"\nX:1\n") == [{'joystick_x': 1}]
+
+
+class FakePort:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+def controls_with_port():
+    controls = ArduinoControls(None)
+    controls.serial_port = FakePort()
+    return controls
+
+
+def test_acknowledgement_switches_mode_and_stops_retries():
+    controls = controls_with_port()
+    controls.request_binary_mode(now=0.0)
+    controls.apply_updates(controls.parser.feed(b"MODE BIN OK\n"))
+    assert controls.binary_active
+    controls.check_mode_request(now=10.0)
+    assert controls.serial_port.written == [BINARY_MODE_COMMAND]
+
+    controls.apply_updates(controls.parser.feed(b"MODE TEXT OK\n"))
+    assert not controls.binary_active
+
+
+def test_unanswered_request_is_resent_then_abandoned():
+    controls = controls_with_port()
+    controls.request_binary_mode(now=0.0)
+    controls.check_mode_request(now=MODE_RETRY_SECONDS / 2)
+    assert len(controls.serial_port.written) == 1
+    now = 0.0
+    for _ in range(MODE_RETRIES + 2):
+        now += MODE_RETRY_SECONDS
+        controls.check_mode_request(now)
+    assert controls.serial_port.written == [BINARY_MODE_COMMAND] * MODE_RETRIES
+    assert controls.mode_requested_at is None and not controls.binary_active
+
+
+def test_packets_confirm_binary_mode_without_acknowledgement():
+    controls = controls_with_port()
+    controls.request_binary_mode(now=0.0)
+    controls.apply_updates(controls.parser.feed(encode_packet(0, 0, -20, 0, False, 30.0)))
+    assert controls.binary_active
+    assert controls.sensor_values == (-20, 30.0)
+    controls.check_mode_request(now=5.0)
+    assert len(controls.serial_port.written) == 1
+
+
+def test_board_restart_requests_binary_mode_again():
+    controls = controls_with_port()
+    controls.request_binary_mode(now=0.0)
+    controls.apply_updates(controls.parser.feed(b"MODE BIN OK\nGame Controller Ready!\n"))
+    assert not controls.binary_active
+    assert controls.serial_port.written == [BINARY_MODE_COMMAND] * 2
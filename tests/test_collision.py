@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from collision import (CollisionDetector, swept_aabb, swept_aabb_sphere, swept_aabb_batch,
+                       swept_aabb_sphere_batch, CUBE_HALF_EXTENTS)
+from sphere_manager import SphereManager
+
+UNIT = (1.0, 1.0, 1.0)
+ORIGIN = (0.0, 0.0, 0.0)
+
+
+def test_swept_aabb_entry_and_exit():
+    enter, exit = swept_aabb(ORIGIN, ORIGIN, UNIT, (0.0, 0.0, -10.0), (0.0, 0.0, 10.0), UNIT)
+    assert enter == pytest.approx(0.4)
+    assert exit == pytest.approx(0.6)
+
+
+def test_swept_aabb_both_moving():
+    # A moves +z, B moves -z: they meet in the middle of the interval
+    enter, _ = swept_aabb((0.0, 0.0, -5.0), (0.0, 0.0, 5.0), UNIT, (0.0, 0.0, 5.0), (0.0, 0.0, -5.0), UNIT)
+    assert enter == pytest.approx(0.4)
+
+
+def test_swept_aabb_misses():
+    assert swept_aabb(ORIGIN, ORIGIN, UNIT, (2.5, 0.0, -10.0), (2.5, 0.0, 10.0), UNIT) is None
+    assert swept_aabb(ORIGIN, ORIGIN, UNIT, (0.0, 0.0, -10.0), (0.0, 0.0, -3.0), UNIT) is None
+
+
+def test_swept_aabb_already_overlapping():
+    assert swept_aabb(ORIGIN, ORIGIN, UNIT, (0.5, 0.0, 0.0), (0.5, 0.0, 0.0), UNIT) == (0.0, 1.0)
+
+
+def test_swept_sphere_first_contact():
+    t = swept_aabb_sphere(ORIGIN, ORIGIN, UNIT, (0.0, 0.0, -10.0), (0.0, 0.0, 10.0), 1.0)
+    assert t == pytest.approx(0.4, abs=1e-6)
+
+
+def test_swept_sphere_passing_a_corner_misses():
+    # Inside the box test's reach on every axis, but the sphere never touches the corner
+    assert swept_aabb_sphere(ORIGIN, ORIGIN, UNIT, (1.8, 1.8, -10.0), (1.8, 1.8, 10.0), 1.0) is None
+    assert swept_aabb_sphere(ORIGIN, ORIGIN, UNIT, (1.6, 1.6, -10.0), (1.6, 1.6, 10.0), 1.0) is not None
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    n = 500
+    start_box = rng.uniform(-3, 3, (n, 3))
+    end_box = start_box + rng.uniform(-2, 2, (n, 3))
+    start_obstacle = rng.uniform(-3, 3, (n, 3))
+    end_obstacle = start_obstacle + rng.uniform(-4, 4, (n, 3))
+    offset = start_obstacle - start_box
+    velocity = (end_obstacle - start_obstacle) - (end_box - start_box)
+    radius = rng.uniform(0.5, 1.5, n)
+
+    enter, exit = swept_aabb_batch(offset, velocity, np.array(UNIT) * 2)
+    contact = swept_aabb_sphere_batch(offset, velocity, UNIT, radius)
+    for i in range(n):
+        span = swept_aabb(start_box[i], end_box[i], UNIT, start_obstacle[i], end_obstacle[i], UNIT)
+        if span is None:
+            assert enter[i] >= exit[i]
+        else:
+            assert (enter[i], exit[i]) == pytest.approx(span)
+        t = swept_aabb_sphere(start_box[i], end_box[i], UNIT, start_obstacle[i], end_obstacle[i], radius[i])
+        if t is None:
+            assert np.isnan(contact[i])
+        else:
+            assert contact[i] == pytest.approx(t, abs=1e-5)
+
+
+def place(manager, slot, prev_z, z, wall):
+    manager.active[:] = False
+    manager.active[slot] = True
+    manager.is_wall[slot] = wall
+    manager.y[slot] = -2.0
+    manager.prev_z[slot] = prev_z
+    manager.z[slot] = z
+    manager.queues_stale = True  # Rebuild the broad-phase queues from the arrays
+
+
+@pytest.mark.parametrize('wall', [False, True])
+def test_fast_obstacle_does_not_tunnel(wall):
+    manager = SphereManager(seed=0)
+    cube = (float(manager.lane_x[1]), -2.0, -15.0)
+    slot = 1 * manager.per_lane
+    # Jumps from well in front of the cube to well behind it in one tick
+    place(manager, slot, -25.0, -5.0, wall)
+    assert CollisionDetector(continuous=False).check(manager, cube, cube) == []
+
+    place(manager, slot, -25.0, -5.0, wall)
+    [hit] = CollisionDetector().check(manager, cube, cube)
+    assert hit.slot == slot and hit.is_wall == wall
+    reach = 1.0 if wall else float(manager.radius[slot])
+    # Contact begins when the obstacle's front meets the cube's back
+    assert hit.fraction == pytest.approx((-15.0 - CUBE_HALF_EXTENTS[2] - reach + 25.0) / 20.0, abs=1e-5)
+
+
+def test_lane_change_through_an_obstacle_is_caught():
+    manager = SphereManager(seed=0)
+    slot = 1 * manager.per_lane
+    place(manager, slot, -15.0, -15.0, True)
+    start = (float(manager.lane_x[0]), -2.0, -15.0)
+    end = (float(manager.lane_x[2]), -2.0, -15.0)
+    assert CollisionDetector(continuous=False).check(manager, end, start) == []
+    place(manager, slot, -15.0, -15.0, True)
+    assert len(CollisionDetector().check(manager, end, start)) == 1
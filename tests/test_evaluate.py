@@ -0,0 +1,161 @@
+import json
+import sys
+import numpy as np
+import pytest
+import evaluate as evaluate_module
+from collision import CollisionDetector
+from evaluate import (evaluate, read_script, survival_stats, format_report, ScriptPolicy, ReplayPolicy, DodgeBot,
+                      IdlePolicy, DEFAULT_SCRIPT)
+from replay import ReplayRecorder
+from simulation import Simulation, CubeMotion, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_CROUCH
+from sphere_manager import SphereManager
+
+
+class Ticks:
+    """Just enough of a Simulation for policies that only look at the tick"""
+
+    def __init__(self):
+        self.tick = 0
+
+
+def actions_per_tick(policy, ticks):
+    sim = Ticks()
+    policy.reset(sim)
+    result = []
+    for tick in range(ticks):
+        sim.tick = tick
+        result.append(policy(sim))
+    return result
+
+
+def test_zero_sessions_is_rejected():
+    with pytest.raises(ValueError):
+        evaluate(ScriptPolicy(), sessions=0)
+
+
+def test_pool_matches_serial_runs():
+    policy = DodgeBot()
+    survival, stats = evaluate(policy, sessions=3, seed=5, workers=8, max_seconds=20.0)
+    assert stats['workers'] == 3  # No more workers than sessions
+    sim = Simulation()
+    for session in range(3):
+        sim.reset(5 + session)
+        assert survival[session] == sim.run(policy, 20 * sim.tick_rate)
+
+
+def test_read_script(tmp_path):
+    path = tmp_path / 'moves.txt'
+    path.write_text("# warm-up\n10 LEFT\n\n10 up  # same tick\n250 right\n")
+    assert read_script(str(path)) == [(10, 'left'), (10, 'up'), (250, 'right')]
+
+
+def test_script_keeps_every_press(tmp_path):
+    path = tmp_path / 'moves.txt'
+    # Two presses on tick 10, 250 = 10 modulo 240, and three on tick 100
+    path.write_text("10 left\n10 up\n250 right\n100 down\n100 left\n100 right\n")
+    actions = actions_per_tick(ScriptPolicy(read_script(str(path))), 480)
+    pressed = {tick: a for tick, a in enumerate(actions) if a}
+    assert pressed == {10: [ACTION_LEFT, ACTION_JUMP], 11: [ACTION_RIGHT],
+                       100: [ACTION_CROUCH, ACTION_LEFT], 101: [ACTION_RIGHT],
+                       250: [ACTION_LEFT, ACTION_JUMP], 251: [ACTION_RIGHT],
+                       340: [ACTION_CROUCH, ACTION_LEFT], 341: [ACTION_RIGHT]}
+
+
+def test_script_policy_plays_like_applying_the_presses():
+    policy = ScriptPolicy()
+    played = Simulation(seed=3)
+    policy.reset(played)
+    played.run(policy, 600)
+
+    manual = Simulation(seed=3)
+    presses = {tick: [] for tick in range(240)}
+    for tick, key in DEFAULT_SCRIPT:
+        presses[tick].append({'left': ACTION_LEFT, 'right': ACTION_RIGHT, 'up': ACTION_JUMP,
+                              'down': ACTION_CROUCH}[key])
+    while not manual.done and manual.tick < 600:
+        manual.step(presses[manual.tick % 240])
+    assert played.tick == manual.tick
+    assert played.cube.snapshot() == manual.cube.snapshot()
+
+
+def test_idle_policy():
+    assert actions_per_tick(IdlePolicy(), 5) == [ACTION_NONE] * 5
+
+
+def test_array_replay_policies(tmp_path):
+    path = tmp_path / 'actions.txt'
+    path.write_text("0\n1\n3\n")
+    assert actions_per_tick(ReplayPolicy.from_file(str(path)), 5) == [[], [ACTION_LEFT], [ACTION_JUMP], [], []]
+    np.save(tmp_path / 'actions.npy', np.array([2, 0], dtype=np.uint8))
+    assert actions_per_tick(ReplayPolicy.from_file(str(tmp_path / 'actions.npy')), 2) == [[ACTION_RIGHT], []]
+
+
+def record_round(seed, arduino=False):
+    """Play random presses (often two in a tick) until a hit, recording like the apps do"""
+    obstacles, cube, collision = SphereManager(seed=seed), CubeMotion(), CollisionDetector()
+    recorder = ReplayRecorder()
+    recorder.start(obstacles, cube, arduino)
+    if arduino:
+        cube.last_input = (0, 20.0)
+    rng = np.random.default_rng(seed)
+    hits = []
+    while not hits:
+        previous = cube.get_cube_position()
+        actions = [int(a) for a in rng.integers(1, 5, rng.choice(3, p=[0.85, 0.05, 0.1]))]
+        for action in actions:
+            cube.apply(action)
+        cube.update_movement()
+        obstacles.update_positions()
+        hits = collision.check(obstacles, cube.get_cube_position(), previous)
+        recorder.record(actions)
+    return recorder.finish(hits[0].time)
+
+
+def test_replay_policy_reproduces_recorded_rounds():
+    for seed in range(20):
+        replay = record_round(seed)
+        assert np.count_nonzero(replay.inputs['keys'] >> 4)  # Some ticks hold two presses
+        policy = ReplayPolicy.from_replay(replay)
+        options = policy.replay_options()
+        sim = Simulation(options['seed'], options['tick_rate'], options['lanes'], options['per_lane'])
+        assert sim.run(policy, len(replay) + 1) == replay.survival_time
+        assert sim.tick == len(replay)
+
+
+def test_replay_file_through_the_command_line(tmp_path, monkeypatch, capsys):
+    replay = record_round(7)
+    path = tmp_path / 'round.fcr'
+    replay.save(str(path))
+    results = tmp_path / 'results.json'
+    # --sessions and --seed don't apply: the recorded round is played against its own obstacles
+    monkeypatch.setattr(sys, 'argv', ['evaluate.py', '--policy', 'replay', '--replay', str(path), '--sessions', '50',
+                                      '--seed', '123', '--json', str(results)])
+    evaluate_module.main()
+    stats = json.loads(results.read_text())
+    assert stats['sessions'] == 1 and stats['seed'] == replay.seed
+    assert stats['survival']['mean'] == round(replay.survival_time, 3)
+    assert "Recorded: {0}, replayed: {0}".format(evaluate_module.format_time(replay.survival_time)) in \
+        capsys.readouterr().out
+
+
+def test_arduino_replays_are_rejected(tmp_path):
+    replay = record_round(1, arduino=True)
+    with pytest.raises(ValueError):
+        ReplayPolicy.from_replay(replay)
+    path = tmp_path / 'arduino.fcr'
+    replay.save(str(path))
+    with pytest.raises(ValueError):
+        ReplayPolicy.from_file(str(path))
+
+
+def test_survival_stats_and_report():
+    stats = survival_stats(np.array([1.0, 2.0, 3.0, 120.0]), max_seconds=120.0)
+    assert stats['min'] == 1.0 and stats['max'] == 120.0 and stats['mean'] == 31.5
+    assert stats['p50'] == 2.5
+    assert stats['formatted']['max'] == '02:00:000'
+    assert stats['reached_limit'] == 1
+
+    _, run = evaluate(IdlePolicy(), sessions=2, seed=1, workers=1, max_seconds=5.0)
+    report = format_report(run)
+    assert report.startswith("IdlePolicy: 2 sessions on 1 workers")
+    assert run['survival']['formatted']['mean'] in report
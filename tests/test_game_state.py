@@ -0,0 +1,118 @@
+import ctypes
+import numpy as np
+import pytest
+from evaluate import DodgeBot
+from game_state import GameState, StateArrays, StateStruct
+from simulation import Simulation, CubeMotion, ACTION_JUMP
+from sphere_manager import SphereManager
+
+
+class Counter(StateStruct):
+    _fields_ = [('count', ctypes.c_int), ('elapsed', ctypes.c_double), ('paused', ctypes.c_bool)]
+
+
+def test_struct_round_trip():
+    state = Counter(3, 1.5, True)
+    saved = state.snapshot()
+    state.count, state.elapsed, state.paused = 9, 7.25, False
+    state.restore(saved)
+    assert (state.count, state.elapsed, state.paused) == (3, 1.5, True)
+
+
+def test_arrays_round_trip_through_their_views():
+    arrays = StateArrays([('tick', np.int64), ('z', np.float32, 4)])
+    z = arrays['z']
+    z[:] = [1, 2, 3, 4]
+    saved = arrays.snapshot()
+    z[:] = 0
+    arrays.array['tick'][0] = 5  # Scalar fields are written through the record array (as SphereManager.tick)
+    arrays.restore(saved)
+    # The views see the restored buffer
+    assert z.tolist() == [1, 2, 3, 4]
+    assert int(arrays['tick']) == 0
+    assert len(saved) == len(arrays)
+
+
+def play(sim, policy, ticks):
+    """Per-tick cube position, obstacle z and hits for `ticks` ticks (stops at a hit)"""
+    trace = []
+    for _ in range(ticks):
+        hits = sim.step(policy(sim))
+        trace.append((sim.tick, sim.cube.get_cube_position(), sim.obstacles.z.tolist(), [h.slot for h in hits]))
+        if hits:
+            break
+    return trace
+
+
+def test_restore_replays_identically_across_schedule_chunks():
+    sim = Simulation(seed=4)
+    policy = DodgeBot()
+    play(sim, policy, 550)
+    assert not sim.done
+    saved = sim.snapshot()
+    first = play(sim, policy, 200)  # Crosses the 600-tick chunk boundary
+    assert first[-1][0] > 600
+    sim.restore(saved)
+    assert play(sim, policy, 200) == first
+
+
+def test_rollback_after_a_hit():
+    sim = Simulation(seed=2)
+    saved = sim.snapshot()
+    sim.run(None, 10000)
+    assert sim.done
+    hit_tick = sim.tick
+    sim.restore(saved)
+    assert sim.tick == 0 and not sim.done
+    sim.run(None, 10000)
+    assert sim.tick == hit_tick
+
+
+def test_snapshot_restores_into_other_objects():
+    obstacles, cube, timer = SphereManager(seed=11), CubeMotion(), Counter(1, 2.0, False)
+    state = GameState(obstacles, cube, timer)
+    for tick in range(300):
+        if tick == 100:
+            cube.apply(ACTION_JUMP)
+        cube.update_movement()
+        obstacles.update_positions()
+    saved = state.snapshot()
+    assert len(saved) == len(state)
+
+    copy = GameState(SphereManager(seed=11), CubeMotion(), Counter())
+    copy.restore(saved)
+    assert copy.snapshot() == saved
+    assert copy.timer.elapsed == 2.0
+    for _ in range(400):
+        for part in (state, copy):
+            part.controls.update_movement()
+            part.sphere_manager.update_positions()
+        assert copy.snapshot() == state.snapshot()
+
+
+class Wrapper:
+    """Controls that keep the cube state in a replaceable game_controls (like KeyboardFallbackControls)"""
+
+    def __init__(self):
+        self.game_controls = CubeMotion()
+
+
+def test_replaced_controls_are_picked_up():
+    obstacles, controls = SphereManager(seed=5), Wrapper()
+    state = GameState(obstacles, controls, Counter(4, 0.5, False))
+    controls.game_controls.apply(ACTION_JUMP)
+    controls.game_controls.update_movement()
+    saved = state.snapshot()
+
+    controls.game_controls = CubeMotion()  # New round: fresh controls object
+    assert state.snapshot() != saved
+    state.restore(saved)
+    assert controls.game_controls.is_jumping
+    assert state.snapshot() == saved
+
+
+def test_restore_rejects_a_snapshot_of_another_size():
+    state = GameState(SphereManager(seed=5), CubeMotion())
+    saved = state.snapshot()
+    with pytest.raises(ValueError):
+        state.restore(saved[:-1])
@@ -0,0 +1,83 @@
+import numpy as np
+import pygame as pg
+import pytest
+from collision import CollisionDetector
+from controls import split_tick_events
+from replay import Replay, ReplayRecorder, ReplayPlayer, save_replay, encode_keys, decode_keys
+from simulation import CubeMotion, ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_CROUCH
+from sphere_manager import SphereManager
+
+
+def record_game(seed=3, max_ticks=1500):
+    """Play random inputs (up to two per tick) while recording; returns (replay, per-tick states)"""
+    obstacles = SphereManager(seed=seed)
+    cube = CubeMotion()
+    collision = CollisionDetector()
+    recorder = ReplayRecorder(keyframe_ticks=60)
+    recorder.start(obstacles, cube)
+    rng = np.random.default_rng(seed)
+    states = []
+    hits = []
+    while not hits and obstacles.tick < max_ticks:
+        previous = cube.get_cube_position()
+        actions = [int(a) for a in rng.integers(1, 5, rng.choice(3, p=[0.9, 0.07, 0.03]))]
+        for action in actions:
+            cube.apply(action)
+        cube.update_movement()
+        obstacles.update_positions()
+        hits = collision.check(obstacles, cube.get_cube_position(), previous)
+        recorder.record(actions)
+        states.append((cube.get_cube_position(), obstacles.z.copy()))
+    return recorder.finish(obstacles.tick / obstacles.tick_rate), states, hits
+
+
+def test_keys_round_trip():
+    for actions in ([], [ACTION_JUMP], [ACTION_LEFT, ACTION_CROUCH]):
+        assert decode_keys(encode_keys(actions)) == actions
+    with pytest.raises(ValueError):
+        encode_keys([ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP])
+
+
+def test_extra_key_presses_wait_for_the_next_tick():
+    def press(key):
+        return pg.event.Event(pg.KEYDOWN, key=key)
+    events = [press(pg.K_LEFT), pg.event.Event(pg.KEYUP, key=pg.K_LEFT), press(pg.K_UP), press(pg.K_RIGHT),
+              press(pg.K_DOWN)]
+    now, later = split_tick_events(events)
+    assert now == events[:3]
+    assert later == events[3:]
+    assert split_tick_events(later) == (later, [])
+
+
+def test_save_load_and_play_back_every_tick(tmp_path):
+    replay, states, hits = record_game()
+    path = tmp_path / 'game.fcr'
+    replay.save(str(path))
+    loaded = Replay.load(str(path))
+    assert loaded.seed == replay.seed
+    assert np.array_equal(loaded.inputs, replay.inputs)
+
+    player = ReplayPlayer(loaded)
+    for tick, (cube, z) in enumerate(states):
+        player_hits = player.step()
+        assert np.allclose(player.controls.get_cube_position(), cube), tick
+        assert np.array_equal(player.obstacles.z, z), tick
+    assert [hit.slot for hit in player_hits] == [hit.slot for hit in hits]
+
+
+def test_seek_matches_sequential_play():
+    replay, states, _ = record_game()
+    assert len(replay) > 61  # Crosses a keyframe
+    player = ReplayPlayer(replay)
+    for tick in (len(replay), 1, 61, 60, 59, len(replay) // 2, 7):
+        player.seek(tick)
+        assert player.tick == tick
+        cube, z = states[tick - 1]
+        assert np.allclose(player.controls.get_cube_position(), cube), tick
+        assert np.array_equal(player.obstacles.z, z), tick
+
+
+def test_saves_in_the_same_second_get_different_names(tmp_path):
+    replay, _, _ = record_game(max_ticks=10)
+    paths = {save_replay(replay, str(tmp_path)) for _ in range(5)}
+    assert len(paths) == 5
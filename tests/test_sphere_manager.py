@@ -0,0 +1,46 @@
+import numpy as np
+from obstacle_schedule import KIND_SPHERE, KIND_WALL
+from sphere_manager import SphereManager, SPAWN_Z
+
+
+class ListSchedule:
+    """Schedule that spawns fixed (lane, kind) lists at given ticks"""
+
+    def __init__(self, spawns):
+        self.spawns = spawns  # tick -> [(lane, kind), ...]
+        self.round_seed = 0
+
+    def reset(self, seed=None):
+        pass
+
+    def take(self, tick):
+        entries = self.spawns.get(tick, [])
+        lanes = np.array([lane for lane, _ in entries], dtype=np.int16)
+        kinds = np.array([kind for _, kind in entries], dtype=np.uint8)
+        y = np.zeros(len(entries), dtype=np.float32)
+        color = np.ones((len(entries), 3), dtype=np.float32)
+        return lanes, kinds, y, color
+
+
+def test_same_lane_twice_in_one_tick_uses_two_slots():
+    schedule = ListSchedule({1: [(1, KIND_WALL), (0, KIND_SPHERE), (1, KIND_SPHERE)]})
+    manager = SphereManager(per_lane=2, schedule=schedule)
+    manager.update_positions()
+
+    assert list(manager.spawned) == [1, 2, 0]
+    assert np.flatnonzero(manager.active).tolist() == [0, 2, 3]
+    # Lane 1's slots in spawn order: the wall, then the sphere
+    assert manager.is_wall[2] and not manager.is_wall[3]
+    assert np.all(manager.z[[0, 2, 3]] == SPAWN_Z)
+
+
+def test_repeated_lane_keeps_recycling_oldest_slot():
+    schedule = ListSchedule({1: [(0, KIND_SPHERE)], 2: [(0, KIND_WALL), (0, KIND_SPHERE)]})
+    manager = SphereManager(per_lane=2, schedule=schedule)
+    manager.update_positions()
+    manager.update_positions()
+
+    # Slot 0 (tick 1) and then slot 1 and slot 0 again (tick 2)
+    assert manager.spawned[0] == 3
+    assert manager.is_wall[1] and not manager.is_wall[0]
+    assert manager.z[0] == SPAWN_Z
@@ -0,0 +1,130 @@
+import numpy as np
+import pygame as pg
+from OpenGL.GL import *
+from mesh import Mesh
+from renderer import get_renderer
+
+
+class GlyphAtlas:
+    """
+    Reusable HUD text renderer backed by a glyph texture atlas
+
+    Every character of the charset is rasterized once with pygame into a
+    single texture. Strings are then drawn as a batch of textured quads
+    (one draw call) with no per-frame texture creation or upload.
+    Glyphs are rasterized in white and tinted with the draw color.
+    """
+
+    def __init__(self, font, charset="0123456789:", padding=1):
+        self.font = font
+        self.padding = padding
+        self.charset = ""
+        self.glyphs = {}  # char -> (u0, v0, u1, v1, width, height)
+        self.line_height = font.get_linesize()
+
+        # GPU texture (re-created lazily, like Mesh, if the context changes)
+        self.texture_id = None
+        self.generation = None
+        self.atlas_size = (0, 0)
+        self.atlas_data = None
+        self.needs_upload = False
+
+        self.add_characters(charset)
+
+    def add_characters(self, characters):
+        """Rasterize any new characters and rebuild the atlas"""
+        new_chars = "".join(ch for ch in dict.fromkeys(characters) if ch not in self.charset)
+        if not new_chars:
+            return
+        self.charset += new_chars
+        self._build_atlas()
+
+    def _build_atlas(self):
+        """Pack every glyph side by side into one RGBA surface"""
+        surfaces = [self.font.render(ch, True, (255, 255, 255)) for ch in self.charset]
+        width = sum(s.get_width() + self.padding for s in surfaces) + self.padding
+        height = max(s.get_height() for s in surfaces) + 2 * self.padding
+
+        atlas = pg.Surface((width, height), pg.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        x = self.padding
+        self.glyphs = {}
+        for ch, surface in zip(self.charset, surfaces):
+            w, h = surface.get_size()
+            atlas.blit(surface, (x, self.padding))
+            self.glyphs[ch] = (x / width, self.padding / height, (x + w) / width, (self.padding + h) / height, w, h)
+            x += w + self.padding
+
+        self.atlas_size = (width, height)
+        self.atlas_data = pg.image.tostring(atlas, "RGBA", False)
+        self.needs_upload = True  # Upload again on next draw
+
+    def _upload(self):
+        if self.texture_id is not None and self.generation == Mesh.context_generation:
+            glDeleteTextures([self.texture_id])
+        width, height = self.atlas_size
+        self.texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, self.atlas_data)
+        self.generation = Mesh.context_generation
+        self.needs_upload = False
+
+    def measure(self, text):
+        """Return the (width, height) of text in pixels"""
+        self.add_characters(text)
+        width = sum(self.glyphs[ch][4] for ch in text)
+        return width, self.line_height
+
+    def build_quads(self, text, x, y):
+        """Build vertex, texcoord and triangle index arrays (4 vertices per glyph) for text at (x, y)"""
+        self.add_characters(text)
+        glyphs = np.array([self.glyphs[ch] for ch in text], dtype=np.float32).reshape(-1, 6)
+        u0, v0, u1, v1, w, h = glyphs.T
+        left = x + np.concatenate(([0.0], np.cumsum(w)[:-1]))
+        right = left + w
+        top = np.full_like(left, y)
+        bottom = top + h
+
+        # Quad corners: top-left, top-right, bottom-right, bottom-left (screen Y points down)
+        vertices = np.stack([left, top, right, top, right, bottom, left, bottom], axis=1).reshape(-1, 2)
+        texcoords = np.stack([u0, v0, u1, v0, u1, v1, u0, v1], axis=1).reshape(-1, 2)
+        corners = (np.arange(len(text), dtype=np.uint32) * 4)[:, None]
+        indices = (corners + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).reshape(-1)
+        return np.ascontiguousarray(vertices), np.ascontiguousarray(texcoords), indices
+
+    def draw_text(self, text, x, y, color=(1.0, 1.0, 1.0, 1.0)):
+        """
+        Draw text with its top-left corner at (x, y)
+
+        Expects a 2D pixel projection with Y pointing down (see begin_overlay)
+        and blending enabled.
+        """
+        if not text:
+            return
+        vertices, texcoords, indices = self.build_quads(text, x, y)
+        if self.needs_upload or self.generation != Mesh.context_generation:
+            self._upload()
+
+        get_renderer().draw_arrays(vertices, indices, texcoords=texcoords, color=color, texture=self.texture_id)
+
+    def release(self):
+        """Free the atlas texture"""
+        if self.texture_id is not None and self.generation == Mesh.context_generation:
+            glDeleteTextures([self.texture_id])
+        self.texture_id = None
+        self.generation = None
+        self.needs_upload = True
+
+
+def begin_overlay(width=800, height=600):
+    """Switch to a 2D pixel projection (origin top-left) for HUD drawing"""
+    get_renderer().begin_overlay(width, height)
+
+
+def end_overlay():
+    """Restore the 3D projection and state changed by begin_overlay"""
+    get_renderer().end_overlay()
@@ -0,0 +1,163 @@
+import hashlib
+import io
+import os
+import pygame as pg
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from mesh import Mesh
+
+
+class TextureEntry:
+    """Bookkeeping for one uploaded texture"""
+
+    def __init__(self, texture_id, content_hash, width, height, mipmapped):
+        self.texture_id = texture_id
+        self.content_hash = content_hash
+        self.width = width
+        self.height = height
+        self.mipmapped = mipmapped
+        self.paths = set()
+        self.ref_count = 0
+
+    @property
+    def memory_bytes(self):
+        """Approximate GPU memory: RGBA8, plus one third for the mipmap chain"""
+        size = self.width * self.height * 4
+        return size * 4 // 3 if self.mipmapped else size
+
+
+class TextureManager:
+    """
+    Loads image files into OpenGL textures and shares them
+
+    Textures are deduplicated by file path and by content hash (two files
+    with identical bytes share one texture), reference-counted, and freed on
+    the GPU when the last reference is released. Mipmaps are generated by
+    default so minified textures (e.g. the far background) filter cleanly.
+
+    Decoded pixels are kept on the CPU side, so when the OpenGL context is
+    recreated the image is re-uploaded without reading or decoding it again.
+    """
+
+    def __init__(self, generate_mipmaps=True):
+        self.generate_mipmaps = generate_mipmaps
+        self.by_path = {}     # normalized path -> TextureEntry
+        self.by_hash = {}     # content hash -> TextureEntry
+        self.by_id = {}       # texture id -> TextureEntry
+        self.path_hashes = {}   # normalized path -> content hash (survives context loss)
+        self.pixel_cache = {}   # content hash -> (RGBA bytes, width, height)
+        self.generation = Mesh.context_generation
+
+    def _check_context(self):
+        """Forget all textures if the OpenGL context was recreated (they died with it)"""
+        if self.generation != Mesh.context_generation:
+            self.by_path.clear()
+            self.by_hash.clear()
+            self.by_id.clear()
+            self.generation = Mesh.context_generation
+
+    def load(self, path, mipmaps=None):
+        """
+        Return a texture id for the image at path, adding one reference
+
+        Parameters:
+        - path: Image file path
+        - mipmaps: Override the manager's mipmap default for this texture
+        """
+        self._check_context()
+        key = os.path.abspath(path)
+
+        entry = self.by_path.get(key)
+        if entry is None:
+            content_hash = self.path_hashes.get(key)
+            if content_hash is None:
+                content_hash = self._decode(path)
+                self.path_hashes[key] = content_hash
+            entry = self.by_hash.get(content_hash)
+            if entry is None:
+                if mipmaps is None:
+                    mipmaps = self.generate_mipmaps
+                entry = self._upload(content_hash, mipmaps)
+                self.by_hash[content_hash] = entry
+                self.by_id[entry.texture_id] = entry
+                print(f"Texture loaded: {path} ({entry.width}x{entry.height}, id={entry.texture_id})")
+            entry.paths.add(key)
+            self.by_path[key] = entry
+
+        entry.ref_count += 1
+        return entry.texture_id
+
+    def _decode(self, path):
+        """Read and decode an image file into the pixel cache, returning its content hash"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        content_hash = hashlib.sha1(data).hexdigest()
+        if content_hash not in self.pixel_cache:
+            surface = pg.image.load(io.BytesIO(data), os.path.basename(path))
+            self.pixel_cache[content_hash] = (pg.image.tostring(surface, 'RGBA', True),) + surface.get_size()
+        return content_hash
+
+    def _upload(self, content_hash, mipmaps):
+        image, width, height = self.pixel_cache[content_hash]
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, image)
+
+        if mipmaps:
+            if bool(glGenerateMipmap):
+                glGenerateMipmap(GL_TEXTURE_2D)
+            else:
+                gluBuild2DMipmaps(GL_TEXTURE_2D, GL_RGBA, width, height, GL_RGBA, GL_UNSIGNED_BYTE, image)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        else:
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return TextureEntry(tex_id, content_hash, width, height, mipmaps)
+
+    def acquire(self, texture_id):
+        """Add a reference to an already loaded texture"""
+        self.by_id[texture_id].ref_count += 1
+        return texture_id
+
+    def release(self, texture_id):
+        """Drop a reference; the texture is deleted from the GPU when none remain"""
+        self._check_context()
+        entry = self.by_id.get(texture_id)
+        if entry is None:
+            return
+        entry.ref_count -= 1
+        if entry.ref_count > 0:
+            return
+
+        glDeleteTextures([entry.texture_id])
+        del self.by_id[entry.texture_id]
+        del self.by_hash[entry.content_hash]
+        for path in entry.paths:
+            del self.by_path[path]
+        print(f"Texture freed: id={entry.texture_id}")
+
+    def release_all(self):
+        """Free every texture regardless of reference counts"""
+        self._check_context()
+        if self.by_id:
+            glDeleteTextures(list(self.by_id))
+        self.by_path.clear()
+        self.by_hash.clear()
+        self.by_id.clear()
+
+    def get_memory_usage(self):
+        """Approximate GPU memory used by managed textures, in bytes"""
+        self._check_context()
+        return sum(entry.memory_bytes for entry in self.by_id.values())
+
+    def get_stats(self):
+        """Get texture statistics for debugging"""
+        self._check_context()
+        return {
+            'textures': len(self.by_id),
+            'paths': len(self.by_path),
+            'references': sum(entry.ref_count for entry in self.by_id.values()),
+            'memory_bytes': self.get_memory_usage(),
+            'cached_images': len(self.pixel_cache)
+        }
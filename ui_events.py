@@ -0,0 +1,17 @@
+import pygame as pg
+
+
+def wait_for_events(timeout_ms=None):
+    """
+    Block until an event arrives (or timeout_ms passes), then drain the queue
+
+    Lets idle menus sleep instead of spinning: with no timeout the call only
+    returns when there is input to handle.
+    """
+    if timeout_ms is None:
+        event = pg.event.wait()
+    else:
+        event = pg.event.wait(max(1, int(timeout_ms)))
+    events = [] if event.type == pg.NOEVENT else [event]
+    events.extend(pg.event.get())
+    return events